@@ -0,0 +1,157 @@
+"""Benchmark of the CPU cost of responses compression, per byte saved.
+
+For typical response bodies (processes list, jobs list, process description),
+it reports the compression ratio and the compression time per byte saved of
+each available content coding, and the cost of serving a cached compressed body.
+
+Run with `python benchmarks/bench_compression.py [--processes N] [--jobs N]`.
+"""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import argparse
+import datetime
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from ogc_api_processes_fastapi import caches, compression, models, responses
+
+
+def make_schema(depth: int) -> Dict[str, Any]:
+    schema: Dict[str, Any] = {"type": "string", "minLength": 1}
+    for level in range(depth):
+        schema = {
+            "type": "object",
+            "title": f"level {level}",
+            "required": ["child"],
+            "properties": {"child": schema, "name": {"type": "string"}},
+        }
+    return schema
+
+
+def make_bodies(processes: int, jobs: int, schema_depth: int) -> Dict[str, bytes]:
+    process_list = models.ProcessList(
+        processes=[
+            models.ProcessSummary(
+                id=f"process-{i}",
+                version="1.0",
+                title=f"Process {i}",
+                links=[
+                    models.Link(
+                        href=f"http://localhost/processes/process-{i}", rel="self"
+                    )
+                ],
+            )
+            for i in range(processes)
+        ],
+        links=[],
+    )
+    created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    job_list = models.JobList(
+        jobs=[
+            models.StatusInfo(
+                jobID=f"job-{i}",
+                processID=f"process-{i % processes}",
+                type=models.JobType.process,
+                status=models.StatusCode.successful,
+                created=created + datetime.timedelta(seconds=i),
+                progress=100,
+                links=[models.Link(href=f"http://localhost/jobs/job-{i}", rel="self")],
+            )
+            for i in range(jobs)
+        ]
+    )
+    process_description = models.ProcessDescription.model_validate(
+        {
+            "id": "process-0",
+            "version": "1.0",
+            "inputs": {
+                f"input-{j}": {"schema": make_schema(schema_depth)} for j in range(10)
+            },
+            "outputs": {"output": {"schema": {"type": "string"}}},
+        }
+    )
+    return {
+        "processes list": responses.dump_model(process_list),
+        "jobs list": responses.dump_model(job_list),
+        "process description": responses.dump_model(process_description),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--processes", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--schema-depth", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bodies = make_bodies(args.processes, args.jobs, args.schema_depth)
+    settings: List[Tuple[str, compression.Compression]] = []
+    for encoding in compression.available_encodings():
+        for fast in (True, False):
+            compressor = compression.Compression(
+                encodings=[encoding],
+                gzip_level=1 if fast else 6,
+                brotli_quality=1 if fast else 4,
+                zstd_level=1 if fast else 3,
+            )
+            level = {
+                "gzip": compressor.gzip_level,
+                "br": compressor.brotli_quality,
+                "zstd": compressor.zstd_level,
+            }[encoding]
+            settings.append((f"{encoding}-{level}", compressor))
+
+    print(
+        f"{'body':<20} {'coding':<8} {'size KiB':>9} {'ratio':>6}"
+        f" {'ms':>7} {'ns/byte saved':>14}"
+    )
+    for name, body in bodies.items():
+        for setting, compressor in settings:
+            [encoding] = compressor.encodings
+            compressed = compressor.compress(body, encoding)
+            seconds = min(
+                timeit.repeat(
+                    lambda: compressor.compress(body, encoding),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            saved = len(body) - len(compressed)
+            print(
+                f"{name:<20} {setting:<8} {len(body) / 1024:>9.1f}"
+                f" {len(body) / len(compressed):>6.1f} {seconds * 1e3:>7.2f}"
+                f" {seconds / saved * 1e9:>14.2f}"
+            )
+
+    # compressed once, then served from the cached response
+    cached = caches.CachedResponse.from_body(bodies["process description"])
+    compressor = compression.Compression(encodings=["gzip"])
+    compressor.compress_cached(cached, "gzip")
+    seconds = min(
+        timeit.repeat(
+            lambda: compressor.compress_cached(cached, "gzip"),
+            number=1000,
+            repeat=args.repeat,
+        )
+    )
+    print(f"\ncached compressed process description: {seconds * 1e6:.2f} ns/request")
+
+
+if __name__ == "__main__":
+    main()
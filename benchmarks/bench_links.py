@@ -0,0 +1,113 @@
+"""Benchmark of the per job cost of links generation.
+
+Run with `python benchmarks/bench_links.py [--jobs N]`.
+"""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import argparse
+import timeit
+import urllib.parse
+from typing import Callable, List, Tuple
+
+import fastapi
+
+from ogc_api_processes_fastapi import endpoints, models, responses
+
+
+def create_links_to_job_per_item(
+    request: fastapi.Request, job: models.StatusInfo
+) -> List[models.Link]:
+    # links generation before `endpoints.JobLinks`, for reference
+    links = [
+        models.Link(
+            href=urllib.parse.urljoin(str(request.base_url), f"jobs/{job.jobID}"),
+            rel="monitor",
+            type="application/json",
+            title="job status info",
+        )
+    ]
+    if job.status.value in ("successful", "failed"):
+        links.append(
+            models.Link(
+                href=urllib.parse.urljoin(
+                    str(request.base_url), f"jobs/{job.jobID}/results"
+                ),
+                rel="results",
+            )
+        )
+    return links
+
+
+def make_request() -> fastapi.Request:
+    return fastapi.Request(
+        {
+            "type": "http",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": "/jobs",
+            "root_path": "",
+            "headers": [],
+            "path_params": {},
+        }
+    )
+
+
+def make_jobs(number: int) -> List[models.StatusInfo]:
+    statuses = [models.StatusCode.running, models.StatusCode.successful]
+    return [
+        models.StatusInfo(
+            jobID=f"job-{i}", status=statuses[i % 2], type=models.JobType.process
+        )
+        for i in range(number)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+
+    def per_item() -> None:
+        request = make_request()
+        for job in jobs:
+            responses.dump_links(create_links_to_job_per_item(request, job))
+
+    def links() -> None:
+        job_links = endpoints.JobLinks(make_request())
+        for job in jobs:
+            responses.dump_links(job_links.links(job))
+
+    def template() -> None:
+        job_links = endpoints.JobLinks(make_request())
+        for job in jobs:
+            job_links.dump(job)
+
+    cases: List[Tuple[str, Callable[[], None]]] = [
+        ("per item urljoin and validation (before)", per_item),
+        ("JobLinks.links, URLs resolved once", links),
+        ("JobLinks.dump, JSON template", template),
+    ]
+    print(f"links of {args.jobs} jobs, best of {args.repeat}, then JSON encoded")
+    for name, case in cases:
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:<45} {best / args.jobs * 1e9:>8.0f} ns/job")
+
+
+if __name__ == "__main__":
+    main()
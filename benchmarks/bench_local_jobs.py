@@ -0,0 +1,146 @@
+"""Benchmark of the job submission and polling throughput of `local.LocalJobClient`.
+
+Client methods are called directly, so that only the executor and the job
+store are measured. It reports the jobs submitted and completed per second
+(with a no-op process), the status requests per second, and the latency of
+filtered jobs lists, which only depends on the number of matching jobs,
+not on the number of stored jobs.
+
+Run with `python benchmarks/bench_local_jobs.py [--jobs N] [--stored N] ...`.
+"""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import argparse
+import datetime
+import random
+import time
+import timeit
+from typing import Any
+
+from ogc_api_processes_fastapi import filters, jobs, local, models
+
+NOOP = models.ProcessDescription.model_validate(
+    {
+        "id": "noop",
+        "version": "1.0",
+        "inputs": {"value": {"schema": {"type": "integer"}}},
+        "outputs": {"value": {"schema": {"type": "integer"}}},
+    }
+)
+
+
+def noop(value: int) -> int:
+    return value
+
+
+def fill_store(store: jobs.JobStore, number: int) -> None:
+    """Add finished jobs of other processes to the store."""
+    created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    for i in range(number):
+        store.add(
+            models.StatusInfo(
+                jobID=f"stored-{i}",
+                processID=f"process-{i % 100}",
+                type=models.JobType.process,
+                status=models.StatusCode.successful,
+                created=created + datetime.timedelta(seconds=i),
+                progress=100,
+            )
+        )
+
+
+def wait_until_done(client: local.LocalJobClient, timeout: float = 600) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not any(
+            client.store.count(status)
+            for status in (models.StatusCode.accepted, models.StatusCode.running)
+        ):
+            return
+        time.sleep(0.001)
+    raise TimeoutError("jobs not completed")
+
+
+def measure(function: Any, number: int, repeat: int) -> float:
+    """Return the best time of a call, in seconds."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--stored", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    store = jobs.MemoryJobStore()
+    fill_store(store, args.stored)
+    client = local.LocalJobClient(
+        store=store, max_workers=args.workers, max_queued=args.jobs
+    )
+    client.register(NOOP, noop)
+
+    start = time.perf_counter()
+    job_ids = [
+        client.post_process_execution(
+            process_id="noop", execution_content={"inputs": {"value": i}}
+        ).jobID
+        for i in range(args.jobs)
+    ]
+    submitted = time.perf_counter()
+    wait_until_done(client)
+    completed = time.perf_counter()
+    print(f"stored jobs: {args.stored}, submitted jobs: {args.jobs}")
+    print(f"submit:   {args.jobs / (submitted - start):>10.0f} jobs/s")
+    print(f"complete: {args.jobs / (completed - start):>10.0f} jobs/s")
+
+    seconds = measure(
+        lambda: client.get_job(job_id=random.choice(job_ids)), 1000, args.repeat
+    )
+    print(f"poll:     {1 / seconds:>10.0f} requests/s")
+
+    # a few jobs of the process among the stored ones
+    for i in range(10):
+        client.post_process_execution(
+            process_id="noop", execution_content={"inputs": {"value": i}}
+        )
+    wait_until_done(client)
+    print(f"\n{'jobs list':<40} {'matched':>8} {'ms':>8}")
+    cases = {
+        "unfiltered": filters.JobFilter(),
+        "processID=process-0": filters.JobFilter(process_ids=["process-0"]),
+        "processID=noop": filters.JobFilter(process_ids=["noop"]),
+        "processID=noop&status=failed": filters.JobFilter(
+            process_ids=["noop"], status=[models.StatusCode.failed]
+        ),
+        "status=accepted": filters.JobFilter(status=[models.StatusCode.accepted]),
+    }
+    for name, job_filter in cases.items():
+        job_list = client.get_jobs(job_filter=job_filter, limit=10, cursor=None)
+        seconds = measure(
+            lambda: client.get_jobs(job_filter=job_filter, limit=10, cursor=None),
+            10,
+            args.repeat,
+        )
+        print(f"{name:<40} {job_list.numberMatched:>8} {seconds * 1e3:>8.3f}")
+    client.shutdown()
+
+
+if __name__ == "__main__":
+    main()
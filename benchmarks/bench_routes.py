@@ -0,0 +1,328 @@
+"""Benchmark of the routes in `config.ROUTES`, served by a synthetic in-memory client.
+
+Requests are sent sequentially to the ASGI application, in process, so that
+only the application is measured. For each route it reports requests per
+second, p50/p99 latencies and the peak memory allocated per request.
+
+Run with `python benchmarks/bench_routes.py [--jobs N] [--output FILE] ...`,
+and compare two runs with `--compare BASELINE_FILE`. Responses are encoded by
+`fastapi.responses.JSONResponse`, as by default, or by the opt-in
+`responses.FastJSONResponse` with `--response-class fast`.
+"""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import argparse
+import asyncio
+import datetime
+import importlib.metadata
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+import fastapi
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import clients, config, metrics, models, responses
+
+ASGIApp = Any
+
+# "json" is the default of `instantiate_app`, the others are opt-in
+RESPONSE_CLASSES = {
+    "json": fastapi.responses.JSONResponse,
+    "fast": responses.FastJSONResponse,
+    "orjson": fastapi.responses.ORJSONResponse,
+}
+
+
+def make_schema(depth: int) -> Dict[str, Any]:
+    schema: Dict[str, Any] = {"type": "string", "minLength": 1}
+    for level in range(depth):
+        schema = {
+            "type": "object",
+            "title": f"level {level}",
+            "required": ["child"],
+            "properties": {"child": schema, "name": {"type": "string"}},
+        }
+    return schema
+
+
+class SyntheticClient(clients.BaseClient):
+    """In-memory client returning data of configurable size."""
+
+    def __init__(
+        self, processes: int, jobs: int, schema_depth: int, results_size: int
+    ) -> None:
+        self.processes = [
+            models.ProcessDescription.model_validate(
+                {
+                    "id": f"process-{i}",
+                    "version": "1.0",
+                    "inputs": {
+                        f"input-{j}": {"schema": make_schema(schema_depth)}
+                        for j in range(5)
+                    },
+                    "outputs": {"output": {"schema": {"type": "string"}}},
+                }
+            )
+            for i in range(processes)
+        ]
+        created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        self.jobs = [
+            models.StatusInfo(
+                jobID=f"job-{i}",
+                processID=f"process-{i % processes}",
+                type=models.JobType.process,
+                status=models.StatusCode.successful,
+                created=created,
+                finished=created,
+                progress=100,
+            )
+            for i in range(jobs)
+        ]
+        self.results = {"output": "x" * results_size}
+
+    def get_processes(
+        self, limit: Optional[int] = fastapi.Query(None)
+    ) -> models.ProcessList:
+        processes = [
+            models.ProcessSummary(id=process.id, version=process.version)
+            for process in self.processes[:limit]
+        ]
+        return models.ProcessList(processes=processes, links=[])
+
+    def get_process(
+        self, process_id: str = fastapi.Path(...)
+    ) -> models.ProcessDescription:
+        return self.processes[0].model_copy(update={"id": process_id})
+
+    def post_process_execution(
+        self,
+        process_id: str = fastapi.Path(...),
+        execution_content: Dict[str, Any] = fastapi.Body(...),
+    ) -> models.StatusInfo:
+        return self.jobs[0].model_copy(update={"status": models.StatusCode.accepted})
+
+    def get_jobs(
+        self,
+        processID: Optional[List[str]] = fastapi.Query(None),
+        status: Optional[List[str]] = fastapi.Query(None),
+        limit: Optional[int] = fastapi.Query(10, ge=1, le=10000),
+    ) -> models.JobList:
+        jobs = [job.model_copy() for job in self.jobs[:limit]]
+        return models.JobList(jobs=jobs)
+
+    def get_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        return self.jobs[0].model_copy(update={"jobID": job_id})
+
+    def get_job_results(self, job_id: str = fastapi.Path(...)) -> models.Results:
+        return self.results  # type: ignore
+
+    def delete_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        return self.jobs[0].model_copy(
+            update={"jobID": job_id, "status": models.StatusCode.dismissed}
+        )
+
+
+def make_requests(args: argparse.Namespace) -> Dict[str, Tuple[str, str, bytes]]:
+    """Request (method, path and query, body) sent to each route."""
+    execute = json.dumps({"inputs": {"input-0": "value"}}).encode()
+    job_ids = json.dumps({"jobIDs": [f"job-{i}" for i in range(10)]}).encode()
+    return {
+        "GetLandingPage": ("GET", "/", b""),
+        "GetConformance": ("GET", "/conformance", b""),
+        "GetProcesses": ("GET", f"/processes?limit={args.processes}", b""),
+        "GetProcess": ("GET", "/processes/process-0", b""),
+        "PostProcessExecute": ("POST", "/processes/process-0/execute", execute),
+        "PostProcessExecution": ("POST", "/processes/process-0/execution", execute),
+        "GetJobs": ("GET", f"/jobs?limit={args.jobs}", b""),
+        "GetJob": ("GET", "/jobs/job-0", b""),
+        "GetJobEvents": ("GET", "/jobs/job-0/events", b""),
+        "GetJobResults": ("GET", "/jobs/job-0/results", b""),
+        "DeleteJob": ("DELETE", "/jobs/job-0", b""),
+        "PostJobsStatus": ("POST", "/jobs/status", job_ids),
+    }
+
+
+async def send_request(app: ASGIApp, method: str, url: str, body: bytes) -> int:
+    """Send a request to the ASGI application, return the response status."""
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    status = 0
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # the client never disconnects
+        await asyncio.Future()
+        raise RuntimeError("unreachable")
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def benchmark_route(
+    app: ASGIApp, request: Tuple[str, str, bytes], requests: int, warmup: int
+) -> Dict[str, float]:
+    method, url, body = request
+    for _ in range(warmup):
+        status = await send_request(app, method, url, body)
+        if status >= 400:
+            raise RuntimeError(f"{method} {url} failed with status {status}")
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        request_start = time.perf_counter()
+        await send_request(app, method, url, body)
+        latencies.append(time.perf_counter() - request_start)
+    elapsed = time.perf_counter() - start
+
+    allocation_requests = max(1, requests // 10)
+    peaks = []
+    tracemalloc.start()
+    for _ in range(allocation_requests):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        await send_request(app, method, url, body)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests_per_second": requests / elapsed,
+        "latency_p50_ms": quantiles[49] * 1e3,
+        "latency_p99_ms": quantiles[98] * 1e3,
+        "allocated_peak_kib": statistics.median(peaks) / 1024,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"\nrequests per second, compared to {baseline['parameters']}")
+    for route_name, route_metrics in results["routes"].items():
+        baseline_metrics = baseline["routes"].get(route_name)
+        if baseline_metrics is None:
+            continue
+        ratio = (
+            route_metrics["requests_per_second"]
+            / baseline_metrics["requests_per_second"]
+        )
+        print(f"{route_name:<22} {ratio:>6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--processes", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--schema-depth", type=int, default=3)
+    parser.add_argument("--results-size", type=int, default=1024)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--trust-client-models", action="store_true")
+    parser.add_argument("--instrumentation", action="store_true")
+    parser.add_argument(
+        "--response-class",
+        choices=list(RESPONSE_CLASSES),
+        default="json",
+        help="class of the JSON responses, by default the one of instantiate_app",
+    )
+    parser.add_argument("--routes", nargs="*", default=list(config.ROUTES))
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", help="JSON file of results to compare to")
+    args = parser.parse_args()
+
+    client = SyntheticClient(
+        args.processes, args.jobs, args.schema_depth, args.results_size
+    )
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client,
+        trust_client_models=args.trust_client_models,
+        instrumentation=metrics.Instrumentation() if args.instrumentation else None,
+        default_response_class=RESPONSE_CLASSES[args.response_class],
+    )
+    requests = make_requests(args)
+    missing_routes = set(config.ROUTES) - set(requests)
+    if missing_routes:
+        raise ValueError(f"no benchmark request for routes {sorted(missing_routes)}")
+
+    parameters = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("routes", "output", "compare")
+    }
+    results: Dict[str, Any] = {
+        "parameters": parameters,
+        "versions": {
+            "python": platform.python_version(),
+            **{
+                package: importlib.metadata.version(package)
+                for package in ("ogc-api-processes-fastapi", "fastapi", "pydantic")
+            },
+        },
+        "routes": {},
+    }
+    print(f"response class: {RESPONSE_CLASSES[args.response_class].__name__}")
+    print(f"{'route':<22} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak KiB':>9}")
+    for route_name in args.routes:
+        route_metrics = asyncio.run(
+            benchmark_route(app, requests[route_name], args.requests, args.warmup)
+        )
+        results["routes"][route_name] = route_metrics
+        print(
+            f"{route_name:<22} {route_metrics['requests_per_second']:>9.1f}"
+            f" {route_metrics['latency_p50_ms']:>8.2f} {route_metrics['latency_p99_ms']:>8.2f}"
+            f" {route_metrics['allocated_peak_kib']:>9.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark of the jobs list latency of `jobs.SQLiteJobStore`, by number of stored jobs.
+
+The store is filled up to each of the given sizes (by default up to a million
+jobs), and the latency of typical pages of the jobs list is measured: first
+and deep pages, filtered by status and by process. Filters and pagination are
+run by SQLite on its indexes, so latencies should stay flat as jobs are added.
+It also reports the rate of progress updates, batched and written at once.
+
+Run with `python benchmarks/bench_sqlite_jobs.py [--sizes N,N,...] [--path FILE]`.
+"""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import argparse
+import datetime
+import pathlib
+import tempfile
+import time
+import timeit
+from typing import Dict, Iterator, Optional, Tuple
+
+from ogc_api_processes_fastapi import filters, jobs, models, pagination
+
+CREATED = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+STATUSES = [models.StatusCode.successful] * 98 + [
+    models.StatusCode.failed,
+    models.StatusCode.dismissed,
+]
+
+
+def make_jobs(start: int, stop: int) -> Iterator[models.StatusInfo]:
+    for i in range(start, stop):
+        created = CREATED + datetime.timedelta(seconds=i)
+        yield models.StatusInfo(
+            jobID=f"job-{i:08d}",
+            processID=f"process-{i % 100}",
+            type=models.JobType.process,
+            # independent of the process
+            status=STATUSES[(i // 100 + i) % len(STATUSES)],
+            created=created,
+            started=created,
+            finished=created + datetime.timedelta(seconds=i % 600),
+            progress=100,
+        )
+
+
+def page_cases(
+    stored: int,
+) -> Dict[str, Tuple[filters.JobFilter, Optional[pagination.JobCursor]]]:
+    middle = CREATED + datetime.timedelta(seconds=stored // 2)
+    deep = pagination.JobCursor(created=middle, job_id=f"job-{stored // 2:08d}")
+    failed = filters.JobFilter(status=[models.StatusCode.failed])
+    last_hour = filters.DatetimeInterval(
+        start=CREATED + datetime.timedelta(seconds=stored - 3600)
+    )
+    return {
+        "first page": (filters.JobFilter(), None),
+        "deep page": (filters.JobFilter(), deep),
+        "status=failed": (failed, None),
+        "status=failed, deep page": (failed, deep),
+        "processID=process-7": (filters.JobFilter(process_ids=["process-7"]), None),
+        "processID=process-7&status=failed": (
+            filters.JobFilter(
+                process_ids=["process-7"], status=[models.StatusCode.failed]
+            ),
+            None,
+        ),
+        "datetime=last hour": (filters.JobFilter(created=last_hour), None),
+    }
+
+
+def measure_updates(store: jobs.SQLiteJobStore, number: int) -> float:
+    """Return the number of progress updates per second."""
+    start = time.perf_counter()
+    for i in range(number):
+        store.update(f"job-{i % 100:08d}", progress=i % 100)
+    store.flush()
+    return number / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--path", type=pathlib.Path, default=None)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path or pathlib.Path(directory) / "jobs.db"
+        store = jobs.SQLiteJobStore(path)
+        stored = len(store)
+        print(f"{'stored':>9} {'jobs list':<36} {'ms':>8}")
+        for size in sizes:
+            for chunk in range(stored, size, 100000):
+                store.add_many(make_jobs(chunk, min(chunk + 100000, size)))
+            stored = max(stored, size)
+            for name, (job_filter, cursor) in page_cases(stored).items():
+                if not store.query(job_filter, args.limit, cursor).jobs:
+                    # too few jobs for the filter, e.g. with small sizes
+                    print(f"{stored:>9} {name:<36} {'no jobs':>8}")
+                    continue
+                seconds = (
+                    min(
+                        timeit.repeat(
+                            lambda: store.query(job_filter, args.limit, cursor),
+                            number=20,
+                            repeat=args.repeat,
+                        )
+                    )
+                    / 20
+                )
+                print(f"{stored:>9} {name:<36} {seconds * 1e3:>8.3f}")
+            print()
+
+        print(
+            f"batched progress updates:   {measure_updates(store, args.updates):>8.0f}/s"
+        )
+        store.close()
+        store = jobs.SQLiteJobStore(path, flush_interval=0)
+        print(
+            f"immediate progress updates: {measure_updates(store, args.updates):>8.0f}/s"
+        )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
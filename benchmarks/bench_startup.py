@@ -0,0 +1,69 @@
+"""Benchmark of the startup time of the application and of the routers.
+
+It reports the time to instantiate the first application (response models
+created), further routers for the same client class (e.g. one per tenant),
+and the OpenAPI schema, built on its first request.
+
+Run with `python benchmarks/bench_startup.py [--routers N]`.
+"""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import argparse
+import time
+import tracemalloc
+
+from bench_routes import SyntheticClient
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import main as main_module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--routers", type=int, default=50)
+    args = parser.parse_args()
+
+    client = SyntheticClient(processes=10, jobs=10, schema_depth=3, results_size=10)
+
+    start = time.perf_counter()
+    app = ogc_api_processes_fastapi.instantiate_app(client)
+    print(f"first application:    {(time.perf_counter() - start) * 1e3:>8.2f} ms")
+
+    start = time.perf_counter()
+    app.openapi()
+    print(f"OpenAPI schema:       {(time.perf_counter() - start) * 1e3:>8.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(args.routers):
+        ogc_api_processes_fastapi.instantiate_router(client)
+    elapsed = (time.perf_counter() - start) / args.routers
+    tracemalloc.start()
+    routers = [ogc_api_processes_fastapi.instantiate_router(client) for _ in range(10)]
+    memory = tracemalloc.get_traced_memory()[0] / len(routers)
+    tracemalloc.stop()
+    print(f"router, same client:  {elapsed * 1e3:>8.2f} ms, {memory / 1024:.1f} KiB")
+
+    main_module.create_response_model.cache_clear()
+    start = time.perf_counter()
+    ogc_api_processes_fastapi.instantiate_router(client)
+    elapsed = time.perf_counter() - start
+    print(f"router, cold models:  {elapsed * 1e3:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,14 +22,19 @@ except ImportError:  # pragma: no cover
     # Local copy or not installed with setuptools
     __version__ = "999"
 
-from .clients import BaseClient
+from .clients import AsyncBaseClient, BaseClient
 from .exceptions import include_exception_handlers
+from .local import LocalJobClient
 from .main import instantiate_app, instantiate_router
+from .tenants import TenantRegistry
 
 __all__ = [
     "__version__",
+    "AsyncBaseClient",
     "BaseClient",
     "instantiate_app",
     "instantiate_router",
     "include_exception_handlers",
+    "LocalJobClient",
+    "TenantRegistry",
 ]
@@ -0,0 +1,294 @@
+"""In-memory caches of serialized responses."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import collections
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+import attrs
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def compute_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+@attrs.define
+class CachedResponse:
+    body: bytes
+    etag: str
+    version: Optional[str] = None
+    # compressed bodies, by content coding
+    compressed: Dict[str, bytes] = attrs.field(factory=dict)
+
+    @classmethod
+    def from_body(cls, body: bytes, version: Optional[str] = None) -> "CachedResponse":
+        return cls(body=body, etag=compute_etag(body), version=version)
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe mapping bounded in size, with optional expiration of the entries.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries, the least recently used are evicted first.
+    ttl : Optional[float]
+        Time to live of the entries, in seconds. If None, entries never expire.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: collections.OrderedDict[K, Tuple[float, V]] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        expires = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, predicate: Optional[Callable[[K], bool]] = None) -> None:
+        """Remove the entries whose key matches `predicate`, or all entries."""
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+
+class ProcessDescriptionCache:
+    """Cache of the serialized responses of `GET /processes/{process_id}`.
+
+    Entries are keyed by process identifier, base URL of the request and tenant
+    (see `tenants.TenantRegistry`), and are only served while the client reports
+    the same process version (see `BaseClient.get_process_version`).
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of cached descriptions.
+    ttl : Optional[float]
+        Time to live of the cached descriptions, in seconds.
+        If None, descriptions are only evicted when their version changes,
+        when they are invalidated or when the cache is full.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        self._cache: LRUCache[Tuple[str, str, Optional[str]], CachedResponse] = (
+            LRUCache(maxsize=maxsize, ttl=ttl)
+        )
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(
+        self,
+        process_id: str,
+        base_url: str,
+        version: str,
+        tenant_id: Optional[str] = None,
+    ) -> Optional[CachedResponse]:
+        cached = self._cache.get((process_id, base_url, tenant_id))
+        if cached is None or cached.version != version:
+            return None
+        return cached
+
+    def set(
+        self,
+        process_id: str,
+        base_url: str,
+        version: str,
+        body: bytes,
+        tenant_id: Optional[str] = None,
+    ) -> CachedResponse:
+        cached = CachedResponse.from_body(body, version=version)
+        self._cache.set((process_id, base_url, tenant_id), cached)
+        return cached
+
+    def invalidate(
+        self, process_id: Optional[str] = None, tenant_id: Optional[str] = None
+    ) -> None:
+        """Remove the cached descriptions of `process_id`, or of all processes.
+
+        Parameters
+        ----------
+        process_id : Optional[str]
+            Identifier of the process. If None, descriptions of all processes
+            are removed.
+        tenant_id : Optional[str]
+            Identifier of the tenant. If None, descriptions of all tenants
+            are removed.
+        """
+        if process_id is None and tenant_id is None:
+            self._cache.invalidate()
+        else:
+            self._cache.invalidate(
+                lambda key: (
+                    (process_id is None or key[0] == process_id)
+                    and (tenant_id is None or key[2] == tenant_id)
+                )
+            )
+
+
+class ExecutionCache:
+    """Cache of the jobs created by executions, to reuse their results.
+
+    Entries are keyed by process identifier and version, hash of the execution
+    request and tenant, and hold the jobs created by the execution: the last
+    one found successful first, then the ones submitted since, which may
+    not be finished yet. Jobs found unsuccessful are removed, so that the
+    successful job is kept until another one succeeds (see `record` for hits).
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of cached executions, the least recently used are
+        evicted first.
+    ttl : Optional[float]
+        Time to live of the cached executions, in seconds, e.g. the retention
+        time of the jobs results. If None, executions never expire.
+    max_jobs : int
+        Maximum number of jobs of an execution, the oldest submitted ones are
+        removed first.
+
+    Attributes
+    ----------
+    hits : int
+        Number of executions served with the results of a previous job.
+    misses : int
+        Number of executions submitted to the client.
+    """
+
+    def __init__(
+        self, maxsize: int = 10000, ttl: Optional[float] = None, max_jobs: int = 4
+    ) -> None:
+        self._cache: LRUCache[Tuple[str, str, str, Optional[str]], Tuple[str, ...]] = (
+            LRUCache(maxsize=maxsize, ttl=ttl)
+        )
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(
+        self,
+        process_id: str,
+        version: str,
+        request_hash: str,
+        tenant_id: Optional[str] = None,
+    ) -> Tuple[str, ...]:
+        """Return the IDs of the jobs created by the same execution, if any."""
+        return self._cache.get((process_id, version, request_hash, tenant_id)) or ()
+
+    def add(
+        self,
+        process_id: str,
+        version: str,
+        request_hash: str,
+        job_id: str,
+        tenant_id: Optional[str] = None,
+    ) -> None:
+        """Add a job submitted by an execution, after the other ones."""
+        key = (process_id, version, request_hash, tenant_id)
+        with self._lock:
+            job_ids = tuple(
+                other for other in self._cache.get(key) or () if other != job_id
+            )
+            kept = self.max_jobs - 1
+            if len(job_ids) > kept:
+                # the first job may be successful, the next ones are the oldest
+                job_ids = (
+                    job_ids[:1] + job_ids[len(job_ids) - kept + 1 :] if kept else ()
+                )
+            self._cache.set(key, (*job_ids, job_id))
+
+    def set_successful(
+        self,
+        process_id: str,
+        version: str,
+        request_hash: str,
+        job_id: str,
+        tenant_id: Optional[str] = None,
+    ) -> None:
+        """Move a job found successful first, to be reused by the next executions."""
+        key = (process_id, version, request_hash, tenant_id)
+        with self._lock:
+            job_ids = self._cache.get(key) or ()
+            if job_ids[:1] != (job_id,):
+                others = tuple(other for other in job_ids if other != job_id)
+                self._cache.set(key, (job_id, *others))
+
+    def discard(
+        self,
+        process_id: str,
+        version: str,
+        request_hash: str,
+        job_id: str,
+        tenant_id: Optional[str] = None,
+    ) -> None:
+        """Remove a job found unsuccessful, failed or deleted."""
+        key = (process_id, version, request_hash, tenant_id)
+        with self._lock:
+            job_ids = self._cache.get(key) or ()
+            others = tuple(other for other in job_ids if other != job_id)
+            if others != job_ids:
+                self._cache.set(key, others)
+
+    def record(self, hit: bool) -> None:
+        """Count an execution as served from cache (hit) or submitted (miss)."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def invalidate(self, process_id: Optional[str] = None) -> None:
+        """Remove the cached executions of `process_id`, or of all processes."""
+        if process_id is None:
+            self._cache.invalidate()
+        else:
+            self._cache.invalidate(lambda key: key[0] == process_id)
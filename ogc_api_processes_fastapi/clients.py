@@ -15,11 +15,16 @@
 # limitations under the License
 
 import abc
-from typing import Any, Dict, List, Optional
+import inspect
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type, Union
 
 import fastapi
+import fastapi.concurrency
 
-from . import models
+from . import models, pagination
+
+# maximum number of jobs of a `POST /jobs/status` request
+MAX_JOB_IDS = 1000
 
 
 class BaseClient(abc.ABC):
@@ -35,8 +40,13 @@ class BaseClient(abc.ABC):
         "GetJob": "Get status information of the job",
         "GetJobResults": "Get results of the job",
         "DeleteJob": "Cancel the job",
+        "PostJobsStatus": "Get status information of several jobs",
+        "GetJobEvents": "Get the stream of status updates of the job",
     }
 
+    # key signing the pagination cursors, see `encode_job_cursor`
+    pagination_secret: Optional[bytes] = None
+
     @abc.abstractmethod
     def get_processes(
         self, limit: Optional[int] = fastapi.Query(None)
@@ -123,6 +133,16 @@ class BaseClient(abc.ABC):
 
         Called with `GET /jobs`.
 
+        Instead of `processID` and `status`, implementations may receive all the
+        OGC filters (also `type`, `datetime`, `minDuration` and `maxDuration`) as a
+        `filters.JobFilter`, to be translated into a query of their backend, with a
+        `job_filter: filters.JobFilter = fastapi.Depends(filters.job_filter_from_query)`
+        parameter. The number of jobs matching the filters, possibly estimated, may
+        be returned as `numberMatched`. Likewise, the fields selected with the
+        `fields` query parameter, which are the only ones returned, are received with
+        a `fields: Optional[FrozenSet[str]] = fastapi.Depends(
+        filters.job_fields_from_query)` parameter, so that other fields can be skipped.
+
         Parameters
         ----------
         processID: Optional[List[str]] = fastapi.Query(None)
@@ -215,3 +235,297 @@ class BaseClient(abc.ABC):
             If the job `job_id` is not found.
         """
         ...
+
+    def get_jobs_by_id(
+        self,
+        job_ids: List[str] = fastapi.Body(
+            ..., embed=True, alias="jobIDs", max_length=MAX_JOB_IDS
+        ),
+    ) -> Optional[models.JobList]:
+        """Get status information of the jobs identified by `job_ids`.
+
+        Called with `POST /jobs/status`.
+        Optional hook: when not implemented, or if it returns None, `get_job`
+        is called concurrently for each job. Requests of more than
+        `MAX_JOB_IDS` jobs are rejected.
+
+        Parameters
+        ----------
+        job_ids: List[str] = fastapi.Body(..., embed=True, alias="jobIDs")
+            Identifiers of the jobs, at most `MAX_JOB_IDS`.
+
+        Returns
+        -------
+        Optional[models.JobList]
+            List of the jobs found, unknown jobs are left out.
+            If None, the jobs are retrieved one by one with `get_job`.
+        """
+        return None
+
+    def watch_job(self, job_id: str) -> Optional[AsyncIterator[models.StatusInfo]]:
+        """Watch the status of the job identified by `job_id`.
+
+        Used by `GET /jobs/{job_id}/events` and `GET /jobs/{job_id}?wait=<seconds>`.
+        Optional hook: when not implemented, or if it returns None, `get_job`
+        is polled.
+        Can be implemented returning `events.JobStatusBroker.subscribe(job_id)`:
+        the status of the job is read again with `get_job` once this method has
+        returned, not to miss the updates published before the subscription.
+        If implemented as an asynchronous generator function, which only runs
+        once iterated, the first status yielded must be the current one, read
+        after subscribing to the updates.
+
+        Parameters
+        ----------
+        job_id: str
+            Identifier of the job.
+
+        Returns
+        -------
+        Optional[AsyncIterator[models.StatusInfo]]
+            Asynchronous iterator yielding the status of the job each time
+            it changes, from the moment this method returns.
+            If None, the job cannot be watched and `get_job` is polled.
+        """
+        return None
+
+    def get_process_version(self, process_id: str) -> Optional[str]:
+        """Get the version of the description of the process identified by `process_id`.
+
+        Optional hook: when implemented, responses of `GET /processes/{process_id}`
+        are cached and only rebuilt (calling `get_process`) when the returned
+        version changes. It must therefore be much cheaper than `get_process`.
+
+        Parameters
+        ----------
+        process_id: str
+            Identifier of the process.
+
+        Returns
+        -------
+        Optional[str]
+            Version (or hash) of the process description.
+            If None, the process description is not cached.
+        """
+        return None
+
+    def get_process_execution_modes(
+        self, process_id: str
+    ) -> Optional[List[models.JobControlOptions]]:
+        """Get the execution modes supported by the process identified by `process_id`.
+
+        Optional hook: when implemented, processes only supporting `sync-execute`
+        are executed synchronously by default, and processes not supporting it
+        ignore `Prefer: wait`. Returned modes are cached for
+        `EndpointsConfig.execution_modes_ttl` seconds.
+
+        Parameters
+        ----------
+        process_id: str
+            Identifier of the process.
+
+        Returns
+        -------
+        Optional[List[models.JobControlOptions]]
+            Job control options of the process. If None, execution modes are
+            taken from the process description if it is fetched anyway
+            (validation or caching of the executions), and unknown otherwise.
+        """
+        return None
+
+    def wait_for_job(self, job_id: str, timeout: float) -> Optional[models.StatusInfo]:
+        """Wait for the job identified by `job_id` to reach a final status.
+
+        Used by synchronous executions (`Prefer: wait=<seconds>` or processes
+        only supporting `sync-execute`), to return the results inline.
+        Optional hook: when not implemented, or if it returns None, the job is
+        watched with `watch_job`, or `get_job` is polled.
+
+        Parameters
+        ----------
+        job_id: str
+            Identifier of the job.
+        timeout: float
+            Maximum time to wait, in seconds.
+
+        Returns
+        -------
+        Optional[models.StatusInfo]
+            Status of the job, once final or when `timeout` is reached.
+            If None, the job is watched instead.
+        """
+        return None
+
+    def encode_job_cursor(self, job: models.StatusInfo, direction: str = "next") -> str:
+        """Encode an opaque signed cursor pointing to a job, for keyset pagination.
+
+        Cursors are signed with `pagination_secret`, which must be set to the same
+        value for all the processes serving the API. If None, a random key is
+        generated for each process.
+
+        Parameters
+        ----------
+        job: models.StatusInfo
+            Job the cursor points to, its creation time and ID are encoded.
+        direction: str
+            "next" for the page following the job, "prev" for the page preceding it.
+
+        Returns
+        -------
+        str
+            Cursor.
+        """
+        return pagination.encode_job_cursor(job, direction, self.pagination_secret)
+
+    def decode_job_cursor(self, cursor: str) -> pagination.JobCursor:
+        """Decode a cursor created by `encode_job_cursor`.
+
+        `get_jobs` filters the jobs on their (creation time, ID) with the
+        decoded cursor, instead of skipping an offset, so that deep pages are
+        as cheap as the first one with an index on these columns.
+
+        Raises
+        ------
+        exceptions.InvalidCursor
+            If the cursor is malformed or has been tampered with.
+        """
+        return pagination.decode_job_cursor(cursor, self.pagination_secret)
+
+    def create_job_pagination(
+        self, jobs: List[models.StatusInfo], has_next: bool, has_prev: bool
+    ) -> models.PaginationQueryParameters:
+        """Create the `cursor` query parameters of the pages around a page of jobs.
+
+        See `pagination.create_job_pagination`.
+        """
+        return pagination.create_job_pagination(
+            jobs, has_next, has_prev, secret=self.pagination_secret
+        )
+
+
+class AsyncBaseClient(abc.ABC):
+    """Defines a pattern for implementing OGC API - Processes endpoints with coroutines.
+
+    Same interface as `BaseClient`, but every method is a coroutine function: FastAPI
+    awaits it on the event loop instead of running it in its threadpool.
+    Parameters, return values and raised exceptions are documented in `BaseClient`.
+    """
+
+    endpoints_description: Dict[str, str] = BaseClient.endpoints_description
+
+    pagination_secret: Optional[bytes] = None
+
+    @abc.abstractmethod
+    async def get_processes(
+        self, limit: Optional[int] = fastapi.Query(None)
+    ) -> models.ProcessList:
+        """Get all available processes, see `BaseClient.get_processes`."""
+        ...
+
+    @abc.abstractmethod
+    async def get_process(
+        self, process_id: str = fastapi.Path(...)
+    ) -> models.ProcessDescription:
+        """Get description of the process, see `BaseClient.get_process`."""
+        ...
+
+    @abc.abstractmethod
+    async def post_process_execution(
+        self,
+        process_id: str = fastapi.Path(...),
+        execution_content: Dict[str, Any] = fastapi.Body(...),
+    ) -> models.StatusInfo:
+        """Post request for execution, see `BaseClient.post_process_execution`."""
+        ...
+
+    @abc.abstractmethod
+    async def get_jobs(
+        self,
+        processID: Optional[List[str]] = fastapi.Query(None),
+        status: Optional[List[str]] = fastapi.Query(None),
+        limit: Optional[int] = fastapi.Query(10, ge=1, le=10000),
+    ) -> models.JobList:
+        """Get the list of submitted jobs, see `BaseClient.get_jobs`."""
+        ...
+
+    @abc.abstractmethod
+    async def get_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        """Get status information of the job, see `BaseClient.get_job`."""
+        ...
+
+    @abc.abstractmethod
+    async def get_job_results(self, job_id: str = fastapi.Path(...)) -> models.Results:
+        """Get results of the job, see `BaseClient.get_job_results`."""
+        ...
+
+    @abc.abstractmethod
+    async def delete_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        """Cancel the job, see `BaseClient.delete_job`."""
+        ...
+
+    async def get_jobs_by_id(
+        self,
+        job_ids: List[str] = fastapi.Body(
+            ..., embed=True, alias="jobIDs", max_length=MAX_JOB_IDS
+        ),
+    ) -> Optional[models.JobList]:
+        """Get status information of several jobs, see `BaseClient.get_jobs_by_id`."""
+        return None
+
+    def watch_job(self, job_id: str) -> Optional[AsyncIterator[models.StatusInfo]]:
+        """Watch the status of the job, see `BaseClient.watch_job`."""
+        return None
+
+    async def get_process_version(self, process_id: str) -> Optional[str]:
+        """Get the version of the process, see `BaseClient.get_process_version`."""
+        return None
+
+    async def get_process_execution_modes(
+        self, process_id: str
+    ) -> Optional[List[models.JobControlOptions]]:
+        """Get the execution modes, see `BaseClient.get_process_execution_modes`."""
+        return None
+
+    async def wait_for_job(
+        self, job_id: str, timeout: float
+    ) -> Optional[models.StatusInfo]:
+        """Wait for the job to be finished, see `BaseClient.wait_for_job`."""
+        return None
+
+    def encode_job_cursor(self, job: models.StatusInfo, direction: str = "next") -> str:
+        """Encode a pagination cursor, see `BaseClient.encode_job_cursor`."""
+        return pagination.encode_job_cursor(job, direction, self.pagination_secret)
+
+    def decode_job_cursor(self, cursor: str) -> pagination.JobCursor:
+        """Decode a pagination cursor, see `BaseClient.decode_job_cursor`."""
+        return pagination.decode_job_cursor(cursor, self.pagination_secret)
+
+    def create_job_pagination(
+        self, jobs: List[models.StatusInfo], has_next: bool, has_prev: bool
+    ) -> models.PaginationQueryParameters:
+        """Create pagination query parameters, see `BaseClient.create_job_pagination`."""
+        return pagination.create_job_pagination(
+            jobs, has_next, has_prev, secret=self.pagination_secret
+        )
+
+
+ClientType = Union[BaseClient, AsyncBaseClient]
+
+
+def implements(client: Union[ClientType, Type[ClientType]], method_name: str) -> bool:
+    """Check whether the client, or client class, overrides an optional hook."""
+    client_class = client if isinstance(client, type) else type(client)
+    base_class = (
+        AsyncBaseClient if issubclass(client_class, AsyncBaseClient) else BaseClient
+    )
+    return getattr(client_class, method_name) is not getattr(base_class, method_name)
+
+
+async def call_client_method(method: Callable[..., Any], **kwargs: Any) -> Any:
+    """Call a client method from the event loop.
+
+    Coroutine functions are awaited, sync functions are run in FastAPI threadpool.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(**kwargs)
+    return await fastapi.concurrency.run_in_threadpool(method, **kwargs)
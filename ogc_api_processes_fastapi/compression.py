@@ -0,0 +1,331 @@
+"""Compression of the responses, negotiated with `Accept-Encoding`."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import abc
+import functools
+import importlib
+import types
+import zlib
+from typing import Dict, Optional, Sequence, Tuple
+
+import fastapi
+import starlette.datastructures
+import starlette.types
+
+from . import caches
+
+
+def import_optional(name: str) -> Optional[types.ModuleType]:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+brotli = import_optional("brotli")
+zstandard = import_optional("zstandard")
+
+# in order of preference, when accepted with the same quality by the client
+ENCODINGS = ("br", "zstd", "gzip")
+
+NOT_COMPRESSED_STATUS_CODES = (204, 206, 304)
+
+
+class Compressor(abc.ABC):
+    """Incremental compressor of a response body."""
+
+    @abc.abstractmethod
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        """Compress a chunk, flushed so that it can be decompressed right away."""
+        ...
+
+    @abc.abstractmethod
+    def finish(self) -> bytes:
+        """Return the end of the compressed stream."""
+        ...
+
+
+class GzipCompressor(Compressor):
+    def __init__(self, level: int) -> None:
+        # gzip container, with a zero modification time: output is deterministic
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        compressed = self._compressor.compress(data)
+        if flush:
+            compressed += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return compressed
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor(Compressor):
+    def __init__(self, quality: int) -> None:
+        assert brotli is not None
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        compressed: bytes = self._compressor.process(data)
+        if flush:
+            compressed += self._compressor.flush()
+        return compressed
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()  # type: ignore[no-any-return]
+
+
+class ZstdCompressor(Compressor):
+    def __init__(self, level: int) -> None:
+        assert zstandard is not None
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        assert zstandard is not None
+        compressed: bytes = self._compressor.compress(data)
+        if flush:
+            compressed += self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return compressed
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()  # type: ignore[no-any-return]
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Return the supported content codings, depending on the installed packages."""
+    installed = {"br": brotli is not None, "zstd": zstandard is not None}
+    return tuple(encoding for encoding in ENCODINGS if installed.get(encoding, True))
+
+
+def parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    """Return the quality of each content coding listed in `Accept-Encoding`."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, parameters = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+@functools.lru_cache(maxsize=256)
+def negotiate_encoding(
+    accept_encoding: str, encodings: Tuple[str, ...]
+) -> Optional[str]:
+    """Select the content coding of a response, or None for no compression.
+
+    Cached, as clients send a handful of distinct `Accept-Encoding` headers.
+    Ties between content codings accepted with the same quality are resolved
+    by the order of `encodings`.
+    """
+    qualities = parse_accept_encoding(accept_encoding)
+    default_quality = qualities.get("*", 0.0)
+    selected, selected_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, default_quality)
+        if quality > selected_quality:
+            selected, selected_quality = encoding, quality
+    return selected
+
+
+def is_compressible(media_type: Optional[str]) -> bool:
+    if media_type is None:
+        return False
+    media_type = media_type.partition(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        # events are sent as they happen, not buffered by a compressor
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type == "application/json"
+        or media_type.endswith("+json")
+    )
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """Entity tag of the compressed representation of a response."""
+    weak, _, opaque_tag = etag.rpartition('"')[0].partition('"')
+    return f'{weak}"{opaque_tag}-{encoding}"'
+
+
+class Compression:
+    """Compression of the JSON and text responses.
+
+    Responses are compressed with the content coding preferred by the client
+    among `encodings`, when their body is at least `minimum_size` bytes.
+    Streamed responses are compressed chunk by chunk, whatever their size.
+    Compressed representations of the cached responses (landing page,
+    conformance classes and processes descriptions) are cached along with them.
+
+    Parameters
+    ----------
+    minimum_size : int
+        Minimum size of the body of a response to be compressed, in bytes.
+    encodings : Optional[Sequence[str]]
+        Supported content codings, in order of preference, among "br" (requires
+        the `brotli` package), "zstd" (requires the `zstandard` package) and "gzip".
+        By default, all the available ones.
+    gzip_level : int
+        Compression level of gzip, from 1 (fastest) to 9.
+    brotli_quality : int
+        Compression quality of brotli, from 0 (fastest) to 11.
+    zstd_level : int
+        Compression level of zstd, from 1 (fastest) to 22.
+    """
+
+    def __init__(
+        self,
+        minimum_size: int = 1024,
+        encodings: Optional[Sequence[str]] = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ) -> None:
+        available = available_encodings()
+        if encodings is None:
+            encodings = available
+        unavailable = [encoding for encoding in encodings if encoding not in available]
+        if unavailable:
+            raise ValueError(f"unavailable content codings: {unavailable}")
+        self.minimum_size = minimum_size
+        self.encodings = tuple(encodings)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        if not accept_encoding:
+            return None
+        return negotiate_encoding(accept_encoding, self.encodings)
+
+    def compressor(self, encoding: str) -> Compressor:
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        if encoding == "zstd":
+            return ZstdCompressor(self.zstd_level)
+        return GzipCompressor(self.gzip_level)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        compressor = self.compressor(encoding)
+        return compressor.compress(body, flush=False) + compressor.finish()
+
+    def compress_cached(self, cached: caches.CachedResponse, encoding: str) -> bytes:
+        """Return the compressed body of a cached response, compressed once."""
+        compressed = cached.compressed.get(encoding)
+        if compressed is None:
+            compressed = self.compress(cached.body, encoding)
+            cached.compressed[encoding] = compressed
+        return compressed
+
+    def add_middleware(self, app: fastapi.FastAPI) -> None:
+        """Add the middleware compressing the responses to the application."""
+        app.add_middleware(CompressionMiddleware, compression=self)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing the responses, see `Compression`.
+
+    Responses that are already encoded (e.g. cached responses) are left as is.
+    """
+
+    def __init__(self, app: starlette.types.ASGIApp, compression: Compression) -> None:
+        self.app = app
+        self.compression = compression
+
+    async def __call__(
+        self,
+        scope: starlette.types.Scope,
+        receive: starlette.types.Receive,
+        send: starlette.types.Send,
+    ) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        request_headers = starlette.datastructures.Headers(scope=scope)
+        encoding = self.compression.negotiate(request_headers.get("accept-encoding"))
+        start_message: Optional[starlette.types.Message] = None
+        compressor: Optional[Compressor] = None
+
+        async def send_compressed(message: starlette.types.Message) -> None:
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                # headers are sent along with the first chunk of the body
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if start_message is not None:
+                message, compressor = self.start(start_message, message, encoding)
+                await send(start_message)
+                start_message = None
+            elif compressor is not None:
+                body = compressor.compress(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body += compressor.finish()
+                message = {**message, "body": body}
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def start(
+        self,
+        start_message: starlette.types.Message,
+        message: starlette.types.Message,
+        encoding: Optional[str],
+    ) -> Tuple[starlette.types.Message, Optional[Compressor]]:
+        """Update the response headers and compress the first chunk of the body.
+
+        Return the chunk to be sent and, if the response is streamed,
+        the compressor of the following chunks.
+        """
+        headers = starlette.datastructures.MutableHeaders(raw=start_message["headers"])
+        if (
+            start_message["status"] in NOT_COMPRESSED_STATUS_CODES
+            or "content-encoding" in headers
+            or "content-range" in headers
+            or not is_compressible(headers.get("content-type"))
+        ):
+            return message, None
+        # already set on cached responses, negotiated by the endpoints
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if encoding is None or (
+            not more_body and len(body) < self.compression.minimum_size
+        ):
+            return message, None
+        headers["Content-Encoding"] = encoding
+        if "etag" in headers:
+            headers["ETag"] = variant_etag(headers["etag"], encoding)
+        compressor = self.compression.compressor(encoding)
+        if more_body:
+            del headers["Content-Length"]
+            compressed = compressor.compress(body)
+            return {**message, "body": compressed}, compressor
+        compressed = compressor.compress(body, flush=False) + compressor.finish()
+        headers["Content-Length"] = str(len(compressed))
+        return {**message, "body": compressed}, None
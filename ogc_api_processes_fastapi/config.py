@@ -1,15 +1,76 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Type, Union
 
-from pydantic import BaseModel
+import fastapi
+from pydantic import BaseModel, ConfigDict, Field
+
+from . import caches, metrics, models, responses
+from . import compression as compression_
+from . import idempotency as idempotency_
 
 
 class RouteConfig(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     path: str
     summary: Optional[str] = None
     methods: List[str]
     status_code: int = 200
     client_method: Optional[str] = None
     deprecated: Optional[bool] = None
+    response_class: Optional[Type[fastapi.Response]] = None
+    responses: Optional[Dict[Union[int, str], Dict[str, Any]]] = None
+
+
+SYNC_EXECUTION_RESPONSES: Dict[Union[int, str], Dict[str, Any]] = {
+    200: {
+        "model": models.Results,
+        "description": "Results of a synchronous execution",
+    },
+}
+
+RAW_RESULTS_RESPONSES: Dict[Union[int, str], Dict[str, Any]] = {
+    200: {
+        "content": {
+            "application/octet-stream": {
+                "schema": {"type": "string", "format": "binary"}
+            }
+        },
+    },
+    206: {"description": "Byte range of a raw result"},
+}
+
+CONFORMANCE_CLASSES: List[str] = [
+    "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/core",
+    "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/ogc-process-description",
+    "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/job-list",
+    "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/json",
+    "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/oas30",
+]
+
+
+class EndpointsConfig(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    trust_client_models: bool = False
+    process_cache: caches.ProcessDescriptionCache = Field(
+        default_factory=caches.ProcessDescriptionCache
+    )
+    title: Optional[str] = None
+    description: Optional[str] = None
+    extra_conformance_classes: List[str] = []
+    static_cache_control: Optional[str] = "max-age=3600"
+    job_poll_interval: float = 1.0
+    max_job_wait: float = 60.0
+    # number of concurrent `get_job` calls of a `POST /jobs/status` request
+    job_status_concurrency: int = 16
+    execution_modes_ttl: float = 300.0
+    validate_execution: bool = False
+    idempotency: Optional[idempotency_.Idempotency] = None
+    execution_cache: Optional[caches.ExecutionCache] = None
+    instrumentation: Optional[metrics.Instrumentation] = None
+    compression: Optional[compression_.Compression] = None
+    # class of the JSON responses, encoding the bodies built by the endpoints
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse
 
 
 ROUTES: Dict[str, RouteConfig] = {
@@ -41,6 +102,7 @@ ROUTES: Dict[str, RouteConfig] = {
         methods=["POST"],
         status_code=201,
         client_method="post_process_execution",
+        responses=SYNC_EXECUTION_RESPONSES,
         deprecated=True,
     ),
     "PostProcessExecution": RouteConfig(
@@ -49,6 +111,7 @@ ROUTES: Dict[str, RouteConfig] = {
         methods=["POST"],
         status_code=201,
         client_method="post_process_execution",
+        responses=SYNC_EXECUTION_RESPONSES,
     ),
     "GetJobs": RouteConfig(
         path="/jobs",
@@ -62,11 +125,19 @@ ROUTES: Dict[str, RouteConfig] = {
         methods=["GET"],
         client_method="get_job",
     ),
+    "GetJobEvents": RouteConfig(
+        path="/jobs/{job_id}/events",
+        summary="Stream of status updates of a job",
+        methods=["GET"],
+        client_method="get_job",
+        response_class=responses.EventStreamResponse,
+    ),
     "GetJobResults": RouteConfig(
         path="/jobs/{job_id}/results",
         summary="Results of a job",
         methods=["GET"],
         client_method="get_job_results",
+        responses=RAW_RESULTS_RESPONSES,
     ),
     "DeleteJob": RouteConfig(
         path="/jobs/{job_id}",
@@ -74,4 +145,10 @@ ROUTES: Dict[str, RouteConfig] = {
         methods=["DELETE"],
         client_method="delete_job",
     ),
+    "PostJobsStatus": RouteConfig(
+        path="/jobs/status",
+        summary="Status of several jobs",
+        methods=["POST"],
+        client_method="get_jobs_by_id",
+    ),
 }
@@ -1,11 +1,109 @@
 """Endpoints definition."""
 
+import asyncio
+import functools
+import inspect
 import urllib.parse
-from typing import Callable, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import attrs
 import fastapi
+import pydantic_core
 
-from . import clients, models
+from . import (
+    caches,
+    clients,
+    config,
+    events,
+    exceptions,
+    filters,
+    idempotency,
+    metrics,
+    models,
+    responses,
+    tenants,
+    validation,
+)
+
+
+@functools.lru_cache(maxsize=128)
+def resolve_url(base_url: str, path: str) -> str:
+    """Resolve `path` against `base_url`, cached as requests share a few base URLs."""
+    return urllib.parse.urljoin(base_url, path)
+
+
+class JobLinks:
+    """Factory of the links to attach to jobs, for a given request.
+
+    URLs are resolved once per request. Links are created either as models or,
+    skipping models altogether, as JSON text templates filled in with the job ID.
+
+    Parameters
+    ----------
+    request : fastapi.Request
+        Request the jobs are returned to.
+    """
+
+    placeholder = "\x00"
+
+    def __init__(self, request: fastapi.Request) -> None:
+        self.jobs_url = resolve_url(str(request.base_url), "jobs/")
+        self.rel = "self"
+        self.title = None
+        if not request.path_params:
+            self.rel = "monitor"
+            self.title = "job status info"
+        self._templates: Dict[bool, List[bytes]] = {}
+
+    def links(self, job: models.StatusInfo) -> List[models.Link]:
+        """Create links to attach to the job.
+
+        Parameters
+        ----------
+        job : models.StatusInfo
+            Job to create links for.
+
+        Returns
+        -------
+        List[models.Link]
+            Links to attach to job.
+        """
+        job_url = self.jobs_url + job.jobID
+        # NOTE: validating these small models is faster than `model_construct`
+        links = [
+            models.Link(
+                href=job_url, rel=self.rel, type="application/json", title=self.title
+            )
+        ]
+        if job.status.value in ("successful", "failed"):
+            links.append(models.Link(href=job_url + "/results", rel="results"))
+        return links
+
+    def dump(self, job: models.StatusInfo) -> bytes:
+        """Create the JSON encoded links to attach to the job."""
+        has_results = job.status.value in ("successful", "failed")
+        template = self._templates.get(has_results)
+        if template is None:
+            # encoded placeholder, to be replaced by the encoded job ID
+            placeholder_job = models.StatusInfo.model_construct(
+                jobID=self.placeholder, status=job.status
+            )
+            template = responses.dump_links(self.links(placeholder_job)).split(
+                pydantic_core.to_json(self.placeholder)[1:-1]
+            )
+            self._templates[has_results] = template
+        return pydantic_core.to_json(job.jobID)[1:-1].join(template)
 
 
 def create_links_to_job(
@@ -23,29 +121,7 @@ def create_links_to_job(
     List[models.Link]
         Links to attach to job.
     """
-    rel_job_link = "self"
-    title_job_link = None
-    if not request.path_params:
-        rel_job_link = "monitor"
-        title_job_link = "job status info"
-    links = [
-        models.Link(
-            href=urllib.parse.urljoin(str(request.base_url), f"jobs/{job.jobID}"),
-            rel=rel_job_link,
-            type="application/json",
-            title=title_job_link,
-        )
-    ]
-    if job.status.value in ("successful", "failed"):
-        links.append(
-            models.Link(
-                href=urllib.parse.urljoin(
-                    str(request.base_url), f"jobs/{job.jobID}/results"
-                ),
-                rel="results",
-            )
-        )
-    return links
+    return JobLinks(request).links(job)
 
 
 def create_self_link(
@@ -59,23 +135,54 @@ def create_self_link(
     return self_link
 
 
+class PageLinks:
+    """Factory of the links to the pages around the current page, for a given request.
+
+    The request query is parsed and encoded once: the query parameters of each
+    page are appended to it, replacing any previous value of the same parameters.
+
+    Parameters
+    ----------
+    request_url : str
+        URL of the request of the current page.
+    pagination_query_params : models.PaginationQueryParameters
+        Query parameters of the next and previous pages.
+    """
+
+    def __init__(
+        self,
+        request_url: str,
+        pagination_query_params: models.PaginationQueryParameters,
+    ) -> None:
+        self.pagination_query_params = pagination_query_params
+        page_keys = set(pagination_query_params.next or ()) | set(
+            pagination_query_params.prev or ()
+        )
+        request_parsed = urllib.parse.urlsplit(request_url)
+        query = urllib.parse.urlencode(
+            [
+                (key, value)
+                for key, value in urllib.parse.parse_qsl(request_parsed.query)
+                if key not in page_keys
+            ]
+        )
+        self.url_prefix = request_parsed._replace(query="").geturl() + "?"
+        if query:
+            self.url_prefix += query + "&"
+
+    def link(self, page: str) -> models.Link:
+        if page not in ("next", "prev"):
+            raise ValueError(f"{page} is not a valid value for ``page`` parameter")
+        query = urllib.parse.urlencode(getattr(self.pagination_query_params, page))
+        return models.Link(href=self.url_prefix + query, rel=page)
+
+
 def create_page_link(
     request_url: str,
     page: str,
     pagination_query_params: models.PaginationQueryParameters,
 ) -> models.Link:
-    if page not in ("next", "prev"):
-        raise ValueError(f"{page} is not a valid value for ``page`` parameter")
-    request_parsed = urllib.parse.urlsplit(request_url)
-    queries = urllib.parse.parse_qs(request_parsed.query)
-    queries_page = queries.copy()
-    queries_new = getattr(pagination_query_params, page)
-    queries_page.update(queries_new)
-    query_string = urllib.parse.urlencode(queries_page, doseq=True)
-    parsed_page_request = request_parsed._replace(query=query_string)
-    url_page = parsed_page_request.geturl()
-    link_page = models.Link(href=url_page, rel=page)
-    return link_page
+    return PageLinks(request_url, pagination_query_params).link(page)
 
 
 def create_pagination_links(
@@ -83,67 +190,155 @@ def create_pagination_links(
     pagination_query_params: Optional[models.PaginationQueryParameters],
 ) -> List[models.Link]:
     pagination_links = []
-    if pagination_query_params:
+    if pagination_query_params and (
+        pagination_query_params.next or pagination_query_params.prev
+    ):
+        page_links = PageLinks(request_url, pagination_query_params)
         if pagination_query_params.next:
-            link_next = create_page_link(request_url, "next", pagination_query_params)
-            pagination_links.append(link_next)
+            pagination_links.append(page_links.link("next"))
         if pagination_query_params.prev:
-            link_prev = create_page_link(request_url, "prev", pagination_query_params)
-            pagination_links.append(link_prev)
+            pagination_links.append(page_links.link("prev"))
     return pagination_links
 
 
+@attrs.define
+class ClientCall:
+    """Call of a client method, with the parameters resolved from a request.
+
+    Returned by the dependencies created by `defer_client_method`, so that
+    endpoints call the client method only when needed, possibly several times.
+    """
+
+    method: Callable[..., Any]
+    kwargs: Dict[str, Any]
+
+    async def __call__(self, **kwargs: Any) -> Any:
+        """Call the client method, `kwargs` adding to the resolved parameters."""
+        return await clients.call_client_method(
+            self.method, **{**self.kwargs, **kwargs}
+        )
+
+
+def defer_client_method(
+    method: Callable[..., Any], exclude: Tuple[str, ...] = ()
+) -> Callable[..., Awaitable[ClientCall]]:
+    """Create a dependency resolving the parameters of a client method, not calling it.
+
+    Parameters are resolved by FastAPI as those of `method` used as a dependency,
+    hence documented alike and independent of the endpoint ones.
+
+    Parameters
+    ----------
+    method : Callable[..., Any]
+        Client method.
+    exclude : Tuple[str, ...], optional
+        Parameters not resolved from the request, to be passed to each call
+        (e.g. `job_id`, to call `get_job` for other jobs than the requested one).
+
+    Returns
+    -------
+    Callable[..., Awaitable[ClientCall]]
+        Dependency returning the deferred call of `method`.
+    """
+    signature = inspect.signature(method)
+
+    async def resolve_client_parameters(**kwargs: Any) -> ClientCall:
+        return ClientCall(method, kwargs)
+
+    resolve_client_parameters.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=[
+            parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY)
+            for name, parameter in signature.parameters.items()
+            if name not in exclude
+        ],
+        return_annotation=ClientCall,
+    )
+    return resolve_client_parameters
+
+
+async def skip_client_method() -> None:
+    """Dependency standing for a deferred client method the endpoint does not need."""
+    return None
+
+
 def create_get_landing_page_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[fastapi.Request], models.LandingPage]:
-    def get_landing_page(
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[fastapi.Response]]:
+    # the landing page only depends on the base URL of the request and the tenant
+    landing_pages: caches.LRUCache[Tuple[str, Optional[str]], caches.CachedResponse] = (
+        caches.LRUCache()
+    )
+
+    async def get_landing_page(
         request: fastapi.Request,
-    ) -> models.LandingPage:
+    ) -> fastapi.Response:
         """Get the API landing page."""
-        links = [
-            models.Link(
-                href=urllib.parse.urljoin(str(request.base_url), "openapi.json"),
-                rel="service-desc",
-                type="application/vnd.oai.openapi+json;version=3.0",
-                title="OpenAPI service description",
-            ),
-            models.Link(
-                href=urllib.parse.urljoin(str(request.base_url), "conformance"),
-                rel="http://www.opengis.net/def/rel/ogc/1.0/conformance",
-                type="application/json",
-                title="Conformance declaration",
-            ),
-            models.Link(
-                href=urllib.parse.urljoin(str(request.base_url), "processes"),
-                rel="http://www.opengis.net/def/rel/ogc/1.0/processes",
-                type="application/json",
-                title="Metadata about the processes",
-            ),
-        ]
-        landing_page = models.LandingPage(links=links)
+        base_url = str(request.base_url)
+        cache_key = (base_url, tenants.current_tenant_id())
+        cached = landing_pages.get(cache_key)
+        if cached is None:
+            links = [
+                models.Link(
+                    href=urllib.parse.urljoin(base_url, "openapi.json"),
+                    rel="service-desc",
+                    type="application/vnd.oai.openapi+json;version=3.0",
+                    title="OpenAPI service description",
+                ),
+                models.Link(
+                    href=urllib.parse.urljoin(base_url, "conformance"),
+                    rel="http://www.opengis.net/def/rel/ogc/1.0/conformance",
+                    type="application/json",
+                    title="Conformance declaration",
+                ),
+                models.Link(
+                    href=urllib.parse.urljoin(base_url, "processes"),
+                    rel="http://www.opengis.net/def/rel/ogc/1.0/processes",
+                    type="application/json",
+                    title="Metadata about the processes",
+                ),
+            ]
+            landing_page = models.LandingPage(
+                title=endpoints_config.title,
+                description=endpoints_config.description,
+                links=links,
+            )
+            cached = caches.CachedResponse.from_body(
+                responses.encode_model(landing_page, endpoints_config.response_class)
+            )
+            landing_pages.set(cache_key, cached)
 
-        return landing_page
+        return responses.cached_response(
+            request,
+            cached,
+            cache_control=endpoints_config.static_cache_control,
+            compression=endpoints_config.compression,
+        )
 
     return get_landing_page
 
 
 def create_get_conformance_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[fastapi.Request], models.ConfClass]:
-    def get_conformance(request: fastapi.Request) -> models.ConfClass:
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[fastapi.Response]]:
+    conformance = models.ConfClass(
+        conformsTo=[
+            *config.CONFORMANCE_CLASSES,
+            *endpoints_config.extra_conformance_classes,
+        ]
+    )
+    cached = caches.CachedResponse.from_body(
+        responses.encode_model(conformance, endpoints_config.response_class)
+    )
+
+    async def get_conformance(request: fastapi.Request) -> fastapi.Response:
         """Get the API conformance declaration page."""
-        conformance = models.ConfClass(
-            conformsTo=[
-                "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/core",
-                "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/ogc-process-description",
-                "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/job-list",
-                "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/json",
-                "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/oas30",
-            ]
+        return responses.cached_response(
+            request,
+            cached,
+            cache_control=endpoints_config.static_cache_control,
+            compression=endpoints_config.compression,
         )
 
-        return conformance
-
     return get_conformance
 
 
@@ -152,25 +347,33 @@ def create_get_conformance_endpoint(
 # Client is passed as a dependency to the endpoint function so that all its
 # arguments are resolved as endpoints parameters and correctly inserted in the
 # automatic documentation.
+# Endpoint functions only decorate the client output, so they are coroutines:
+# FastAPI runs them on the event loop and only sync client methods (`BaseClient`)
+# go through its threadpool, while coroutine ones (`AsyncBaseClient`) are awaited.
 def create_get_processes_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[fastapi.Request], models.ProcessList]:
-    def get_processes(
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[Union[models.ProcessList, fastapi.Response]]]:
+    # with compression, lists are cached by content, so that they are compressed
+    # once as long as they are unchanged, as the processes descriptions
+    process_lists: caches.LRUCache[bytes, caches.CachedResponse] = caches.LRUCache(
+        maxsize=64
+    )
+
+    async def get_processes(
         request: fastapi.Request,
         process_list: models.ProcessList = fastapi.Depends(client.get_processes),
-    ) -> models.ProcessList:
+    ) -> Union[models.ProcessList, fastapi.Response]:
         """Get the list of available processes.
 
         The list of processes contains a summary of each process
         the OGC API - Processes offers, including the link to a
         more detailed description of the process.
         """
+        processes_url = resolve_url(str(request.base_url), "processes/")
         for process in process_list.processes:
             process.links = [
                 models.Link(
-                    href=urllib.parse.urljoin(
-                        str(request.base_url), f"processes/{process.id}"
-                    ),
+                    href=processes_url + process.id,
                     rel="process",
                     type="application/json",
                     title="process description",
@@ -184,27 +387,35 @@ def create_get_processes_endpoint(
         )
         for link in pagination_links:
             process_list.links.append(link)
+        if endpoints_config.compression is None:
+            return process_list
+
+        if not endpoints_config.trust_client_models:
+            process_list = responses.validate_response(  # type: ignore[assignment]
+                process_list, models.ProcessList
+            )
+        body = responses.encode_model(process_list, endpoints_config.response_class)
+        cached = process_lists.get(body)
+        if cached is None:
+            cached = caches.CachedResponse.from_body(body)
+            process_lists.set(body, cached)
 
-        return process_list
+        return responses.cached_response(
+            request, cached, compression=endpoints_config.compression
+        )
 
     return get_processes
 
 
 def create_get_process_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[fastapi.Request], models.ProcessDescription]:
-    def get_process(
-        request: fastapi.Request,
-        process: models.ProcessDescription = fastapi.Depends(client.get_process),
-    ) -> models.ProcessDescription:
-        """Get the description of a specific process.
-
-        The list of processes contains a summary of each process
-        the OGC API - Processes offers, including the link to a
-        more detailed description of the process.
-        """
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[Union[models.ProcessDescription, fastapi.Response]]]:
+    def decorate_process(
+        request: fastapi.Request, process: models.ProcessDescription
+    ) -> None:
+        # without query, as cached descriptions are shared by all the requests
         process.links = [
-            create_self_link(str(request.url)),
+            create_self_link(str(request.url.replace(query=""))),
             models.Link(
                 href=urllib.parse.urljoin(
                     str(request.base_url), f"processes/{process.id}/execution"
@@ -215,34 +426,344 @@ def create_get_process_endpoint(
             ),
         ]
 
-        return process
+    if not clients.implements(client, "get_process_version"):
+
+        async def get_process(
+            request: fastapi.Request,
+            process: models.ProcessDescription = fastapi.Depends(client.get_process),
+        ) -> models.ProcessDescription:
+            """Get the description of a specific process.
+
+            The list of processes contains a summary of each process
+            the OGC API - Processes offers, including the link to a
+            more detailed description of the process.
+            """
+            decorate_process(request, process)
+
+            return process
+
+        return get_process
+
+    process_cache = endpoints_config.process_cache
+
+    async def get_cached_process(
+        request: fastapi.Request,
+        get_process: ClientCall = fastapi.Depends(
+            defer_client_method(client.get_process)
+        ),
+    ) -> Union[models.ProcessDescription, fastapi.Response]:
+        """Get the description of a specific process, from cache if up to date."""
+        process_id = request.path_params["process_id"]
+        base_url = str(request.base_url)
+        tenant_id = tenants.current_tenant_id()
+        version = await clients.call_client_method(
+            client.get_process_version, process_id=process_id
+        )
+        if version is not None:
+            cached = process_cache.get(process_id, base_url, version, tenant_id)
+            if cached is not None:
+                return responses.cached_response(
+                    request, cached, compression=endpoints_config.compression
+                )
+        process: models.ProcessDescription = await get_process()
+        decorate_process(request, process)
+        if version is None:
+            return process
+        cached = process_cache.set(
+            process_id,
+            base_url,
+            version,
+            responses.encode_model(process, endpoints_config.response_class),
+            tenant_id,
+        )
+
+        return responses.cached_response(
+            request, cached, compression=endpoints_config.compression
+        )
+
+    return get_cached_process
+
+
+def get_preferred_wait(request: fastapi.Request) -> Optional[float]:
+    """Get the `wait` preference of the request (RFC 7240), in seconds."""
+    for prefer in request.headers.getlist("prefer"):
+        for preference in prefer.split(","):
+            name, _, value = preference.partition("=")
+            if name.strip().lower() == "wait":
+                try:
+                    return float(value.strip().strip('"'))
+                except ValueError:
+                    return None
+    return None
 
-    return get_process
+
+def get_body_parameter(method: Callable[..., Any]) -> Optional[str]:
+    """Get the name of the parameter of a client method receiving the request body."""
+    for name, parameter in inspect.signature(method).parameters.items():
+        if isinstance(parameter.default, fastapi.params.Body):
+            return name
+    return None
+
+
+def get_request_hash(execution_content: Any) -> str:
+    """Hash the parts of an execution request that determine its results."""
+    if isinstance(execution_content, dict):
+        execution_content = {
+            key: execution_content.get(key) for key in ("inputs", "outputs", "response")
+        }
+    return idempotency.content_hash(execution_content)
+
+
+@attrs.define
+class ProcessExecution:
+    """Parts of a process description needed by the executions.
+
+    Only the parts needed by the enabled features are known: the version with
+    an execution cache, the requests validator with execution validation, and
+    the execution modes with the `get_process_execution_modes` hook.
+    """
+
+    version: Optional[str] = None
+    modes: List[models.JobControlOptions] = attrs.field(factory=list)
+    validator: Optional[validation.ExecuteValidator] = None
 
 
 def create_post_process_execution_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[fastapi.Request, fastapi.Response], models.StatusInfo]:
-    def post_process_execution(
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[Union[models.StatusInfo, fastapi.Response]]]:
+    executions: caches.LRUCache[Tuple[str, Optional[str]], ProcessExecution] = (
+        caches.LRUCache(maxsize=1024, ttl=endpoints_config.execution_modes_ttl)
+    )
+    body_parameter = get_body_parameter(client.post_process_execution)
+    execution_cache = endpoints_config.execution_cache
+    validate_execution = (
+        endpoints_config.validate_execution and body_parameter is not None
+    )
+    # the process description is only fetched by the features needing it
+    get_process_dependency: Callable[..., Awaitable[Optional[ClientCall]]] = (
+        skip_client_method
+    )
+    if validate_execution or execution_cache is not None:
+        get_process_dependency = defer_client_method(client.get_process)
+    get_execution_modes = clients.implements(client, "get_process_execution_modes")
+
+    async def get_execution(
+        process_id: str, get_process: Optional[ClientCall]
+    ) -> ProcessExecution:
+        """Get the version, execution modes and requests validator of a process."""
+        if get_process is None and not get_execution_modes:
+            return ProcessExecution()
+        cache_key = (process_id, tenants.current_tenant_id())
+        execution = executions.get(cache_key)
+        if execution is None:
+            execution = ProcessExecution()
+            if get_process is not None:
+                process: models.ProcessDescription = await get_process()
+                execution.version = process.version
+                execution.modes = process.jobControlOptions or []
+                if validate_execution:
+                    execution.validator = validation.ExecuteValidator(process)
+            if get_execution_modes:
+                modes = await clients.call_client_method(
+                    client.get_process_execution_modes, process_id=process_id
+                )
+                if modes is not None:
+                    execution.modes = modes
+            executions.set(cache_key, execution)
+        return execution
+
+    async def get_memoized_job(
+        cache: caches.ExecutionCache,
+        process_id: str,
+        version: str,
+        request_hash: str,
+        get_job: ClientCall,
+    ) -> Optional[models.StatusInfo]:
+        """Get a successful job created by the same execution, if any.
+
+        Jobs not found, failed or dismissed are removed from the cache,
+        unfinished ones are kept until they are found successful.
+        """
+        tenant_id = tenants.current_tenant_id()
+        job_ids = cache.get(process_id, version, request_hash, tenant_id)
+        job: Optional[models.StatusInfo] = None
+        for job_id in job_ids:
+            try:
+                candidate: Optional[models.StatusInfo] = await get_job(job_id=job_id)
+            except exceptions.NoSuchJob:
+                candidate = None
+            if (
+                candidate is not None
+                and candidate.status == models.StatusCode.successful
+            ):
+                job = candidate
+                cache.set_successful(
+                    process_id, version, request_hash, job_id, tenant_id
+                )
+                break
+            if candidate is None or candidate.status in (
+                models.StatusCode.failed,
+                models.StatusCode.dismissed,
+            ):
+                cache.discard(process_id, version, request_hash, job_id, tenant_id)
+        cache.record(hit=job is not None)
+        return job
+
+    async def create_job(
+        process_id: str,
+        execution: ProcessExecution,
+        execution_content: Any,
+        submit: ClientCall,
+        get_job: ClientCall,
+    ) -> Tuple[models.StatusInfo, bool]:
+        """Submit a job, unless the results of the same execution can be reused.
+
+        Return the job and whether it was created by a previous execution.
+        """
+        request_hash = None
+        if (
+            execution_cache is not None
+            and execution.version is not None
+            and execution_content is not None
+        ):
+            request_hash = get_request_hash(execution_content)
+            job = await get_memoized_job(
+                execution_cache, process_id, execution.version, request_hash, get_job
+            )
+            if job is not None:
+                return job, True
+        status_info: models.StatusInfo = await submit()
+        if (
+            execution_cache is not None
+            and execution.version is not None
+            and request_hash is not None
+        ):
+            execution_cache.add(
+                process_id,
+                execution.version,
+                request_hash,
+                status_info.jobID,
+                tenants.current_tenant_id(),
+            )
+        return status_info, False
+
+    def get_sync_execution_timeout(
+        request: fastapi.Request, modes: List[models.JobControlOptions]
+    ) -> Tuple[Optional[float], Dict[str, str]]:
+        """Get the time to wait for the job, if executed synchronously."""
+        if modes and models.JobControlOptions.sync_execute not in modes:
+            return None, {}
+        wait = get_preferred_wait(request)
+        if wait is not None:
+            wait = min(wait, endpoints_config.max_job_wait)
+            return wait, {"Preference-Applied": f"wait={wait:g}"}
+        if modes == [models.JobControlOptions.sync_execute]:
+            return endpoints_config.max_job_wait, {}
+        return None, {}
+
+    async def post_process_execution(
         request: fastapi.Request,
         response: fastapi.Response,
-        status_info: models.StatusInfo = fastapi.Depends(client.post_process_execution),
-    ) -> models.StatusInfo:
-        """Create a new job."""
-        status_info.links = [
-            create_self_link(str(request.url)),
-            models.Link(
-                href=urllib.parse.urljoin(
-                    str(request.base_url), f"jobs/{status_info.jobID}"
-                ),
-                rel="monitor",
-                type="application/json",
-                title="job status info",
-            ),
-        ]
-        response.headers["Location"] = urllib.parse.urljoin(
-            str(request.base_url), f"jobs/{status_info.jobID}"
+        submit: ClientCall = fastapi.Depends(
+            defer_client_method(client.post_process_execution)
+        ),
+        get_process: Optional[ClientCall] = fastapi.Depends(get_process_dependency),
+        get_job: ClientCall = fastapi.Depends(
+            defer_client_method(client.get_job, exclude=("job_id",))
+        ),
+        get_job_results: ClientCall = fastapi.Depends(
+            defer_client_method(client.get_job_results, exclude=("job_id",))
+        ),
+    ) -> Union[models.StatusInfo, fastapi.Response]:
+        """Create a new job.
+
+        The job is executed synchronously, returning its results, if requested
+        with `Prefer: wait=<seconds>` or if the process only supports `sync-execute`.
+        If the job is not finished in time, its status is returned as usual.
+        With an execution cache, the successful job of a previous identical
+        execution is returned instead of a new one.
+        """
+        process_id = request.path_params["process_id"]
+        execution_content = (
+            submit.kwargs[body_parameter] if body_parameter is not None else None
         )
+        execution = await get_execution(process_id, get_process)
+        if execution.validator is not None:
+            execution.validator.validate(execution_content)
+        timeout, headers = get_sync_execution_timeout(request, execution.modes)
+        deduplication = endpoints_config.idempotency
+        request_key = None
+        if deduplication is not None:
+            request_key = deduplication.request_key(
+                request,
+                f"{tenants.current_tenant_id() or ''}/{process_id}",
+                execution_content,
+            )
+        if deduplication is not None and request_key is not None:
+            stored = await deduplication.lookup(*request_key)
+            if stored is not None:
+                return deduplication.replay(stored)
+        stored = None
+        try:
+            status_info, memoized = await create_job(
+                process_id, execution, execution_content, submit, get_job
+            )
+            job_url = urllib.parse.urljoin(
+                str(request.base_url), f"jobs/{status_info.jobID}"
+            )
+            job_links = [
+                create_self_link(str(request.url)),
+                models.Link(
+                    href=job_url,
+                    rel="monitor",
+                    type="application/json",
+                    title="job status info",
+                ),
+            ]
+            if memoized:
+                job_links.append(models.Link(href=job_url + "/results", rel="results"))
+            if request_key is not None:
+                stored = idempotency.StoredExecution(
+                    fingerprint=request_key[1],
+                    body=responses.encode_model(
+                        status_info.model_copy(update={"links": job_links}),
+                        endpoints_config.response_class,
+                    ),
+                    location=job_url,
+                )
+        finally:
+            if deduplication is not None and request_key is not None:
+                await deduplication.complete(request_key[0], stored)
+        if timeout is not None:
+            if not memoized:
+                with metrics.measure("wait"):
+                    status_info = await events.wait_for_job(
+                        client,
+                        status_info,
+                        timeout,
+                        endpoints_config.job_poll_interval,
+                        functools.partial(get_job, job_id=status_info.jobID),
+                    )
+            if status_info.status in (
+                models.StatusCode.successful,
+                models.StatusCode.failed,
+            ):
+                results = await get_job_results(job_id=status_info.jobID)
+                results_response = await responses.raw_results_response(
+                    request, results
+                )
+                if results_response is None:
+                    results_response = fastapi.Response(
+                        content=responses.encode_model(
+                            models.Results.model_validate(results),
+                            endpoints_config.response_class,
+                        ),
+                        media_type="application/json",
+                    )
+                results_response.headers.update({"Location": job_url, **headers})
+                return results_response
+        status_info.links = job_links
+        response.headers["Location"] = job_url
 
         return status_info
 
@@ -250,60 +771,157 @@ def create_post_process_execution_endpoint(
 
 
 def create_get_jobs_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[fastapi.Request], models.JobList]:
-    def get_jobs(
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[Union[models.JobList, fastapi.Response]]]:
+    async def get_jobs(
         request: fastapi.Request,
-        job_list: models.JobList = fastapi.Depends(client.get_jobs),
-    ) -> models.JobList:
+        job_list: Union[models.JobList, models.StreamingJobList] = fastapi.Depends(
+            client.get_jobs
+        ),
+        fields: Optional[FrozenSet[str]] = fastapi.Depends(
+            filters.job_fields_from_query
+        ),
+    ) -> Union[models.JobList, fastapi.Response]:
         """Show the list of submitted jobs."""
-        for job in job_list.jobs:
-            job.links = create_links_to_job(job=job, request=request)
-        job_list.links = [
-            create_self_link(str(request.url), title="list of submitted jobs"),
-        ]
-        pagination_links = create_pagination_links(
-            str(request.url), job_list._pagination_query_params
-        )
-        for link in pagination_links:
-            job_list.links.append(link)
 
-        return job_list
+        def create_job_list_links() -> List[models.Link]:
+            links = [
+                create_self_link(str(request.url), title="list of submitted jobs"),
+            ]
+            pagination_links = create_pagination_links(
+                str(request.url), job_list._pagination_query_params
+            )
+            for link in pagination_links:
+                links.append(link)
+            return links
+
+        job_links = JobLinks(request)
+        if isinstance(job_list, models.StreamingJobList):
+            return responses.stream_job_list(
+                job_list,
+                job_links.dump,
+                create_job_list_links,
+                fields=fields,
+                response_class=endpoints_config.response_class,
+            )
+        job_list.links = create_job_list_links()
+
+        return responses.job_list_response(
+            job_list,
+            job_links.dump,
+            fields=fields,
+            response_model=(
+                None if endpoints_config.trust_client_models else models.JobList
+            ),
+            response_class=endpoints_config.response_class,
+        )
 
     return get_jobs
 
 
 def create_get_job_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[fastapi.Request], models.StatusInfo]:
-    def get_job(
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[Union[models.StatusInfo, fastapi.Response]]]:
+    async def get_job(
         request: fastapi.Request,
-        job: models.StatusInfo = fastapi.Depends(client.get_job),
-    ) -> models.StatusInfo:
+        get_job: ClientCall = fastapi.Depends(defer_client_method(client.get_job)),
+        wait: Optional[float] = fastapi.Query(
+            None,
+            ge=0,
+            le=endpoints_config.max_job_wait,
+            description="Seconds to wait for a change of the job status",
+        ),
+        fields: Optional[FrozenSet[str]] = fastapi.Depends(
+            filters.job_fields_from_query
+        ),
+    ) -> Union[models.StatusInfo, fastapi.Response]:
         """Show the status of a job."""
-        job.links = create_links_to_job(job=job, request=request)
+        job: models.StatusInfo = await get_job()
+        if wait:
+            updates = events.watch_job_updates(
+                client, job, endpoints_config.job_poll_interval, get_job
+            )
+            try:
+                with metrics.measure("wait"):
+                    async with asyncio.timeout(wait):
+                        job = await anext(updates, job)
+            except TimeoutError:
+                pass
+            finally:
+                await updates.aclose()
+        if fields is None or "links" in fields:
+            job.links = create_links_to_job(job=job, request=request)
+        if fields is not None:
+            return responses.projected_response(
+                job,
+                fields,
+                None if endpoints_config.trust_client_models else models.StatusInfo,
+                endpoints_config.response_class,
+            )
 
         return job
 
     return get_job
 
 
+def create_get_job_events_endpoint(
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[fastapi.Response]]:
+    async def get_job_events(
+        request: fastapi.Request,
+        get_job: ClientCall = fastapi.Depends(defer_client_method(client.get_job)),
+    ) -> fastapi.Response:
+        """Stream the status of a job each time it changes, as server-sent events."""
+        job: models.StatusInfo = await get_job()
+
+        def encode_event(update: models.StatusInfo) -> bytes:
+            update.links = create_links_to_job(job=update, request=request)
+            return responses.format_event(responses.dump_model(update), event="status")
+
+        async def encode_events() -> AsyncIterator[bytes]:
+            updates = events.watch_job_updates(
+                client, job, endpoints_config.job_poll_interval, get_job
+            )
+            try:
+                yield encode_event(job)
+                async for update in updates:
+                    yield encode_event(update)
+            finally:
+                await updates.aclose()
+
+        return responses.EventStreamResponse(
+            encode_events(), headers={"Cache-Control": "no-cache"}
+        )
+
+    return get_job_events
+
+
 def create_get_job_results_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[], models.Results]:
-    def get_job_results(
-        job_results: models.Results = fastapi.Depends(client.get_job_results),
-    ) -> models.Results:
-        """Show results of a job."""
-        return job_results
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[Union[models.Results, fastapi.Response]]]:
+    async def get_job_results(
+        request: fastapi.Request,
+        job_results: Union[
+            models.Results, models.RawResult, models.FileResult
+        ] = fastapi.Depends(client.get_job_results),
+    ) -> Union[models.Results, fastapi.Response]:
+        """Show results of a job.
+
+        Raw and file results are sent as is, with support of range requests.
+        """
+        response = await responses.raw_results_response(request, job_results)
+        if response is not None:
+            return response
+
+        return job_results  # type: ignore[return-value]
 
     return get_job_results
 
 
 def create_delete_job_endpoint(
-    client: clients.BaseClient,
-) -> Callable[[], models.StatusInfo]:
-    def delete_job(
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[models.StatusInfo]]:
+    async def delete_job(
         job: models.StatusInfo = fastapi.Depends(client.delete_job),
     ) -> models.StatusInfo:
         """Cancel a job."""
@@ -312,6 +930,88 @@ def create_delete_job_endpoint(
     return delete_job
 
 
+async def get_job_ids(
+    job_ids: List[str] = fastapi.Body(..., embed=True, alias="jobIDs"),
+) -> List[str]:
+    """Get the identifiers of the jobs of a `POST /jobs/status` request.
+
+    Requests of more than `clients.MAX_JOB_IDS` jobs are rejected with
+    `400 Bad Request`, before the client is called.
+    """
+    if len(job_ids) > clients.MAX_JOB_IDS:
+        raise exceptions.InvalidParameterValue(
+            detail=f"at most {clients.MAX_JOB_IDS} jobIDs can be requested at once"
+        )
+    return job_ids
+
+
+async def get_jobs_one_by_one(
+    get_job: ClientCall, job_ids: List[str], concurrency: int
+) -> models.JobList:
+    """Get the jobs concurrently with `get_job`, leaving out the unknown ones.
+
+    At most `concurrency` calls run at once: sync clients take a threadpool
+    thread per call.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def get_job_or_none(job_id: str) -> Optional[models.StatusInfo]:
+        try:
+            async with semaphore:
+                job: models.StatusInfo = await get_job(job_id=job_id)
+        except exceptions.NoSuchJob:
+            return None
+        return job
+
+    jobs = await asyncio.gather(*(get_job_or_none(job_id) for job_id in job_ids))
+    return models.JobList(jobs=[job for job in jobs if job is not None])
+
+
+def create_post_jobs_status_endpoint(
+    client: clients.ClientType, endpoints_config: config.EndpointsConfig
+) -> Callable[..., Awaitable[models.JobList]]:
+    get_job_dependency = defer_client_method(client.get_job, exclude=("job_id",))
+
+    if clients.implements(client, "get_jobs_by_id"):
+
+        async def post_jobs_status(
+            request: fastapi.Request,
+            # checked first, the client validates the same body parameter
+            job_ids: List[str] = fastapi.Depends(get_job_ids),
+            job_list: Optional[models.JobList] = fastapi.Depends(client.get_jobs_by_id),
+            get_job: ClientCall = fastapi.Depends(get_job_dependency),
+        ) -> models.JobList:
+            """Show the status of several jobs."""
+            if job_list is None:
+                job_list = await get_jobs_one_by_one(
+                    get_job, job_ids, endpoints_config.job_status_concurrency
+                )
+            job_links = JobLinks(request)
+            for job in job_list.jobs:
+                job.links = job_links.links(job)
+
+            return job_list
+
+        return post_jobs_status
+
+    async def post_jobs_status_fan_out(
+        request: fastapi.Request,
+        job_ids: List[str] = fastapi.Depends(get_job_ids),
+        get_job: ClientCall = fastapi.Depends(get_job_dependency),
+    ) -> models.JobList:
+        """Show the status of several jobs, retrieved concurrently one by one."""
+        job_list = await get_jobs_one_by_one(
+            get_job, job_ids, endpoints_config.job_status_concurrency
+        )
+        job_links = JobLinks(request)
+        for job in job_list.jobs:
+            job.links = job_links.links(job)
+
+        return job_list
+
+    return post_jobs_status_fan_out
+
+
 endpoints_generators = {
     "GetLandingPage": create_get_landing_page_endpoint,
     "GetConformance": create_get_conformance_endpoint,
@@ -320,16 +1020,21 @@ endpoints_generators = {
     "PostProcessExecution": create_post_process_execution_endpoint,
     "GetJobs": create_get_jobs_endpoint,
     "GetJob": create_get_job_endpoint,
+    "GetJobEvents": create_get_job_events_endpoint,
     "GetJobResults": create_get_job_results_endpoint,
     "DeleteJob": create_delete_job_endpoint,
+    "PostJobsStatus": create_post_jobs_status_endpoint,
     "PostProcessExecute": create_post_process_execution_endpoint,
 }
 
 
 def create_endpoint(  # type: ignore
     route_name: str,
-    client: clients.BaseClient,
+    client: clients.ClientType,
+    endpoints_config: Optional[config.EndpointsConfig] = None,
 ):
-    endpoint = endpoints_generators[route_name](client)
+    if endpoints_config is None:
+        endpoints_config = config.EndpointsConfig()
+    endpoint = endpoints_generators[route_name](client, endpoints_config)
 
     return endpoint
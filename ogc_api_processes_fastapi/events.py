@@ -0,0 +1,269 @@
+"""Jobs status updates notification."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import asyncio
+import collections
+import functools
+import threading
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    DefaultDict,
+    Optional,
+    Set,
+)
+
+from . import clients, models
+
+# first interval between polls, doubled up to the configured interval
+MIN_POLL_INTERVAL = 0.05
+
+FINAL_STATUSES = {
+    models.StatusCode.successful,
+    models.StatusCode.failed,
+    models.StatusCode.dismissed,
+}
+
+
+def status_changed(old: models.StatusInfo, new: models.StatusInfo) -> bool:
+    return old.model_dump(exclude={"links"}) != new.model_dump(exclude={"links"})
+
+
+class Subscription:
+    """Asynchronous iterator over the status updates of a job.
+
+    Updates published while the subscriber is busy are coalesced: only the
+    latest one is yielded. Iteration stops after a final status.
+    """
+
+    def __init__(self, broker: "JobStatusBroker", job_id: str) -> None:
+        self.broker = broker
+        self.job_id = job_id
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[models.StatusInfo] = asyncio.Queue()
+        self._done = False
+
+    def put(self, status_info: models.StatusInfo) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, status_info)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> models.StatusInfo:
+        if self._done:
+            raise StopAsyncIteration
+        status_info = await self._queue.get()
+        while not self._queue.empty():
+            status_info = self._queue.get_nowait()
+        if status_info.status in FINAL_STATUSES:
+            await self.aclose()
+        return status_info
+
+    async def aclose(self) -> None:
+        self._done = True
+        self.broker.unsubscribe(self)
+
+
+class JobStatusBroker:
+    """In-process publish/subscribe of jobs status updates.
+
+    Clients publish the status of a job each time it changes, possibly from
+    worker threads, and implement `watch_job` with `subscribe`.
+    Subscribers must run in the event loop serving the API, so a single worker
+    process is enough and no external broker is needed.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: DefaultDict[str, Set[Subscription]] = (
+            collections.defaultdict(set)
+        )
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id: str) -> Subscription:
+        """Subscribe to the status updates of the job identified by `job_id`.
+
+        Must be called from the event loop, updates published from then on
+        are yielded by the returned subscription.
+        """
+        subscription = Subscription(self, job_id)
+        with self._lock:
+            self._subscriptions[job_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.job_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.job_id, None)
+
+    def publish(self, status_info: models.StatusInfo) -> None:
+        """Notify the subscribers of a job of its new status. Thread-safe."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(status_info.jobID, ()))
+        for subscription in subscriptions:
+            subscription.put(status_info)
+
+
+def default_get_job(
+    client: clients.ClientType, job_id: str
+) -> Callable[[], Awaitable[models.StatusInfo]]:
+    """Return a function calling the client `get_job` with only the job ID."""
+    return functools.partial(clients.call_client_method, client.get_job, job_id=job_id)
+
+
+async def poll_job(
+    get_job: Callable[[], Awaitable[models.StatusInfo]], interval: float
+) -> AsyncIterator[models.StatusInfo]:
+    """Poll `get_job`, yielding the status when it changes.
+
+    Polls are frequent at first, so that short jobs are noticed quickly, then
+    back off up to one every `interval` seconds.
+    """
+    last_job: Optional[models.StatusInfo] = None
+    delay = min(interval, MIN_POLL_INTERVAL)
+    while True:
+        job = await get_job()
+        if last_job is None or status_changed(last_job, job):
+            yield job
+            last_job = job
+        if job.status in FINAL_STATUSES:
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, interval)
+
+
+async def prepend_job(
+    get_job: Callable[[], Awaitable[models.StatusInfo]],
+    updates: AsyncIterator[models.StatusInfo],
+) -> AsyncGenerator[models.StatusInfo, None]:
+    """Yield the status returned by `get_job`, then the `updates` of the job."""
+    try:
+        yield await get_job()
+        async for update in updates:
+            yield update
+    finally:
+        aclose = getattr(updates, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def watch_job_updates(
+    client: clients.ClientType,
+    job: models.StatusInfo,
+    poll_interval: float,
+    get_job: Optional[Callable[[], Awaitable[models.StatusInfo]]] = None,
+) -> AsyncGenerator[models.StatusInfo, None]:
+    """Yield the status of a job each time it changes, until a final status.
+
+    Updates come from the client `watch_job`, or from polling `get_job`
+    if the client does not implement it or returns None. As `job` was read
+    before watching the job, its status is read again once `watch_job` has
+    subscribed to the updates, not to miss the ones published in between.
+
+    Parameters
+    ----------
+    client : clients.ClientType
+        Client to be used to watch the job.
+    job : models.StatusInfo
+        Current status of the job, updates are yielded when different from it.
+    poll_interval : float
+        Interval between polls, in seconds.
+    get_job : Optional[Callable[[], Awaitable[models.StatusInfo]]], optional
+        Function returning the status of the job, e.g. the client `get_job`
+        with the parameters resolved from the request. By default, the client
+        `get_job` is called with the job ID only.
+
+    Yields
+    ------
+    models.StatusInfo
+        Status of the job.
+    """
+    if job.status in FINAL_STATUSES:
+        return
+    if get_job is None:
+        get_job = default_get_job(client, job.jobID)
+    watched = None
+    if clients.implements(client, "watch_job"):
+        watched = client.watch_job(job_id=job.jobID)
+    updates: AsyncIterator[models.StatusInfo]
+    if watched is not None:
+        updates = prepend_job(get_job, watched)
+    else:
+        updates = poll_job(get_job, poll_interval)
+    try:
+        async for update in updates:
+            if status_changed(job, update):
+                yield update
+                job = update
+            if job.status in FINAL_STATUSES:
+                return
+    finally:
+        aclose = getattr(updates, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def wait_for_job(
+    client: clients.ClientType,
+    job: models.StatusInfo,
+    timeout: float,
+    poll_interval: float,
+    get_job: Optional[Callable[[], Awaitable[models.StatusInfo]]] = None,
+) -> models.StatusInfo:
+    """Wait up to `timeout` seconds for a job to reach a final status.
+
+    Uses the client `wait_for_job` if implemented, otherwise, or if it returns
+    None, watches the job as `watch_job_updates`.
+
+    Parameters
+    ----------
+    client : clients.ClientType
+        Client to be used to wait for the job.
+    job : models.StatusInfo
+        Current status of the job.
+    timeout : float
+        Maximum time to wait, in seconds.
+    poll_interval : float
+        Interval between polls, in seconds.
+    get_job : Optional[Callable[[], Awaitable[models.StatusInfo]]], optional
+        Function returning the status of the job, see `watch_job_updates`.
+
+    Returns
+    -------
+    models.StatusInfo
+        Last known status of the job.
+    """
+    if job.status in FINAL_STATUSES:
+        return job
+    if clients.implements(client, "wait_for_job"):
+        last_job: Optional[models.StatusInfo] = await clients.call_client_method(
+            client.wait_for_job, job_id=job.jobID, timeout=timeout
+        )
+        if last_job is not None:
+            return last_job
+    updates = watch_job_updates(client, job, poll_interval, get_job)
+    try:
+        async with asyncio.timeout(timeout):
+            async for job in updates:
+                pass
+    except TimeoutError:
+        pass
+    finally:
+        await updates.aclose()
+    return job
@@ -14,10 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 
-from typing import Callable, Optional
+from typing import Callable, Optional, Type
 
 import attrs
 import fastapi
+import fastapi.datastructures
 
 from . import exceptions, models
 
@@ -59,6 +60,13 @@ class ResultsNotReady(OGCAPIException):
     title: str = "job results not ready"
 
 
+@attrs.define
+class ResultsNotFound(OGCAPIException):
+    type: str = "results not found"
+    status_code: int = fastapi.status.HTTP_404_NOT_FOUND
+    title: str = "job results not found"
+
+
 @attrs.define
 class JobResultsFailed(OGCAPIException):
     type: str = "job results failed"
@@ -66,10 +74,68 @@ class JobResultsFailed(OGCAPIException):
     title: str = "job failed"
 
 
+@attrs.define
+class InvalidCursor(OGCAPIException):
+    type: str = "invalid cursor"
+    status_code: int = fastapi.status.HTTP_400_BAD_REQUEST
+    title: str = "invalid pagination cursor"
+
+
+@attrs.define
+class InvalidParameterValue(OGCAPIException):
+    type: str = "invalid parameter value"
+    status_code: int = fastapi.status.HTTP_400_BAD_REQUEST
+    title: str = "invalid parameter value"
+
+
+@attrs.define
+class NoSuchTenant(OGCAPIException):
+    type: str = "no such tenant"
+    status_code: int = fastapi.status.HTTP_404_NOT_FOUND
+    title: str = "tenant not found"
+
+
+@attrs.define
+class InvalidInput(OGCAPIException):
+    type: str = "invalid input"
+    status_code: int = fastapi.status.HTTP_400_BAD_REQUEST
+    title: str = "invalid execution request"
+
+
+@attrs.define
+class IdempotencyKeyReused(OGCAPIException):
+    type: str = "idempotency key reused"
+    # unprocessable content, named differently across starlette versions
+    status_code: int = 422
+    title: str = "idempotency key already used for a different request"
+
+
+@attrs.define
+class JobQueueFull(OGCAPIException):
+    type: str = "job queue full"
+    status_code: int = fastapi.status.HTTP_503_SERVICE_UNAVAILABLE
+    title: str = "too many jobs waiting to be run"
+
+
+def get_json_response_class(
+    request: fastapi.Request,
+) -> Type[fastapi.responses.JSONResponse]:
+    """Return the default response class of the application, if it encodes JSON."""
+    response_class = request.app.router.default_response_class
+    if isinstance(response_class, fastapi.datastructures.DefaultPlaceholder):
+        response_class = response_class.value
+    if isinstance(response_class, type) and issubclass(
+        response_class, fastapi.responses.JSONResponse
+    ):
+        return response_class
+    return fastapi.responses.JSONResponse
+
+
 def ogc_api_exception_handler(
     request: fastapi.Request, exc: OGCAPIException
 ) -> fastapi.responses.JSONResponse:
-    return fastapi.responses.JSONResponse(
+    response_class = get_json_response_class(request)
+    return response_class(
         status_code=exc.status_code,
         content=models.Exception(
             type=exc.type,
@@ -103,5 +169,12 @@ def include_exception_handlers(
     app.add_exception_handler(NoSuchProcess, exception_handler)  # type: ignore
     app.add_exception_handler(NoSuchJob, exception_handler)  # type: ignore
     app.add_exception_handler(ResultsNotReady, exception_handler)  # type: ignore
+    app.add_exception_handler(ResultsNotFound, exception_handler)  # type: ignore
     app.add_exception_handler(JobResultsFailed, exception_handler)  # type: ignore
+    app.add_exception_handler(InvalidCursor, exception_handler)  # type: ignore
+    app.add_exception_handler(InvalidParameterValue, exception_handler)  # type: ignore
+    app.add_exception_handler(NoSuchTenant, exception_handler)  # type: ignore
+    app.add_exception_handler(InvalidInput, exception_handler)  # type: ignore
+    app.add_exception_handler(IdempotencyKeyReused, exception_handler)  # type: ignore
+    app.add_exception_handler(JobQueueFull, exception_handler)  # type: ignore
     return app
@@ -0,0 +1,231 @@
+"""Filters and projection of the jobs, passed down to the client."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import datetime
+from typing import FrozenSet, List, Optional
+
+import attrs
+import fastapi
+import pydantic
+
+from . import exceptions, models
+
+datetime_adapter = pydantic.TypeAdapter(datetime.datetime)
+
+# always returned, so that projected jobs are valid `StatusInfo`
+REQUIRED_JOB_FIELDS = frozenset(
+    name
+    for name, field in models.StatusInfo.model_fields.items()
+    if field.is_required()
+)
+
+
+def as_utc(instant: datetime.datetime) -> datetime.datetime:
+    """Return the instant, in UTC if naive, so that it compares with aware ones."""
+    if instant.tzinfo is None:
+        return instant.replace(tzinfo=datetime.timezone.utc)
+    return instant
+
+
+@attrs.define
+class DatetimeInterval:
+    """Closed interval of time, unbounded on the sides set to None."""
+
+    start: Optional[datetime.datetime] = None
+    end: Optional[datetime.datetime] = None
+
+    def contains(self, instant: datetime.datetime) -> bool:
+        instant = as_utc(instant)
+        if self.start is not None and instant < self.start:
+            return False
+        if self.end is not None and instant > self.end:
+            return False
+        return True
+
+
+def parse_datetime(value: str) -> datetime.datetime:
+    """Parse an instant of the `datetime` query parameter, in UTC if naive."""
+    try:
+        return as_utc(datetime_adapter.validate_python(value))
+    except pydantic.ValidationError:
+        raise exceptions.InvalidParameterValue(
+            detail=f"invalid datetime {value!r} in 'datetime' parameter"
+        )
+
+
+def parse_datetime_interval(value: str) -> DatetimeInterval:
+    """Parse the `datetime` query parameter, an instant or an interval.
+
+    Intervals are two instants separated by `/`, either of which may be
+    `..` or empty for an unbounded interval, as in OGC API - Features.
+    """
+    if "/" not in value:
+        instant = parse_datetime(value)
+        return DatetimeInterval(start=instant, end=instant)
+    start, _, end = value.partition("/")
+    interval = DatetimeInterval(
+        start=parse_datetime(start) if start not in ("", "..") else None,
+        end=parse_datetime(end) if end not in ("", "..") else None,
+    )
+    if (
+        interval.start is not None
+        and interval.end is not None
+        and interval.start > interval.end
+    ):
+        raise exceptions.InvalidParameterValue(
+            detail="start of 'datetime' interval is after its end"
+        )
+    return interval
+
+
+def job_duration(
+    job: models.StatusInfo, now: Optional[datetime.datetime] = None
+) -> Optional[datetime.timedelta]:
+    """Return the duration of a job, up to now if it is still running."""
+    if job.started is None:
+        return None
+    end = job.finished
+    if end is None:
+        end = now if now is not None else datetime.datetime.now(datetime.timezone.utc)
+    return as_utc(end) - as_utc(job.started)
+
+
+@attrs.define
+class JobFilter:
+    """Filters of the list of jobs (`GET /jobs`).
+
+    Filters set to None are not applied. Clients are expected to translate
+    the filter into a query of their backend, `matches` is the reference
+    implementation, for backends listing jobs in memory.
+
+    Attributes
+    ----------
+    process_ids : Optional[List[str]]
+        IDs of the processes the jobs were created for (`processID`).
+    status : Optional[List[models.StatusCode]]
+        Statuses of the jobs (`status`).
+    types : Optional[List[models.JobType]]
+        Types of the jobs (`type`).
+    created : Optional[DatetimeInterval]
+        Interval of the creation time of the jobs (`datetime`).
+    min_duration : Optional[datetime.timedelta]
+        Minimum duration of the jobs (`minDuration`).
+    max_duration : Optional[datetime.timedelta]
+        Maximum duration of the jobs (`maxDuration`).
+    """
+
+    process_ids: Optional[List[str]] = None
+    status: Optional[List[models.StatusCode]] = None
+    types: Optional[List[models.JobType]] = None
+    created: Optional[DatetimeInterval] = None
+    min_duration: Optional[datetime.timedelta] = None
+    max_duration: Optional[datetime.timedelta] = None
+
+    def matches(
+        self, job: models.StatusInfo, now: Optional[datetime.datetime] = None
+    ) -> bool:
+        """Check whether a job passes the filter.
+
+        Jobs without creation time (or start time) never match a `datetime`
+        (or duration) filter.
+        """
+        if self.process_ids is not None and job.processID not in self.process_ids:
+            return False
+        if self.status is not None and job.status not in self.status:
+            return False
+        if self.types is not None and job.type not in self.types:
+            return False
+        if self.created is not None and (
+            job.created is None or not self.created.contains(job.created)
+        ):
+            return False
+        if self.min_duration is not None or self.max_duration is not None:
+            duration = job_duration(job, now)
+            if duration is None:
+                return False
+            if self.min_duration is not None and duration < self.min_duration:
+                return False
+            if self.max_duration is not None and duration > self.max_duration:
+                return False
+        return True
+
+
+def job_filter_from_query(
+    processID: Optional[List[str]] = fastapi.Query(None),
+    status: Optional[List[models.StatusCode]] = fastapi.Query(None),
+    types: Optional[List[models.JobType]] = fastapi.Query(None, alias="type"),
+    datetime_interval: Optional[str] = fastapi.Query(
+        None,
+        alias="datetime",
+        description="Instant or interval (`start/end`, `..` if unbounded) "
+        "of the creation time of the jobs",
+    ),
+    minDuration: Optional[int] = fastapi.Query(
+        None, ge=0, description="Minimum duration of the jobs, in seconds"
+    ),
+    maxDuration: Optional[int] = fastapi.Query(
+        None, ge=0, description="Maximum duration of the jobs, in seconds"
+    ),
+) -> JobFilter:
+    """Create the jobs filter from the query parameters of `GET /jobs`.
+
+    To be used as a FastAPI dependency of the client `get_jobs` method,
+    instead of the `processID` and `status` parameters.
+    """
+    if (
+        minDuration is not None
+        and maxDuration is not None
+        and minDuration > maxDuration
+    ):
+        raise exceptions.InvalidParameterValue(
+            detail="'minDuration' is greater than 'maxDuration'"
+        )
+    return JobFilter(
+        process_ids=processID,
+        status=status,
+        types=types,
+        created=(
+            parse_datetime_interval(datetime_interval)
+            if datetime_interval is not None
+            else None
+        ),
+        min_duration=(
+            datetime.timedelta(seconds=minDuration) if minDuration is not None else None
+        ),
+        max_duration=(
+            datetime.timedelta(seconds=maxDuration) if maxDuration is not None else None
+        ),
+    )
+
+
+def job_fields_from_query(
+    fields: Optional[str] = fastapi.Query(
+        None,
+        description="Comma separated names of the job fields to return, "
+        "besides the required ones",
+    ),
+) -> Optional[FrozenSet[str]]:
+    """Create the projection of the jobs from the `fields` query parameter.
+
+    Returns None if all fields are selected. Otherwise, the selected field
+    names include the fields required by `models.StatusInfo`.
+    To be used as a FastAPI dependency of the client `get_jobs` method, so that
+    the backend can skip the fields that are not returned.
+    """
+    if fields is None:
+        return None
+    names = {name.strip() for name in fields.split(",")} - {""}
+    return frozenset(names | REQUIRED_JOB_FIELDS)
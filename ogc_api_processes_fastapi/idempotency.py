@@ -0,0 +1,288 @@
+"""Deduplication of the job submissions, by idempotency key or content."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import abc
+import asyncio
+import hashlib
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+import attrs
+import fastapi
+import fastapi.concurrency
+
+from . import caches, exceptions
+
+DEFAULT_TTL = 24 * 3600.0
+
+T = TypeVar("T")
+
+
+def content_hash(value: Any) -> str:
+    """Hash a JSON serializable value, independently of the order of its keys."""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+@attrs.define
+class StoredExecution:
+    """Response to a job submission, replayed to repeated submissions.
+
+    Attributes
+    ----------
+    fingerprint : str
+        Hash of the content of the submission.
+    body : bytes
+        JSON encoded status of the created job.
+    location : str
+        URL of the created job.
+    """
+
+    fingerprint: str
+    body: bytes
+    location: str
+
+
+class IdempotencyStore(abc.ABC):
+    """Store of the responses to job submissions, by key, with expiration.
+
+    Stores are called from the event loop, unless they are `blocking`
+    (e.g. doing I/O), in which case they are called in FastAPI threadpool.
+    """
+
+    blocking: bool = False
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[StoredExecution]: ...
+
+    @abc.abstractmethod
+    def set(self, key: str, execution: StoredExecution) -> None: ...
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """In-memory store, bounded in size, local to the process.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of stored responses, the least recently used are evicted first.
+    ttl : float
+        Time to live of the stored responses, in seconds.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = DEFAULT_TTL) -> None:
+        self._cache: caches.LRUCache[str, StoredExecution] = caches.LRUCache(
+            maxsize=maxsize, ttl=ttl
+        )
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, key: str) -> Optional[StoredExecution]:
+        return self._cache.get(key)
+
+    def set(self, key: str, execution: StoredExecution) -> None:
+        self._cache.set(key, execution)
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """SQLite store, shared by the processes of a node and surviving restarts.
+
+    Parameters
+    ----------
+    path : Union[str, pathlib.Path]
+        Path of the database file, ":memory:" for a private in-memory database.
+    ttl : float
+        Time to live of the stored responses, in seconds. Expired responses are
+        removed when new ones are stored.
+    """
+
+    blocking = True
+
+    def __init__(
+        self, path: Union[str, pathlib.Path] = ":memory:", ttl: float = DEFAULT_TTL
+    ) -> None:
+        self.ttl = ttl
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                "body BLOB NOT NULL, location TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idempotency_expires "
+                "ON idempotency (expires)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            [(count,)] = self._connection.execute(
+                "SELECT count(*) FROM idempotency WHERE expires >= ?", (time.time(),)
+            )
+        return int(count)
+
+    def get(self, key: str) -> Optional[StoredExecution]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, body, location FROM idempotency "
+                "WHERE key = ? AND expires >= ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        fingerprint, body, location = row
+        return StoredExecution(fingerprint=fingerprint, body=body, location=location)
+
+    def set(self, key: str, execution: StoredExecution) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM idempotency WHERE expires < ?", (now,)
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO idempotency VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    execution.fingerprint,
+                    execution.body,
+                    execution.location,
+                    now + self.ttl,
+                ),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class Idempotency:
+    """Deduplication of the job submissions (`POST /processes/{process_id}/execution`).
+
+    Repeated submissions, with the same `Idempotency-Key` header or, if
+    `deduplicate_content` is set, with the same content, are answered with
+    the status and location of the job created by the first submission,
+    without submitting a new job to the client. Concurrent repeated
+    submissions wait for the first one to complete.
+    Repeated submissions are always answered with `201 Created` and the
+    status of the job, even if the first one was executed synchronously
+    (`Prefer: wait`) and answered with the results: these can be retrieved
+    from the job.
+
+    Parameters
+    ----------
+    store : Optional[IdempotencyStore]
+        Store of the responses, by default a new `MemoryIdempotencyStore`.
+    header : str
+        Name of the request header of the idempotency keys.
+    deduplicate_content : bool
+        If True, submissions without idempotency key are deduplicated by the
+        hash of their content.
+    """
+
+    def __init__(
+        self,
+        store: Optional[IdempotencyStore] = None,
+        header: str = "Idempotency-Key",
+        deduplicate_content: bool = False,
+    ) -> None:
+        self.store = store if store is not None else MemoryIdempotencyStore()
+        self.header = header
+        self.deduplicate_content = deduplicate_content
+        self._pending: Dict[str, "asyncio.Future[None]"] = {}
+
+    def request_key(
+        self,
+        request: fastapi.Request,
+        scope: str,
+        execution_content: Any,
+    ) -> Optional[Tuple[str, str]]:
+        """Return the key and the fingerprint of a submission, if deduplicated.
+
+        Keys are scoped by `scope`, e.g. the process and the tenant.
+        """
+        idempotency_key = request.headers.get(self.header)
+        if idempotency_key is None and not self.deduplicate_content:
+            return None
+        fingerprint = content_hash(execution_content)
+        if idempotency_key is not None:
+            return f"{scope}/key:{idempotency_key}", fingerprint
+        return f"{scope}/content:{fingerprint}", fingerprint
+
+    async def lookup(self, key: str, fingerprint: str) -> Optional[StoredExecution]:
+        """Return the response to the first submission with the key, if any.
+
+        If None is returned, the caller is in charge of the submission and
+        must call `complete`, whether it succeeds or not.
+
+        Raises
+        ------
+        exceptions.IdempotencyKeyReused
+            If the key was used by a submission with a different content.
+        """
+        while True:
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            await asyncio.shield(pending)
+        # pending before reading the store, not to let concurrent submissions in
+        self._pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            execution = await self._call_store(self.store.get, key)
+        except BaseException:
+            self._release(key)
+            raise
+        if execution is None:
+            return None
+        self._release(key)
+        if execution.fingerprint != fingerprint:
+            raise exceptions.IdempotencyKeyReused()
+        return execution
+
+    async def complete(self, key: str, execution: Optional[StoredExecution]) -> None:
+        """Store the response to a submission, None if it failed."""
+        try:
+            if execution is not None:
+                await self._call_store(self.store.set, key, execution)
+        finally:
+            self._release(key)
+
+    async def _call_store(self, method: Callable[..., T], *args: Any) -> T:
+        if self.store.blocking:
+            return await fastapi.concurrency.run_in_threadpool(method, *args)
+        return method(*args)
+
+    def _release(self, key: str) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.set_result(None)
+
+    @staticmethod
+    def replay(execution: StoredExecution) -> fastapi.Response:
+        return fastapi.Response(
+            content=execution.body,
+            status_code=fastapi.status.HTTP_201_CREATED,
+            media_type="application/json",
+            headers={"Location": execution.location},
+        )
@@ -0,0 +1,590 @@
+"""Stores of the jobs status and results, used by `local.LocalJobClient`."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import abc
+import collections
+import contextlib
+import datetime
+import heapq
+import json
+import pathlib
+import queue
+import sqlite3
+import threading
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import attrs
+
+from . import exceptions, filters, models, pagination
+
+# sort key of the jobs without creation time, listed last
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+JobKey = Tuple[datetime.datetime, str]
+
+
+def job_key(job: models.StatusInfo) -> JobKey:
+    """Sort key of the jobs, listed newest first."""
+    return (job.created or EPOCH, job.jobID)
+
+
+def cursor_key(cursor: pagination.JobCursor) -> JobKey:
+    return (cursor.created or EPOCH, cursor.job_id)
+
+
+@attrs.define
+class JobPage:
+    """Page of a list of jobs, sorted by creation time and ID, newest first.
+
+    Attributes
+    ----------
+    jobs : List[models.StatusInfo]
+        Jobs of the page.
+    has_next : bool
+        Whether jobs follow the page.
+    has_prev : bool
+        Whether jobs precede the page.
+    number_matched : Optional[int]
+        Number of jobs matching the filter, if known.
+    """
+
+    jobs: List[models.StatusInfo]
+    has_next: bool
+    has_prev: bool
+    number_matched: Optional[int] = None
+
+
+def paginate(
+    jobs: Sequence[models.StatusInfo],
+    limit: int,
+    cursor: Optional[pagination.JobCursor] = None,
+) -> JobPage:
+    """Select a page of jobs, newest first, around a cursor.
+
+    `jobs` need not be sorted: only the jobs of the page are, so that the
+    cost of a page grows linearly with the number of jobs.
+    """
+    if cursor is not None:
+        key = cursor_key(cursor)
+        if cursor.direction == "prev":
+            preceding = heapq.nsmallest(
+                limit + 1, (job for job in jobs if job_key(job) > key), key=job_key
+            )
+            return JobPage(
+                jobs=sorted(preceding[:limit], key=job_key, reverse=True),
+                has_next=True,
+                has_prev=len(preceding) > limit,
+            )
+        jobs = [job for job in jobs if job_key(job) < key]
+    following = heapq.nlargest(limit + 1, jobs, key=job_key)
+    return JobPage(
+        jobs=following[:limit],
+        has_next=len(following) > limit,
+        has_prev=cursor is not None,
+    )
+
+
+class JobStore(abc.ABC):
+    """Store of the jobs status and results.
+
+    Stores are thread-safe, as jobs are updated by worker threads.
+    Jobs are immutable: updates replace them, so that readers never see
+    partially updated jobs.
+    """
+
+    @abc.abstractmethod
+    def add(self, job: models.StatusInfo) -> None: ...
+
+    def add_many(self, jobs: Iterable[models.StatusInfo]) -> None:
+        """Add jobs at once, e.g. to import them from another store."""
+        for job in jobs:
+            self.add(job)
+
+    @abc.abstractmethod
+    def get(self, job_id: str) -> Optional[models.StatusInfo]: ...
+
+    @abc.abstractmethod
+    def update(self, job_id: str, **changes: Any) -> models.StatusInfo:
+        """Update the fields of a job, return the updated job.
+
+        Raises
+        ------
+        exceptions.NoSuchJob
+            If the job `job_id` is not found.
+        """
+        ...
+
+    @abc.abstractmethod
+    def query(
+        self,
+        job_filter: filters.JobFilter,
+        limit: int,
+        cursor: Optional[pagination.JobCursor] = None,
+    ) -> JobPage:
+        """Return a page of the jobs matching the filter, newest first."""
+        ...
+
+    @abc.abstractmethod
+    def count(self, status: models.StatusCode) -> int:
+        """Return the number of jobs with the status."""
+        ...
+
+    @abc.abstractmethod
+    def set_results(self, job_id: str, results: Dict[str, Any]) -> None: ...
+
+    @abc.abstractmethod
+    def get_results(self, job_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abc.abstractmethod
+    def delete_results(self, job_id: str) -> None: ...
+
+    def close(self) -> None:
+        """Release the resources of the store, e.g. its connections."""
+
+
+class MemoryJobStore(JobStore):
+    """In-memory store, with the jobs indexed by status and by process.
+
+    Filtered queries only read the jobs of the smallest matching index, so
+    that their cost is proportional to the number of jobs they may return.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, models.StatusInfo] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        # ordered sets of job IDs, as dicts keys
+        self._by_status: DefaultDict[models.StatusCode, Dict[str, None]] = (
+            collections.defaultdict(dict)
+        )
+        self._by_process: DefaultDict[Optional[str], Dict[str, None]] = (
+            collections.defaultdict(dict)
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def add(self, job: models.StatusInfo) -> None:
+        with self._lock:
+            self._jobs[job.jobID] = job
+            self._by_status[job.status][job.jobID] = None
+            self._by_process[job.processID][job.jobID] = None
+
+    def get(self, job_id: str) -> Optional[models.StatusInfo]:
+        return self._jobs.get(job_id)
+
+    def update(self, job_id: str, **changes: Any) -> models.StatusInfo:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise exceptions.NoSuchJob()
+            updated_job = job.model_copy(update=changes)
+            if updated_job.status != job.status:
+                del self._by_status[job.status][job_id]
+                self._by_status[updated_job.status][job_id] = None
+            self._jobs[job_id] = updated_job
+        return updated_job
+
+    def candidates(self, job_filter: filters.JobFilter) -> Iterable[str]:
+        """Return the IDs of the jobs of the smallest index matching the filter."""
+        indexes: List[List[Dict[str, None]]] = []
+        if job_filter.process_ids is not None:
+            indexes.append(
+                [
+                    self._by_process.get(process_id, {})
+                    for process_id in job_filter.process_ids
+                ]
+            )
+        if job_filter.status is not None:
+            indexes.append(
+                [self._by_status.get(status, {}) for status in job_filter.status]
+            )
+        if not indexes:
+            return list(self._jobs)
+        smallest = min(indexes, key=lambda index: sum(len(ids) for ids in index))
+        return [job_id for ids in smallest for job_id in ids]
+
+    def query(
+        self,
+        job_filter: filters.JobFilter,
+        limit: int,
+        cursor: Optional[pagination.JobCursor] = None,
+    ) -> JobPage:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        with self._lock:
+            jobs = [self._jobs[job_id] for job_id in self.candidates(job_filter)]
+        if job_filter != filters.JobFilter():
+            jobs = [job for job in jobs if job_filter.matches(job, now)]
+        # jobs are mostly added newest last, the newest are selected first
+        matched = jobs[::-1]
+        page = paginate(matched, limit, cursor)
+        page.number_matched = len(matched)
+        return page
+
+    def count(self, status: models.StatusCode) -> int:
+        return len(self._by_status.get(status, ()))
+
+    def set_results(self, job_id: str, results: Dict[str, Any]) -> None:
+        self._results[job_id] = results
+
+    def get_results(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._results.get(job_id)
+
+    def delete_results(self, job_id: str) -> None:
+        self._results.pop(job_id, None)
+
+
+def timestamp(instant: Optional[datetime.datetime]) -> Optional[int]:
+    """Return an instant in microseconds since the epoch, naive instants being UTC."""
+    if instant is None:
+        return None
+    if instant.tzinfo is None:
+        instant = instant.replace(tzinfo=datetime.timezone.utc)
+    return (instant - EPOCH) // datetime.timedelta(microseconds=1)
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    process_id TEXT,
+    status TEXT NOT NULL,
+    type TEXT NOT NULL,
+    created INTEGER NOT NULL,
+    started INTEGER,
+    finished INTEGER,
+    status_info TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created, job_id);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created, job_id);
+CREATE INDEX IF NOT EXISTS jobs_process_created
+    ON jobs (process_id, created, job_id);
+CREATE INDEX IF NOT EXISTS jobs_process_status_created
+    ON jobs (process_id, status, created, job_id);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT PRIMARY KEY,
+    results TEXT NOT NULL
+);
+"""
+
+SQLITE_UPDATE = (
+    "UPDATE jobs SET process_id = ?, status = ?, type = ?, created = ?, "
+    "started = ?, finished = ?, status_info = ? WHERE job_id = ?"
+)
+
+
+def sqlite_row(job: models.StatusInfo) -> Tuple[Any, ...]:
+    """Return the columns of a job, its ID last.
+
+    Jobs without creation time are stored as created at the epoch, as sorted
+    by `job_key`.
+    """
+    return (
+        job.processID,
+        job.status.value,
+        job.type.value,
+        timestamp(job.created) or 0,
+        timestamp(job.started),
+        timestamp(job.finished),
+        job.model_dump_json(),
+        job.jobID,
+    )
+
+
+def in_values(column: str, values: Sequence[Any]) -> str:
+    return f"{column} IN ({', '.join('?' * len(values))})"
+
+
+def sqlite_conditions(
+    job_filter: filters.JobFilter, now: datetime.datetime
+) -> Tuple[List[str], List[Any]]:
+    """Translate a jobs filter into SQL conditions and their parameters."""
+    conditions: List[str] = []
+    parameters: List[Any] = []
+    if job_filter.process_ids is not None:
+        conditions.append(in_values("process_id", job_filter.process_ids))
+        parameters.extend(job_filter.process_ids)
+    if job_filter.status is not None:
+        conditions.append(in_values("status", job_filter.status))
+        parameters.extend(status.value for status in job_filter.status)
+    if job_filter.types is not None:
+        conditions.append(in_values("type", job_filter.types))
+        parameters.extend(job_type.value for job_type in job_filter.types)
+    if job_filter.created is not None:
+        conditions.append("created != 0")
+        if job_filter.created.start is not None:
+            conditions.append("created >= ?")
+            parameters.append(timestamp(job_filter.created.start))
+        if job_filter.created.end is not None:
+            conditions.append("created <= ?")
+            parameters.append(timestamp(job_filter.created.end))
+    one_microsecond = datetime.timedelta(microseconds=1)
+    for bound, operator in (
+        (job_filter.min_duration, ">="),
+        (job_filter.max_duration, "<="),
+    ):
+        if bound is not None:
+            conditions.append(
+                f"started IS NOT NULL AND coalesce(finished, ?) - started {operator} ?"
+            )
+            parameters.extend((timestamp(now), bound // one_microsecond))
+    return conditions, parameters
+
+
+class SQLiteJobStore(JobStore):
+    """SQLite store, persistent, for single-node deployments.
+
+    Filters and keyset pagination are translated into SQL queries, using
+    the indexes on (status, created) and (processID, created), so that
+    the latency of a page does not grow with the number of stored jobs.
+    Progress updates are kept in memory and written in batches every
+    `flush_interval` seconds, other updates are written at once.
+    Queries are run on a pool of connections, concurrently with the
+    writes (write-ahead log).
+
+    Parameters
+    ----------
+    path : Union[str, pathlib.Path]
+        Path of the database file.
+    flush_interval : float
+        Interval between the writes of the progress updates, in seconds.
+        If 0, progress updates are written at once.
+    pool_size : int
+        Maximum number of idle connections kept open for the queries.
+    count_matched : bool
+        If True, the number of jobs matching the filter is counted for each
+        page (`number_matched`), at a cost proportional to that number.
+    """
+
+    # fields changed by progress updates, which are batched
+    PROGRESS_FIELDS = frozenset({"progress", "message", "updated"})
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path],
+        flush_interval: float = 1.0,
+        pool_size: int = 4,
+        count_matched: bool = False,
+    ) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.count_matched = count_matched
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(
+            maxsize=pool_size
+        )
+        self._writer = self.connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(SQLITE_SCHEMA)
+        # writes and pending progress updates
+        self._lock = threading.Lock()
+        self._pending: Dict[str, models.StatusInfo] = {}
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self.flush_periodically,
+                name="ogc-api-processes-job-store",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextlib.contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the pool, for queries."""
+        try:
+            connection = self._readers.get_nowait()
+        except queue.Empty:
+            connection = self.connect()
+        try:
+            yield connection
+        finally:
+            try:
+                self._readers.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+
+    def flush(self) -> None:
+        """Write the pending progress updates, in a single transaction."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            self._writer.execute("BEGIN")
+            self._writer.executemany(
+                SQLITE_UPDATE, [sqlite_row(job) for job in pending.values()]
+            )
+            self._writer.execute("COMMIT")
+
+    def flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+    def __len__(self) -> int:
+        with self.reader() as connection:
+            [(count,)] = connection.execute("SELECT count(*) FROM jobs")
+        return int(count)
+
+    def add(self, job: models.StatusInfo) -> None:
+        self.add_many([job])
+
+    def add_many(self, jobs: Iterable[models.StatusInfo]) -> None:
+        with self._lock:
+            self._writer.execute("BEGIN")
+            self._writer.executemany(
+                "INSERT INTO jobs (process_id, status, type, created, started, "
+                "finished, status_info, job_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (sqlite_row(job) for job in jobs),
+            )
+            self._writer.execute("COMMIT")
+
+    def read(
+        self, connection: sqlite3.Connection, job_id: str
+    ) -> Optional[models.StatusInfo]:
+        row = connection.execute(
+            "SELECT status_info FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return models.StatusInfo.model_validate_json(row[0])
+
+    def get(self, job_id: str) -> Optional[models.StatusInfo]:
+        job = self._pending.get(job_id)
+        if job is not None:
+            return job
+        with self.reader() as connection:
+            return self.read(connection, job_id)
+
+    def update(self, job_id: str, **changes: Any) -> models.StatusInfo:
+        with self._lock:
+            job = self._pending.get(job_id) or self.read(self._writer, job_id)
+            if job is None:
+                raise exceptions.NoSuchJob()
+            updated_job = job.model_copy(update=changes)
+            if self.flush_interval > 0 and changes.keys() <= self.PROGRESS_FIELDS:
+                self._pending[job_id] = updated_job
+            else:
+                self._pending.pop(job_id, None)
+                self._writer.execute(SQLITE_UPDATE, sqlite_row(updated_job))
+        return updated_job
+
+    def query(
+        self,
+        job_filter: filters.JobFilter,
+        limit: int,
+        cursor: Optional[pagination.JobCursor] = None,
+    ) -> JobPage:
+        conditions, parameters = sqlite_conditions(
+            job_filter, datetime.datetime.now(datetime.timezone.utc)
+        )
+        matched_conditions, matched_parameters = list(conditions), list(parameters)
+        order = "DESC"
+        if cursor is not None:
+            operator = "<" if cursor.direction == "next" else ">"
+            conditions.append(f"(created, job_id) {operator} (?, ?)")
+            parameters.extend((timestamp(cursor.created) or 0, cursor.job_id))
+            if cursor.direction == "prev":
+                order = "ASC"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.reader() as connection:
+            rows = connection.execute(
+                f"SELECT job_id, status_info FROM jobs {where} "
+                f"ORDER BY created {order}, job_id {order} LIMIT ?",
+                (*parameters, limit + 1),
+            ).fetchall()
+            number_matched = None
+            if self.count_matched:
+                where = (
+                    f"WHERE {' AND '.join(matched_conditions)}"
+                    if matched_conditions
+                    else ""
+                )
+                [(number_matched,)] = connection.execute(
+                    f"SELECT count(*) FROM jobs {where}", matched_parameters
+                )
+        # progress updates are not filtered on, pending ones are up to date
+        jobs = [
+            self._pending.get(job_id)
+            or models.StatusInfo.model_validate_json(status_info)
+            for job_id, status_info in rows[:limit]
+        ]
+        if cursor is not None and cursor.direction == "prev":
+            return JobPage(
+                jobs=jobs[::-1],
+                has_next=True,
+                has_prev=len(rows) > limit,
+                number_matched=number_matched,
+            )
+        return JobPage(
+            jobs=jobs,
+            has_next=len(rows) > limit,
+            has_prev=cursor is not None,
+            number_matched=number_matched,
+        )
+
+    def count(self, status: models.StatusCode) -> int:
+        with self.reader() as connection:
+            [(count,)] = connection.execute(
+                "SELECT count(*) FROM jobs WHERE status = ?", (status.value,)
+            )
+        return int(count)
+
+    def set_results(self, job_id: str, results: Dict[str, Any]) -> None:
+        with self._lock:
+            self._writer.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?)",
+                (job_id, json.dumps(results)),
+            )
+
+    def get_results(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.reader() as connection:
+            row = connection.execute(
+                "SELECT results FROM results WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        results: Dict[str, Any] = json.loads(row[0])
+        return results
+
+    def delete_results(self, job_id: str) -> None:
+        with self._lock:
+            self._writer.execute("DELETE FROM results WHERE job_id = ?", (job_id,))
@@ -0,0 +1,411 @@
+"""Reference client, running processes implemented as Python functions."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import concurrent.futures
+import datetime
+import inspect
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import attrs
+import fastapi
+
+from . import clients, events, exceptions, filters, jobs, models
+
+
+def now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def input_value(value: Any) -> Any:
+    """Return the value of an input, unwrapping qualified values (`{"value": ...}`).
+
+    Links (`{"href": ...}`) are passed as they are.
+    """
+    if isinstance(value, list):
+        return [input_value(item) for item in value]
+    if isinstance(value, dict) and "value" in value:
+        return value["value"]
+    return value
+
+
+class JobDismissed(Exception):
+    """Raised by `JobContext.set_progress` when the running job is dismissed."""
+
+
+class JobContext:
+    """Context of a running job, passed to the functions with a `context` parameter.
+
+    Parameters
+    ----------
+    client : LocalJobClient
+        Client running the job.
+    job_id : str
+        Identifier of the job.
+    """
+
+    def __init__(self, client: "LocalJobClient", job_id: str) -> None:
+        self.client = client
+        self.job_id = job_id
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the job has been dismissed."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def set_progress(self, progress: int, message: Optional[str] = None) -> None:
+        """Update the progress (0 to 100) and the message of the job.
+
+        Raises
+        ------
+        JobDismissed
+            If the job has been dismissed, so that the function stops early.
+        """
+        if self.cancelled:
+            raise JobDismissed()
+        changes: Dict[str, Any] = {"progress": max(0, min(progress, 100))}
+        if message is not None:
+            changes["message"] = message
+        self.client.update_job(self.job_id, **changes)
+
+
+@attrs.define
+class LocalProcess:
+    """Process run by a `LocalJobClient`.
+
+    Attributes
+    ----------
+    description : models.ProcessDescription
+        Description of the process.
+    function : Callable[..., Any]
+        Function called with the values of the inputs as keyword arguments.
+    with_context : bool
+        Whether the function is passed the `JobContext` of the job.
+    """
+
+    description: models.ProcessDescription
+    function: Callable[..., Any]
+    with_context: bool = False
+
+    def results(self, value: Any) -> Dict[str, Any]:
+        """Return the outputs of the process from the value returned by its function.
+
+        The value of a process with a single output is that output, other
+        functions must return a dictionary of their outputs.
+        """
+        outputs = list(self.description.outputs or {})
+        if len(outputs) == 1:
+            return {outputs[0]: value}
+        if not isinstance(value, dict):
+            raise TypeError(
+                f"function of process {self.description.id} must return "
+                "a dictionary of its outputs"
+            )
+        return value
+
+
+class LocalJobClient(clients.BaseClient):
+    """Client running processes implemented as Python functions, in-process.
+
+    Jobs are run by a bounded pool of worker threads and kept in a job store.
+    Status updates are published to a `events.JobStatusBroker`, so that
+    synchronous executions and `GET /jobs/{job_id}/events` are not polling.
+    Meant as a reference implementation, for development, tests, and small
+    deployments with a single worker process.
+
+    Parameters
+    ----------
+    store : Optional[jobs.JobStore]
+        Store of the jobs, by default a new `jobs.MemoryJobStore`. With a
+        persistent store (`jobs.SQLiteJobStore`), jobs survive restarts, and
+        those left unfinished are marked as failed. Stores must not be shared
+        by several clients.
+    max_workers : int
+        Maximum number of jobs running at the same time.
+    max_queued : int
+        Maximum number of accepted jobs waiting for a worker, further
+        submissions are rejected with `exceptions.JobQueueFull`.
+    use_processes : bool
+        If True, functions are run in a pool of `max_workers` processes, for
+        CPU-bound processes. Functions must then be picklable, and are not
+        passed a `JobContext`: running jobs can neither report their progress
+        nor be stopped when dismissed.
+    """
+
+    def __init__(
+        self,
+        store: Optional[jobs.JobStore] = None,
+        max_workers: int = 4,
+        max_queued: int = 1000,
+        use_processes: bool = False,
+    ) -> None:
+        self.store = store if store is not None else jobs.MemoryJobStore()
+        self.max_queued = max_queued
+        self.broker = events.JobStatusBroker()
+        self.processes: Dict[str, LocalProcess] = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ogc-api-processes-job"
+        )
+        self._process_executor = (
+            concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+            if use_processes
+            else None
+        )
+        self._running: Dict[
+            str, Tuple["concurrent.futures.Future[None]", JobContext]
+        ] = {}
+        # serializes submissions and final status updates
+        self._lock = threading.Lock()
+        self.fail_interrupted_jobs()
+
+    def register(
+        self, description: models.ProcessDescription, function: Callable[..., Any]
+    ) -> None:
+        """Register a process, run by calling `function`.
+
+        `function` is called with the values of the inputs as keyword
+        arguments, and with the `JobContext` of the job as `context` if it
+        accepts such a parameter.
+        """
+        with_context = (
+            self._process_executor is None
+            and "context" in inspect.signature(function).parameters
+        )
+        self.processes[description.id] = LocalProcess(
+            description=description, function=function, with_context=with_context
+        )
+
+    def fail_interrupted_jobs(self) -> None:
+        """Mark as failed the jobs left unfinished by a previous run."""
+        job_filter = filters.JobFilter(
+            status=[models.StatusCode.accepted, models.StatusCode.running]
+        )
+        while True:
+            page = self.store.query(job_filter, limit=1000)
+            for job in page.jobs:
+                self.update_job(
+                    job.jobID,
+                    status=models.StatusCode.failed,
+                    message="job interrupted by a restart",
+                    finished=now(),
+                )
+            if not page.has_next:
+                return
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Dismiss the unfinished jobs and stop the workers.
+
+        If `wait`, the store is closed once the workers are stopped.
+        """
+        for job_id in list(self._running):
+            try:
+                self.delete_job(job_id=job_id)
+            except exceptions.NoSuchJob:
+                pass
+        self._executor.shutdown(wait=wait)
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=wait)
+        if wait:
+            self.store.close()
+
+    def get_local_process(self, process_id: str) -> LocalProcess:
+        process = self.processes.get(process_id)
+        if process is None:
+            raise exceptions.NoSuchProcess()
+        return process
+
+    def update_job(self, job_id: str, **changes: Any) -> models.StatusInfo:
+        """Update a job in the store and publish its new status."""
+        job = self.store.update(job_id, updated=now(), **changes)
+        # subscribers add links to the updates
+        self.broker.publish(job.model_copy())
+        return job
+
+    def run_job(
+        self,
+        process: LocalProcess,
+        job_id: str,
+        inputs: Dict[str, Any],
+        context: JobContext,
+    ) -> None:
+        try:
+            with self._lock:
+                if context.cancelled:
+                    return
+                self.update_job(job_id, status=models.StatusCode.running, started=now())
+            try:
+                if self._process_executor is not None:
+                    value = self._process_executor.submit(
+                        process.function, **inputs
+                    ).result()
+                elif process.with_context:
+                    value = process.function(**inputs, context=context)
+                else:
+                    value = process.function(**inputs)
+                results = process.results(value)
+            except JobDismissed:
+                return
+            except Exception as exc:
+                with self._lock:
+                    if not context.cancelled:
+                        self.update_job(
+                            job_id,
+                            status=models.StatusCode.failed,
+                            message=str(exc) or type(exc).__name__,
+                            finished=now(),
+                        )
+                return
+            with self._lock:
+                if not context.cancelled:
+                    self.store.set_results(job_id, results)
+                    self.update_job(
+                        job_id,
+                        status=models.StatusCode.successful,
+                        progress=100,
+                        finished=now(),
+                    )
+        finally:
+            self._running.pop(job_id, None)
+
+    def get_processes(
+        self, limit: Optional[int] = fastapi.Query(None)
+    ) -> models.ProcessList:
+        processes = [
+            models.ProcessSummary.model_validate(
+                process.description.model_dump(exclude={"inputs", "outputs", "links"})
+            )
+            for process in self.processes.values()
+        ]
+        return models.ProcessList(processes=processes[:limit], links=[])
+
+    def get_process(
+        self, process_id: str = fastapi.Path(...)
+    ) -> models.ProcessDescription:
+        # the returned description is decorated with links
+        return self.get_local_process(process_id).description.model_copy()
+
+    def post_process_execution(
+        self,
+        process_id: str = fastapi.Path(...),
+        execution_content: Dict[str, Any] = fastapi.Body(...),
+    ) -> models.StatusInfo:
+        process = self.get_local_process(process_id)
+        inputs = {
+            input_id: input_value(value)
+            for input_id, value in (execution_content.get("inputs") or {}).items()
+        }
+        created = now()
+        job = models.StatusInfo(
+            jobID=uuid.uuid4().hex,
+            processID=process_id,
+            type=models.JobType.process,
+            status=models.StatusCode.accepted,
+            created=created,
+            updated=created,
+            progress=0,
+        )
+        with self._lock:
+            if self.store.count(models.StatusCode.accepted) >= self.max_queued:
+                raise exceptions.JobQueueFull()
+            self.store.add(job)
+            context = JobContext(self, job.jobID)
+            future = self._executor.submit(
+                self.run_job, process, job.jobID, inputs, context
+            )
+            self._running[job.jobID] = (future, context)
+        return job.model_copy()
+
+    def get_jobs(  # type: ignore[override]
+        self,
+        job_filter: filters.JobFilter = fastapi.Depends(filters.job_filter_from_query),
+        limit: Optional[int] = fastapi.Query(10, ge=1, le=10000),
+        cursor: Optional[str] = fastapi.Query(None),
+    ) -> models.JobList:
+        position = self.decode_job_cursor(cursor) if cursor is not None else None
+        page = self.store.query(job_filter, limit or 10, position)
+        job_list = models.JobList(
+            jobs=[job.model_copy() for job in page.jobs],
+            numberMatched=page.number_matched,
+        )
+        job_list._pagination_query_params = self.create_job_pagination(
+            page.jobs, page.has_next, page.has_prev
+        )
+        return job_list
+
+    def get_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        job = self.store.get(job_id)
+        if job is None:
+            raise exceptions.NoSuchJob()
+        return job.model_copy()
+
+    def get_job_results(self, job_id: str = fastapi.Path(...)) -> models.Results:
+        job = self.get_job(job_id=job_id)
+        if job.status is models.StatusCode.successful:
+            results = self.store.get_results(job_id) or {}
+            return results  # type: ignore[return-value]
+        if job.status is models.StatusCode.failed:
+            raise exceptions.JobResultsFailed(detail=job.message)
+        if job.status is models.StatusCode.dismissed:
+            raise exceptions.NoSuchJob()
+        raise exceptions.ResultsNotReady()
+
+    def delete_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        """Dismiss a job, and delete its results.
+
+        Accepted jobs are removed from the queue. Running jobs are stopped the
+        next time they report their progress, their results are discarded.
+        """
+        with self._lock:
+            job = self.get_job(job_id=job_id)
+            running = self._running.get(job_id)
+            if running is not None:
+                future, context = running
+                context.cancel()
+                if future.cancel():
+                    self._running.pop(job_id, None)
+            self.store.delete_results(job_id)
+            if job.status is not models.StatusCode.dismissed:
+                job = self.update_job(
+                    job_id,
+                    status=models.StatusCode.dismissed,
+                    message="job dismissed",
+                    finished=now(),
+                )
+        return job.model_copy()
+
+    def get_jobs_by_id(
+        self,
+        job_ids: List[str] = fastapi.Body(
+            ..., embed=True, alias="jobIDs", max_length=clients.MAX_JOB_IDS
+        ),
+    ) -> models.JobList:
+        found = [self.store.get(job_id) for job_id in job_ids]
+        return models.JobList(
+            jobs=[job.model_copy() for job in found if job is not None]
+        )
+
+    def watch_job(self, job_id: str) -> events.Subscription:
+        subscription = self.broker.subscribe(job_id)
+        # jobs may have changed before the subscription, e.g. short jobs
+        job = self.store.get(job_id)
+        if job is not None:
+            subscription.put(job.model_copy())
+        return subscription
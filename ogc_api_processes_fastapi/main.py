@@ -1,38 +1,104 @@
 """API routes registration and initialization."""
 
+import functools
 import typing
-from typing import Any, Callable
+from typing import Any, Callable, List, Optional, Type, Union
 
 import fastapi
 import pydantic
 
-from . import clients, config, endpoints, exceptions, models
+from . import (
+    caches,
+    clients,
+    config,
+    endpoints,
+    exceptions,
+    metrics,
+    models,
+    responses,
+    tenants,
+)
+from . import compression as compression_
+from . import idempotency as idempotency_
 
 
 def set_response_model(
-    client: clients.BaseClient, route_name: str
-) -> pydantic.BaseModel:
+    client: clients.ClientType, route_name: str
+) -> Type[pydantic.BaseModel]:
+    """Return the response model of a route, shared by the clients of a class.
+
+    Models, along with their validators and serializers, are only created once
+    per client class, however many routers are instantiated.
+    """
+    return create_response_model(type(client), route_name)
+
+
+@functools.lru_cache(maxsize=1024)
+def create_response_model(
+    client_class: Type[clients.ClientType], route_name: str
+) -> Type[pydantic.BaseModel]:
     if route_name == "GetLandingPage":
         base_model = models.LandingPage
     elif route_name == "GetConformance":
         base_model = models.ConfClass  # type: ignore
     else:
+        client_method = config.ROUTES[route_name].client_method
+        if route_name == "PostJobsStatus" and not clients.implements(
+            client_class, "get_jobs_by_id"
+        ):
+            # jobs are retrieved one by one with `get_job`, as in the jobs list
+            client_method = "get_jobs"
         base_model = typing.get_type_hints(
-            getattr(client, config.ROUTES[route_name].client_method)  # type: ignore
+            getattr(client_class, client_method)  # type: ignore
         )["return"]
+        if typing.get_origin(base_model) is Union:
+            # outputs streamed as is are not documented by the response model,
+            # nor is None returned by optional hooks
+            [base_model] = [
+                member
+                for member in typing.get_args(base_model)
+                if member is not type(None)
+                and not issubclass(member, (models.RawResult, models.FileResult))
+            ]
+        if issubclass(base_model, models.StreamingJobList):
+            base_model = models.JobList  # type: ignore
     response_model = pydantic.create_model(
         route_name,
         __base__=base_model,
     )
 
-    return response_model  # type: ignore
+    return response_model
 
 
 def register_route(
-    client: clients.BaseClient, router: fastapi.APIRouter, route_name: str
+    client: clients.ClientType,
+    router: fastapi.APIRouter,
+    route_name: str,
+    endpoints_config: Optional[config.EndpointsConfig] = None,
 ) -> None:
+    if endpoints_config is None:
+        endpoints_config = config.EndpointsConfig()
     response_model = set_response_model(client, route_name)
-    route_endpoint = endpoints.create_endpoint(route_name, client=client)
+    instrumentation = endpoints_config.instrumentation
+    route_class = None
+    if instrumentation is not None:
+        client = metrics.instrument_client(client)
+        route_class = instrumentation.route_class()
+    route_endpoint = endpoints.create_endpoint(
+        route_name, client=client, endpoints_config=endpoints_config
+    )
+    if instrumentation is not None:
+        route_endpoint = metrics.instrument_endpoint(route_endpoint)
+    if endpoints_config.trust_client_models or instrumentation is not None:
+        # instrumented routes are serialized here, to time validation and encoding
+        route_endpoint = responses.serialize_endpoint(
+            route_endpoint,
+            status_code=config.ROUTES[route_name].status_code,
+            response_model=(
+                None if endpoints_config.trust_client_models else response_model
+            ),
+            response_class=endpoints_config.response_class,
+        )
     router.add_api_route(
         name=route_name,
         description=client.endpoints_description.get(route_name, ""),
@@ -40,47 +106,138 @@ def register_route(
         response_model_exclude_unset=True,
         response_model_exclude_none=True,
         endpoint=route_endpoint,
-        **config.ROUTES[route_name].model_dump(exclude={"client_method"}),
+        route_class_override=route_class,
+        **config.ROUTES[route_name].model_dump(
+            exclude={"client_method"}, exclude_none=True
+        ),
     )
 
 
-def register_core_routes(router: fastapi.APIRouter, client: clients.BaseClient) -> None:
+def register_core_routes(
+    router: fastapi.APIRouter,
+    client: clients.ClientType,
+    endpoints_config: Optional[config.EndpointsConfig] = None,
+) -> None:
     for route_name in config.ROUTES.keys():
-        register_route(client, router, route_name)
+        register_route(client, router, route_name, endpoints_config)
+
 
+def instantiate_router(
+    client: Union[clients.ClientType, tenants.TenantRegistry],
+    endpoints_config: Optional[config.EndpointsConfig] = None,
+) -> fastapi.APIRouter:
+    """Instantiate the router of the API routes.
 
-def instantiate_router(client: clients.BaseClient) -> fastapi.APIRouter:
+    If `client` is a `tenants.TenantRegistry`, routes dispatch the requests to
+    the clients of their tenants, which are selected by the middleware added
+    with `TenantRegistry.add_middleware`. The metrics route, if any, is shared
+    by all the tenants and does not require one.
+    """
     router = fastapi.APIRouter()
-    register_core_routes(router, client)
+    if isinstance(client, tenants.TenantRegistry):
+        tenant_router = fastapi.APIRouter(
+            dependencies=[fastapi.Depends(tenants.require_tenant)]
+        )
+        register_core_routes(
+            tenant_router, client.dispatching_client(), endpoints_config
+        )
+        router.include_router(tenant_router)
+    else:
+        register_core_routes(router, client, endpoints_config)
+    if endpoints_config is not None and endpoints_config.instrumentation is not None:
+        endpoints_config.instrumentation.register_metrics_route(router)
     return router
 
 
 def instantiate_app(
-    client: clients.BaseClient,
+    client: Union[clients.ClientType, tenants.TenantRegistry],
     exception_handler: Callable[
         [fastapi.Request, exceptions.OGCAPIException], fastapi.responses.JSONResponse
     ] = exceptions.ogc_api_exception_handler,
+    trust_client_models: bool = False,
+    process_cache: Optional[caches.ProcessDescriptionCache] = None,
+    extra_conformance_classes: Optional[List[str]] = None,
+    instrumentation: Optional[metrics.Instrumentation] = None,
+    default_response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+    compression: Optional[compression_.Compression] = None,
+    validate_execution: bool = False,
+    idempotency: Optional[idempotency_.Idempotency] = None,
+    execution_cache: Optional[caches.ExecutionCache] = None,
     **kwargs: Any,
 ) -> fastapi.FastAPI:
     """Instantiate FastAPI application.
 
     Parameters
     ----------
-    client : clients.BaseClient
-        Client to be used for API requests.
+    client : Union[clients.ClientType, tenants.TenantRegistry]
+        Client to be used for API requests, either a `clients.BaseClient` or a
+        `clients.AsyncBaseClient`, or the registry of the clients of the tenants
+        of a multi-tenant API.
     exception_handler : Callable[[fastapi.Request, exceptions.OGCAPIException],
     fastapi.responses.JSONResponse], optional
         Exception handler, by default exceptions.ogc_api_exception_handler
+    trust_client_models : bool, optional
+        If True, models returned by the client are serialized to JSON directly,
+        skipping their validation against the routes response models,
+        by default False.
+    process_cache : Optional[caches.ProcessDescriptionCache], optional
+        Cache of the processes descriptions, used with clients implementing
+        `get_process_version`, by default a new `caches.ProcessDescriptionCache()`.
+    extra_conformance_classes : Optional[List[str]], optional
+        Conformance classes declared in addition to `config.CONFORMANCE_CLASSES`,
+        by default None.
+    instrumentation : Optional[metrics.Instrumentation], optional
+        Timing of the phases of the requests handling (client, links, validation,
+        encoding), sent as `Server-Timing` headers and to a metrics sink,
+        by default None (disabled).
+    default_response_class : Type[fastapi.Response], optional
+        Class of the JSON responses of the routes and of the exception handler,
+        by default `fastapi.responses.JSONResponse`. `responses.FastJSONResponse`
+        encodes faster with pydantic-core, but not to the same bytes: floats
+        exponents are formatted as `1e-7` instead of `1e-07`.
+    compression : Optional[compression.Compression], optional
+        Compression of the responses negotiated with `Accept-Encoding`,
+        by default None (disabled).
+    validate_execution : bool, optional
+        If True, execution requests are validated against the description of
+        their process (inputs schemas and occurrences, outputs) before being
+        passed to the client, by default False.
+    idempotency : Optional[idempotency.Idempotency], optional
+        Deduplication of the job submissions, by `Idempotency-Key` header or
+        by content, by default None (disabled).
+    execution_cache : Optional[caches.ExecutionCache], optional
+        Cache of the executions, reusing the successful job of a previous
+        execution of the same process version with the same inputs,
+        by default None (disabled).
     **kwargs : Any
         Additional parameters passed to `fastapi.Fastapi()`.
+        `title` and `description` are also used in the landing page.
 
     Returns
     -------
     fastapi.FastAPI
         FastAPI application.
     """
-    app = fastapi.FastAPI(**kwargs)
-    router = instantiate_router(client)
+    endpoints_config = config.EndpointsConfig(
+        trust_client_models=trust_client_models,
+        title=kwargs.get("title"),
+        description=kwargs.get("description"),
+        extra_conformance_classes=extra_conformance_classes or [],
+        instrumentation=instrumentation,
+        compression=compression,
+        validate_execution=validate_execution,
+        idempotency=idempotency,
+        execution_cache=execution_cache,
+        response_class=default_response_class,
+    )
+    if process_cache is not None:
+        endpoints_config.process_cache = process_cache
+    app = fastapi.FastAPI(default_response_class=default_response_class, **kwargs)
+    router = instantiate_router(client, endpoints_config)
     app.include_router(router)
+    if compression is not None:
+        compression.add_middleware(app)
+    if isinstance(client, tenants.TenantRegistry):
+        client.add_middleware(app)
     app = exceptions.include_exception_handlers(app, exception_handler)
     return app
@@ -0,0 +1,373 @@
+"""Timing instrumentation of the requests handling."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import abc
+import bisect
+import contextlib
+import contextvars
+import copy
+import functools
+import inspect
+import threading
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+import attrs
+import fastapi
+import fastapi.routing
+
+from . import clients
+
+# client methods whose calls are timed as the `client` phase
+TIMED_CLIENT_METHODS = (
+    "get_processes",
+    "get_process",
+    "get_process_version",
+    "post_process_execution",
+    "get_jobs",
+    "get_jobs_by_id",
+    "get_job",
+    "get_job_results",
+    "delete_job",
+)
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Timings:
+    """Durations of the phases of the handling of a request, in seconds.
+
+    Phases are:
+
+    - `client`: calls to the client methods. Concurrent calls are counted once.
+    - `links`: endpoint code, decorating the client output (mostly with links).
+    - `wait`: waiting for a job status change (`GET /jobs/{job_id}?wait=`).
+    - `validation`: validation of the output against the route response model.
+    - `encoding`: JSON encoding of the response.
+    - `total`: whole request handling, from the route point of view.
+    """
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._client_calls = 0
+        self._client_start = 0.0
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """Sum of the durations of the phases measured so far."""
+        with self._lock:
+            return sum(self.durations.values())
+
+    def client_call_started(self) -> None:
+        with self._lock:
+            if self._client_calls == 0:
+                self._client_start = time.perf_counter()
+            self._client_calls += 1
+
+    def client_call_finished(self) -> None:
+        with self._lock:
+            self._client_calls -= 1
+            if self._client_calls == 0:
+                duration = time.perf_counter() - self._client_start
+                self.durations["client"] = self.durations.get("client", 0.0) + duration
+
+    def server_timing(self) -> str:
+        """Format the durations as a `Server-Timing` header value."""
+        return ", ".join(
+            f"{phase};dur={seconds * 1e3:.3f}"
+            for phase, seconds in self.durations.items()
+        )
+
+
+current_timings: contextvars.ContextVar[Optional[Timings]] = contextvars.ContextVar(
+    "current_timings", default=None
+)
+
+
+@contextlib.contextmanager
+def measure(phase: str) -> Iterator[None]:
+    """Time the enclosed block as `phase` of the current request, if instrumented."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+def time_client_method(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a client method to time its calls, keeping its signature."""
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def timed_coroutine(*args: Any, **kwargs: Any) -> Any:
+            timings = current_timings.get()
+            if timings is None:
+                return await method(*args, **kwargs)
+            timings.client_call_started()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                timings.client_call_finished()
+
+        return timed_coroutine
+
+    @functools.wraps(method)
+    def timed_method(*args: Any, **kwargs: Any) -> Any:
+        # the context, hence the timings, is copied to FastAPI threadpool
+        timings = current_timings.get()
+        if timings is None:
+            return method(*args, **kwargs)
+        timings.client_call_started()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timings.client_call_finished()
+
+    return timed_method
+
+
+def instrument_client(client: clients.ClientType) -> clients.ClientType:
+    """Return a shallow copy of the client, with its methods calls timed.
+
+    The copy keeps the client class, so that optional hooks detection
+    (`clients.implements`) is unchanged.
+    """
+    instrumented_client = copy.copy(client)
+    for method_name in TIMED_CLIENT_METHODS:
+        method = getattr(client, method_name)
+        setattr(instrumented_client, method_name, time_client_method(method))
+    return instrumented_client
+
+
+def instrument_endpoint(
+    endpoint: Callable[..., Awaitable[Any]],
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap an endpoint to time its code as the `links` phase.
+
+    Time spent in other phases while the endpoint runs (e.g. client calls made
+    by the endpoint itself) is not counted.
+    """
+
+    @functools.wraps(endpoint)
+    async def instrumented_endpoint(*args: Any, **kwargs: Any) -> Any:
+        timings = current_timings.get()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+        other_phases = timings.elapsed()
+        start = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            other_phases = timings.elapsed() - other_phases
+            timings.add("links", max(0.0, duration - other_phases))
+
+    return instrumented_endpoint
+
+
+class MetricsSink(abc.ABC):
+    """Receiver of the timings of the handled requests."""
+
+    @abc.abstractmethod
+    def observe(self, route_name: str, durations: Dict[str, float]) -> None:
+        """Record the phases durations, in seconds, of a request to a route.
+
+        Called from the event loop once per request: must not block.
+        """
+        ...
+
+    @abc.abstractmethod
+    def render_prometheus(self) -> str:
+        """Render the recorded metrics in Prometheus text exposition format."""
+        ...
+
+
+@attrs.define
+class Histogram:
+    counts: List[int]
+    sum: float = 0.0
+    count: int = 0
+
+
+class HistogramSink(MetricsSink):
+    """In-memory histograms of the phases durations, by route and phase.
+
+    Parameters
+    ----------
+    buckets : Sequence[float]
+        Upper bounds of the histograms buckets, in seconds, in increasing order.
+    name : str
+        Name of the metric in Prometheus exposition.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        name: str = "ogc_api_processes_request_phase_seconds",
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.name = name
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route_name: str, durations: Dict[str, float]) -> None:
+        with self._lock:
+            for phase, seconds in durations.items():
+                histogram = self._histograms.get((route_name, phase))
+                if histogram is None:
+                    histogram = Histogram(counts=[0] * (len(self.buckets) + 1))
+                    self._histograms[(route_name, phase)] = histogram
+                histogram.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+                histogram.sum += seconds
+                histogram.count += 1
+
+    def get(self, route_name: str, phase: str) -> Optional[Histogram]:
+        """Return a copy of the histogram of a phase of a route, if any."""
+        with self._lock:
+            histogram = self._histograms.get((route_name, phase))
+            return None if histogram is None else copy.deepcopy(histogram)
+
+    def render_prometheus(self) -> str:
+        lines = [
+            f"# HELP {self.name} Duration of the phases of the requests handling.",
+            f"# TYPE {self.name} histogram",
+        ]
+        bounds = [repr(float(bucket)) for bucket in self.buckets] + ["+Inf"]
+        with self._lock:
+            for (route_name, phase), histogram in sorted(self._histograms.items()):
+                labels = f'route="{route_name}",phase="{phase}"'
+                cumulative = 0
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"{self.name}_sum{{{labels}}} {histogram.sum!r}")
+                lines.append(f"{self.name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class Instrumentation:
+    """Timing of the phases of the requests handling, per route.
+
+    Phases are described in `Timings`. When instrumentation is disabled
+    (the default), none of the wrappers timing them are installed.
+
+    Parameters
+    ----------
+    sink : Optional[MetricsSink]
+        Receiver of the timings of each request, by default a new `HistogramSink`.
+    server_timing : bool
+        If True, timings are sent in the `Server-Timing` header of the responses.
+    metrics_path : Optional[str]
+        Path of the route exposing the metrics in Prometheus text format.
+        If None, no route is added.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[MetricsSink] = None,
+        server_timing: bool = True,
+        metrics_path: Optional[str] = "/metrics",
+    ) -> None:
+        self.sink = sink if sink is not None else HistogramSink()
+        self.server_timing = server_timing
+        self.metrics_path = metrics_path
+
+    def route_class(self) -> Type[fastapi.routing.APIRoute]:
+        """Return a route class creating the timings of each request."""
+        instrumentation = self
+
+        class InstrumentedRoute(fastapi.routing.APIRoute):
+            def get_route_handler(
+                self,
+            ) -> Callable[[fastapi.Request], Coroutine[Any, Any, fastapi.Response]]:
+                route_handler = super().get_route_handler()
+                route_name = self.name
+
+                async def instrumented_route_handler(
+                    request: fastapi.Request,
+                ) -> fastapi.Response:
+                    timings = Timings()
+                    token = current_timings.set(timings)
+                    start = time.perf_counter()
+                    try:
+                        response = await route_handler(request)
+                    finally:
+                        current_timings.reset(token)
+                        timings.add("total", time.perf_counter() - start)
+                        instrumentation.sink.observe(route_name, timings.durations)
+                    if instrumentation.server_timing:
+                        response.headers["Server-Timing"] = timings.server_timing()
+                    return response
+
+                return instrumented_route_handler
+
+        return InstrumentedRoute
+
+    def register_metrics_route(self, router: fastapi.APIRouter) -> None:
+        """Add the route exposing the metrics, if any, to the router."""
+        if self.metrics_path is None:
+            return
+
+        async def get_metrics() -> fastapi.responses.PlainTextResponse:
+            return fastapi.responses.PlainTextResponse(
+                self.sink.render_prometheus(),
+                media_type="text/plain; version=0.0.4",
+            )
+
+        router.add_api_route(
+            self.metrics_path,
+            get_metrics,
+            methods=["GET"],
+            name="GetMetrics",
+            include_in_schema=False,
+        )
@@ -16,7 +16,17 @@
 
 import datetime
 import enum
-from typing import Any, Dict, ForwardRef, List, Optional, Union
+import pathlib
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    ForwardRef,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 import pydantic
 import typing_extensions
@@ -290,6 +300,24 @@ class StatusInfo(pydantic.BaseModel):
 class JobList(pydantic.BaseModel):
     jobs: List[StatusInfo]
     links: Optional[List[Link]] = None
+    # number of jobs matching the filters, may be estimated (e.g. from an index)
+    numberMatched: Optional[int] = None
+    _pagination_query_params: Optional[PaginationQueryParameters] = None
+
+
+class StreamingJobList(pydantic.BaseModel):
+    """List of jobs yielded lazily by the client and streamed in the response body.
+
+    The response is documented and encoded as a `JobList`, but jobs are serialized
+    one at a time, so the full list is never held in memory.
+    Pagination query parameters may be set while jobs are being consumed.
+    """
+
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
+    jobs: Union[Iterable[StatusInfo], AsyncIterable[StatusInfo]]
+    links: Optional[List[Link]] = None
+    numberMatched: Optional[int] = None
     _pagination_query_params: Optional[PaginationQueryParameters] = None
 
 
@@ -297,6 +325,53 @@ class Results(pydantic.RootModel[Optional[Dict[str, InlineOrRefData]]]):
     root: Optional[Dict[str, InlineOrRefData]] = None
 
 
+class RawResult(pydantic.BaseModel):
+    """Job output sent as is (`"response": "raw"`), streamed from its content.
+
+    Content is either the path of a file, read in chunks, or an iterable or
+    asynchronous iterable of byte chunks, so it is never held in memory.
+    Bytes are sent as a single chunk, and their size is known.
+    `size`, in bytes, is required by `Content-Length` and range requests,
+    unless content is a file or bytes. Files are better sent as `FileResult`.
+    """
+
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
+    content: Union[pathlib.Path, Iterable[bytes], AsyncIterable[bytes]] = (
+        pydantic.Field(..., union_mode="left_to_right")
+    )
+    media_type: str = "application/octet-stream"
+    size: Optional[int] = None
+
+    @pydantic.model_validator(mode="before")
+    @classmethod
+    def wrap_bytes(cls, data: Any) -> Any:
+        # bytes are iterables of integers, not of byte chunks
+        if isinstance(data, dict) and isinstance(
+            data.get("content"), (bytes, bytearray, memoryview)
+        ):
+            content = bytes(data["content"])
+            size = data.get("size")
+            data = {
+                **data,
+                "content": [content],
+                "size": len(content) if size is None else size,
+            }
+        return data
+
+
+class FileResult(pydantic.BaseModel):
+    """Job output sent as is from a file on a local or shared file system.
+
+    The file is sent by `FileResponse`, without reading it in Python when
+    the server supports it, with validators for conditional and range requests.
+    """
+
+    path: pathlib.Path
+    media_type: str = "application/octet-stream"
+    filename: Optional[str] = None
+
+
 class Exception(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(extra="allow")
 
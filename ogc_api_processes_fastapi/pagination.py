@@ -0,0 +1,166 @@
+"""Keyset pagination with opaque signed cursors."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import base64
+import binascii
+import datetime
+import hashlib
+import hmac
+import json
+import secrets
+from typing import Any, Optional, Sequence
+
+import attrs
+
+from . import exceptions, models
+
+# used when no secret is configured: cursors are only valid for this process
+DEFAULT_SECRET = secrets.token_bytes(32)
+
+SIGNATURE_SIZE = 16
+
+
+def b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def sign(payload: bytes, secret: Optional[bytes] = None) -> bytes:
+    digest = hmac.new(secret or DEFAULT_SECRET, payload, hashlib.sha256).digest()
+    return digest[:SIGNATURE_SIZE]
+
+
+def encode_cursor(value: Any, secret: Optional[bytes] = None) -> str:
+    """Encode a JSON serializable value as an opaque, URL safe, signed cursor.
+
+    Parameters
+    ----------
+    value : Any
+        Value to encode, e.g. the sort key of the last item of a page.
+    secret : Optional[bytes], optional
+        Key signing the cursor. It must be shared by all the processes serving
+        the API. By default, a random key generated for the current process.
+
+    Returns
+    -------
+    str
+        Cursor.
+    """
+    payload = json.dumps(value, separators=(",", ":")).encode()
+    return f"{b64encode(payload)}.{b64encode(sign(payload, secret))}"
+
+
+def decode_cursor(cursor: str, secret: Optional[bytes] = None) -> Any:
+    """Decode a cursor created by `encode_cursor`.
+
+    Raises
+    ------
+    exceptions.InvalidCursor
+        If the cursor is malformed or was not signed with `secret`.
+    """
+    encoded_payload, _, encoded_signature = cursor.partition(".")
+    try:
+        payload = b64decode(encoded_payload)
+        signature = b64decode(encoded_signature)
+    except (binascii.Error, ValueError):
+        raise exceptions.InvalidCursor(detail="malformed cursor")
+    if not hmac.compare_digest(signature, sign(payload, secret)):
+        raise exceptions.InvalidCursor(detail="invalid cursor signature")
+    return json.loads(payload)
+
+
+@attrs.define
+class JobCursor:
+    """Position in a list of jobs sorted by creation time and job ID.
+
+    Attributes
+    ----------
+    created : Optional[datetime.datetime]
+        Creation time of the job the cursor points to.
+    job_id : str
+        ID of the job the cursor points to.
+    direction : str
+        "next" for the page of jobs following the job in the list,
+        "prev" for the page of jobs preceding it.
+    """
+
+    created: Optional[datetime.datetime]
+    job_id: str
+    direction: str = "next"
+
+
+def encode_job_cursor(
+    job: models.StatusInfo, direction: str = "next", secret: Optional[bytes] = None
+) -> str:
+    if direction not in ("next", "prev"):
+        raise ValueError(f"{direction} is not a valid value for ``direction``")
+    created = job.created.isoformat() if job.created is not None else None
+    return encode_cursor([created, job.jobID, direction], secret)
+
+
+def decode_job_cursor(cursor: str, secret: Optional[bytes] = None) -> JobCursor:
+    value = decode_cursor(cursor, secret)
+    try:
+        created, job_id, direction = value
+        return JobCursor(
+            created=datetime.datetime.fromisoformat(created) if created else None,
+            job_id=job_id,
+            direction=direction,
+        )
+    except (TypeError, ValueError):
+        raise exceptions.InvalidCursor(detail="malformed cursor")
+
+
+def create_job_pagination(
+    jobs: Sequence[models.StatusInfo],
+    has_next: bool,
+    has_prev: bool,
+    secret: Optional[bytes] = None,
+    cursor_parameter: str = "cursor",
+) -> models.PaginationQueryParameters:
+    """Create the query parameters of the pages around a page of jobs.
+
+    Parameters
+    ----------
+    jobs : Sequence[models.StatusInfo]
+        Jobs of the current page, in list order.
+    has_next : bool
+        Whether jobs follow the current page.
+    has_prev : bool
+        Whether jobs precede the current page.
+    secret : Optional[bytes], optional
+        Key signing the cursors, see `encode_cursor`.
+    cursor_parameter : str, optional
+        Name of the query parameter of the cursor, by default "cursor".
+
+    Returns
+    -------
+    models.PaginationQueryParameters
+        Query parameters of the next and previous pages.
+    """
+    pagination_query_params = models.PaginationQueryParameters()
+    if jobs and has_next:
+        pagination_query_params.next = {
+            cursor_parameter: encode_job_cursor(jobs[-1], "next", secret)
+        }
+    if jobs and has_prev:
+        pagination_query_params.prev = {
+            cursor_parameter: encode_job_cursor(jobs[0], "prev", secret)
+        }
+    return pagination_query_params
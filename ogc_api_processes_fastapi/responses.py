@@ -0,0 +1,791 @@
+"""Responses bypassing FastAPI response model validation and encoding."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import collections.abc
+import email.utils
+import functools
+import inspect
+import json
+import os
+import pathlib
+from typing import (
+    AbstractSet,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+import fastapi
+import pydantic
+import pydantic_core
+
+from . import caches, exceptions, metrics, models
+from . import compression as compression_
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+links_adapter = pydantic.TypeAdapter(List[models.Link])
+
+
+class FastJSONResponse(fastapi.responses.JSONResponse):
+    """JSON response encoded by pydantic-core, instead of the standard library.
+
+    Opt-in, with `instantiate_app(default_response_class=FastJSONResponse)`.
+    Content is not encoded to the same bytes as `fastapi.responses.JSONResponse`,
+    the default: the exponents of floats differ (`1e-7` instead of `1e-07`) and
+    out of range floats are encoded as `null`, as in response models serialization.
+    `fastapi.responses.ORJSONResponse` is an alternative, if orjson is installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content, inf_nan_mode="null")
+
+
+def dump_links(links: List[models.Link]) -> bytes:
+    return links_adapter.dump_json(links, exclude_unset=True, exclude_none=True)
+
+
+def dump_model(model: pydantic.BaseModel, include: Any = None) -> bytes:
+    # same as `model.model_dump_json()`, without decoding the JSON bytes to `str`
+    return model.__pydantic_serializer__.to_json(
+        model, include=include, by_alias=True, exclude_unset=True, exclude_none=True
+    )
+
+
+def model_content(
+    model: pydantic.BaseModel, include: Any = None, exclude: Any = None
+) -> Any:
+    """Dump a model to JSON compatible content, as FastAPI response serialization."""
+    return model.model_dump(
+        mode="json",
+        include=include,
+        exclude=exclude,
+        by_alias=True,
+        exclude_unset=True,
+        exclude_none=True,
+    )
+
+
+def encode_content(
+    content: Any,
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+) -> bytes:
+    """Encode JSON compatible content as the body of a `response_class` response."""
+    return bytes(response_class(content=content).body)
+
+
+def encode_model(
+    model: pydantic.BaseModel,
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+    include: Any = None,
+) -> bytes:
+    """Encode a model to the same bytes as FastAPI serialization with `response_class`.
+
+    Parameters
+    ----------
+    model : pydantic.BaseModel
+        Model to encode, with the exclusion semantics of the routes response models.
+    response_class : Type[fastapi.Response], optional
+        Class of the JSON responses of the application,
+        by default `fastapi.responses.JSONResponse`.
+    include : Any, optional
+        Fields to encode, as pydantic `include` argument, by default all of them.
+
+    Returns
+    -------
+    bytes
+        JSON encoded model.
+    """
+    if response_class is FastJSONResponse:
+        # same bytes, without dumping the model to Python objects first
+        return dump_model(model, include=include)
+    return encode_content(model_content(model, include=include), response_class)
+
+
+# stands for the links of the jobs, encoded from templates (see `JobLinks.dump`)
+LINKS_PLACEHOLDER = "\x00links\x00"
+
+
+def job_content(
+    job: models.StatusInfo, fields: Optional[AbstractSet[str]] = None
+) -> Dict[str, Any]:
+    """Dump a job to JSON compatible content, with a placeholder for its links.
+
+    The links are placed among the fields of the model, before the extra ones,
+    as in FastAPI serialization.
+    """
+    content: Dict[str, Any] = model_content(job, include=fields, exclude={"links"})
+    if fields is not None and "links" not in fields:
+        return content
+    if not job.model_extra:
+        content["links"] = LINKS_PLACEHOLDER
+        return content
+    extra = {key: content.pop(key) for key in job.model_extra if key in content}
+    content["links"] = LINKS_PLACEHOLDER
+    content.update(extra)
+    return content
+
+
+def encode_with_links(
+    content: Any,
+    job_contents: List[Dict[str, Any]],
+    links: List[bytes],
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+) -> bytes:
+    """Encode content, filling in the links placeholders of its jobs.
+
+    Parameters
+    ----------
+    content : Any
+        JSON compatible content, holding the jobs contents.
+    job_contents : List[Dict[str, Any]]
+        Contents of the jobs, created by `job_content`, in order.
+    links : List[bytes]
+        JSON encoded links of the jobs, in the same order.
+    response_class : Type[fastapi.Response], optional
+        Class of the JSON responses of the application,
+        by default `fastapi.responses.JSONResponse`.
+
+    Returns
+    -------
+    bytes
+        JSON encoded content.
+    """
+    marker = encode_content(LINKS_PLACEHOLDER, response_class)
+    parts = encode_content(content, response_class).split(marker)
+    if len(parts) == len(links) + 1:
+        body = bytearray(parts[0])
+        for job_links, part in zip(links, parts[1:]):
+            body += job_links
+            body += part
+        return bytes(body)
+    # the placeholder is also found in the jobs themselves, links are decoded
+    for contents, job_links in zip(job_contents, links):
+        contents["links"] = json.loads(job_links)
+    return encode_content(content, response_class)
+
+
+def iter_json_array(
+    head: bytes, items: Iterable[bytes], tail: Callable[[], bytes]
+) -> Iterator[bytes]:
+    """Join JSON encoded items into chunks of about `STREAM_CHUNK_SIZE` bytes.
+
+    Parameters
+    ----------
+    head : bytes
+        JSON text preceding the items, up to the opening bracket of the array.
+    items : Iterable[bytes]
+        JSON encoded items of the array.
+    tail : Callable[[], bytes]
+        Callable returning the JSON text following the items, called once
+        all items have been consumed.
+
+    Yields
+    ------
+    bytes
+        Chunks of the JSON document.
+    """
+    buffer = bytearray(head)
+    separator = b""
+    for item in items:
+        buffer += separator
+        buffer += item
+        separator = b","
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += tail()
+    yield bytes(buffer)
+
+
+async def aiter_json_array(
+    head: bytes, items: AsyncIterable[bytes], tail: Callable[[], bytes]
+) -> AsyncIterator[bytes]:
+    """Asynchronous version of `iter_json_array`."""
+    buffer = bytearray(head)
+    separator = b""
+    async for item in items:
+        buffer += separator
+        buffer += item
+        separator = b","
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += tail()
+    yield bytes(buffer)
+
+
+def job_encoder(
+    dump_job_links: Callable[[models.StatusInfo], bytes],
+    fields: Optional[AbstractSet[str]] = None,
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+) -> Callable[[models.StatusInfo], bytes]:
+    """Create the JSON encoder of the jobs of a list, with their links if selected."""
+    with_links = fields is None or "links" in fields
+
+    def encode_job(job: models.StatusInfo) -> bytes:
+        content = job_content(job, fields)
+        if not with_links:
+            return encode_content(content, response_class)
+        return encode_with_links(
+            content, [content], [dump_job_links(job)], response_class
+        )
+
+    return encode_job
+
+
+def job_list_response(
+    job_list: models.JobList,
+    dump_job_links: Callable[[models.StatusInfo], bytes],
+    fields: Optional[AbstractSet[str]] = None,
+    response_model: Optional[Type[pydantic.BaseModel]] = None,
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+) -> fastapi.Response:
+    """Encode a list of jobs as a JSON response, instead of FastAPI serialization.
+
+    Links of the jobs are encoded by `dump_job_links`, rather than created
+    as models, as in `stream_job_list`. The rest of the list is encoded by
+    `response_class`, to the same bytes as FastAPI serialization.
+
+    Parameters
+    ----------
+    job_list : models.JobList
+        List of jobs returned by the client, with its links.
+    dump_job_links : Callable[[models.StatusInfo], bytes]
+        Callable returning the JSON encoded links to attach to a job.
+    fields : Optional[AbstractSet[str]], optional
+        Names of the fields of the jobs to encode, by default all of them.
+    response_model : Optional[Type[pydantic.BaseModel]], optional
+        Model to validate `job_list` against, if any, by default None.
+    response_class : Type[fastapi.Response], optional
+        Class of the JSON responses of the application,
+        by default `fastapi.responses.JSONResponse`.
+
+    Returns
+    -------
+    fastapi.Response
+        JSON response.
+    """
+    if response_model is not None:
+        job_list = validate_response(job_list, response_model)  # type: ignore[assignment]
+    with metrics.measure("encoding"):
+        jobs = [job_content(job, fields) for job in job_list.jobs]
+        content = {
+            "jobs": jobs,
+            **model_content(
+                job_list,
+                include={"links", "numberMatched"} if fields is not None else None,
+                exclude={"jobs"},
+            ),
+        }
+        if fields is not None and "links" not in fields:
+            body = encode_content(content, response_class)
+        else:
+            links = [dump_job_links(job) for job in job_list.jobs]
+            body = encode_with_links(content, jobs, links, response_class)
+    return fastapi.Response(content=body, media_type="application/json")
+
+
+def stream_job_list(
+    job_list: models.StreamingJobList,
+    dump_job_links: Callable[[models.StatusInfo], bytes],
+    create_links: Callable[[], List[models.Link]],
+    fields: Optional[AbstractSet[str]] = None,
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+) -> fastapi.responses.StreamingResponse:
+    """Stream a list of jobs as a JSON encoded `JobList`.
+
+    Jobs are encoded with their links one at a time as they are yielded by
+    the client, without response model validation.
+    Synchronous iterators are consumed in FastAPI threadpool, one chunk at a time.
+
+    Parameters
+    ----------
+    job_list : models.StreamingJobList
+        Lazy list of jobs returned by the client.
+    dump_job_links : Callable[[models.StatusInfo], bytes]
+        Callable returning the JSON encoded links to attach to a job.
+    create_links : Callable[[], List[models.Link]]
+        Callable returning the links of the list, called once all jobs
+        have been consumed.
+    fields : Optional[AbstractSet[str]], optional
+        Names of the fields of the jobs to encode, by default all of them.
+    response_class : Type[fastapi.Response], optional
+        Class of the JSON responses of the application, encoding the jobs,
+        by default `fastapi.responses.JSONResponse`.
+
+    Returns
+    -------
+    fastapi.responses.StreamingResponse
+        Response streaming the JSON encoded list of jobs.
+    """
+    encode_job = job_encoder(dump_job_links, fields, response_class)
+
+    def tail() -> bytes:
+        tail = b'],"links":' + dump_links(create_links())
+        if job_list.numberMatched is not None:
+            tail += b',"numberMatched":%d' % job_list.numberMatched
+        return tail + b"}"
+
+    head = b'{"jobs":['
+    content: Union[Iterable[bytes], AsyncIterable[bytes]]
+    if isinstance(job_list.jobs, collections.abc.AsyncIterable):
+
+        async def encoded_jobs() -> AsyncIterator[bytes]:
+            async for job in job_list.jobs:  # type: ignore[union-attr]
+                yield encode_job(job)
+
+        content = aiter_json_array(head, encoded_jobs(), tail)
+    else:
+        content = iter_json_array(head, map(encode_job, job_list.jobs), tail)
+    return fastapi.responses.StreamingResponse(content, media_type="application/json")
+
+
+def validate_response(
+    content: Any, response_model: Type[pydantic.BaseModel]
+) -> pydantic.BaseModel:
+    """Validate the output of an endpoint, as FastAPI response model validation."""
+    with metrics.measure("validation"):
+        try:
+            return response_model.model_validate(content, from_attributes=True)
+        except pydantic.ValidationError as exc:
+            raise fastapi.exceptions.ResponseValidationError(
+                errors=exc.errors(), body=content
+            )
+
+
+def projected_response(
+    model: pydantic.BaseModel,
+    include: Any,
+    response_model: Optional[Type[pydantic.BaseModel]] = None,
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+) -> fastapi.Response:
+    """Encode a model as a JSON response, keeping only the included fields.
+
+    Used for sparse field selection (`fields=`), instead of FastAPI serialization.
+
+    Parameters
+    ----------
+    model : pydantic.BaseModel
+        Model returned by the endpoint.
+    include : Any
+        Fields to encode, as pydantic `include` argument.
+    response_model : Optional[Type[pydantic.BaseModel]], optional
+        Model to validate `model` against, if any, by default None.
+    response_class : Type[fastapi.Response], optional
+        Class of the JSON responses of the application,
+        by default `fastapi.responses.JSONResponse`.
+
+    Returns
+    -------
+    fastapi.Response
+        JSON response.
+    """
+    if response_model is not None:
+        model = validate_response(model, response_model)
+    with metrics.measure("encoding"):
+        body = encode_model(model, response_class, include=include)
+    return fastapi.Response(content=body, media_type="application/json")
+
+
+def serialize_endpoint(
+    endpoint: Callable[..., Awaitable[Any]],
+    status_code: int,
+    response_model: Optional[Type[pydantic.BaseModel]] = None,
+    response_class: Type[fastapi.Response] = fastapi.responses.JSONResponse,
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap an endpoint to serialize its output instead of FastAPI.
+
+    Models returned by the endpoint are validated against `response_model`,
+    if any, then encoded by `response_class` to the same bytes as FastAPI
+    serialization. Other return values (e.g. responses) are left to FastAPI.
+    Validation and encoding are timed, if the request is instrumented.
+    The wrapper keeps the endpoint signature, so that the OpenAPI schema is unchanged.
+
+    Parameters
+    ----------
+    endpoint : Callable[..., Awaitable[Any]]
+        Endpoint function.
+    status_code : int
+        Default status code of the route.
+    response_model : Optional[Type[pydantic.BaseModel]], optional
+        Response model of the route. If None, trusted models returned by
+        the endpoint are encoded without validation, by default None.
+    response_class : Type[fastapi.Response], optional
+        Class of the JSON responses of the application,
+        by default `fastapi.responses.JSONResponse`.
+
+    Returns
+    -------
+    Callable[..., Awaitable[Any]]
+        Endpoint function returning JSON responses.
+    """
+    signature = inspect.signature(endpoint)
+    parameters = list(signature.parameters.values())
+    # FastAPI injects a single response parameter per function
+    response_parameter = next(
+        (param for param in parameters if param.annotation is fastapi.Response),
+        None,
+    )
+    endpoint_has_response = response_parameter is not None
+    if response_parameter is None:
+        response_parameter = inspect.Parameter(
+            "trusted_response",
+            inspect.Parameter.KEYWORD_ONLY,
+            annotation=fastapi.Response,
+        )
+        parameters.append(response_parameter)
+
+    @functools.wraps(endpoint)
+    async def serialized_endpoint(*args: Any, **kwargs: Any) -> Any:
+        if endpoint_has_response:
+            sub_response: fastapi.Response = kwargs[response_parameter.name]
+        else:
+            sub_response = kwargs.pop(response_parameter.name)
+        content = await endpoint(*args, **kwargs)
+        if not isinstance(content, pydantic.BaseModel):
+            return content
+        if response_model is not None:
+            content = validate_response(content, response_model)
+        with metrics.measure("encoding"):
+            body = encode_model(content, response_class)
+        response = fastapi.Response(
+            content=body,
+            status_code=sub_response.status_code or status_code,
+            media_type="application/json",
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    serialized_endpoint.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=parameters
+    )
+    return serialized_endpoint
+
+
+def etag_matches(request: fastapi.Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    # If-None-Match uses the weak comparison
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(
+    request: fastapi.Request, etag: str, last_modified: Optional[float] = None
+) -> bool:
+    """Check the conditional headers of a GET request against the resource validators.
+
+    Parameters
+    ----------
+    request : fastapi.Request
+        Request, possibly conditional.
+    etag : str
+        Entity tag of the resource.
+    last_modified : Optional[float], optional
+        Time of last modification of the resource, as a timestamp, by default None.
+
+    Returns
+    -------
+    bool
+        True if the client copy is up to date and `304 Not Modified` can be sent.
+    """
+    if "if-none-match" in request.headers:
+        # If-Modified-Since is ignored when If-None-Match is present
+        return etag_matches(request, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = email.utils.parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since.timestamp()
+
+
+def cached_response(
+    request: fastapi.Request,
+    cached: caches.CachedResponse,
+    cache_control: Optional[str] = None,
+    compression: Optional[compression_.Compression] = None,
+) -> fastapi.Response:
+    """Send a cached JSON response, or `304 Not Modified` if the client has it.
+
+    With `compression`, the compressed body is cached along with the response.
+    """
+    body, etag = cached.body, cached.etag
+    headers = {}
+    if compression is not None:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = compression.negotiate(request.headers.get("accept-encoding"))
+        if encoding is not None and len(body) >= compression.minimum_size:
+            body = compression.compress_cached(cached, encoding)
+            etag = compression_.variant_etag(etag, encoding)
+            headers["Content-Encoding"] = encoding
+    headers["ETag"] = etag
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if etag_matches(request, etag):
+        headers.pop("Content-Encoding", None)
+        return fastapi.Response(
+            status_code=fastapi.status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    return fastapi.Response(
+        content=body, media_type="application/json", headers=headers
+    )
+
+
+class EventStreamResponse(fastapi.responses.StreamingResponse):
+    media_type = "text/event-stream"
+
+
+def format_event(data: bytes, event: Optional[str] = None) -> bytes:
+    """Format a server-sent event, with single line JSON `data`."""
+    if event is None:
+        return b"data: " + data + b"\n\n"
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a `Range` header requesting a single byte range.
+
+    Parameters
+    ----------
+    range_header : str
+        Value of the `Range` header.
+    size : int
+        Size of the content, in bytes.
+
+    Returns
+    -------
+    Optional[Tuple[int, int]]
+        First and last positions of the range, inclusive. None if the header
+        is invalid or requests several ranges, in which case it is ignored.
+
+    Raises
+    ------
+    RangeNotSatisfiable
+        If the range starts after the end of the content.
+    """
+    unit, _, byte_range = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in byte_range:
+        return None
+    first, separator, last = byte_range.strip().partition("-")
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if not separator or (start is None and end is None):
+        return None
+    if start is None:
+        # suffix range, the last `end` bytes
+        if end is None or end <= 0 or size == 0:
+            raise RangeNotSatisfiable(range_header)
+        return max(size - end, 0), size - 1
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(range_header)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def iter_file(path: pathlib.Path, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def iter_byte_range(
+    chunks: Iterable[bytes], start: int, length: int
+) -> Iterator[bytes]:
+    """Yield `length` bytes from `start` of the content yielded by `chunks`."""
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            if start >= len(chunk):
+                start -= len(chunk)
+                continue
+            if start:
+                chunk, start = chunk[start:], 0
+            if len(chunk) >= length:
+                yield chunk[:length]
+                return
+            length -= len(chunk)
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+async def aiter_byte_range(
+    chunks: AsyncIterable[bytes], start: int, length: int
+) -> AsyncIterator[bytes]:
+    """Asynchronous version of `iter_byte_range`."""
+    iterator = aiter(chunks)
+    try:
+        async for chunk in iterator:
+            if start >= len(chunk):
+                start -= len(chunk)
+                continue
+            if start:
+                chunk, start = chunk[start:], 0
+            if len(chunk) >= length:
+                yield chunk[:length]
+                return
+            length -= len(chunk)
+            yield chunk
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def stat_result_file(path: pathlib.Path) -> os.stat_result:
+    """Get the status of a result file in FastAPI threadpool, not to block the loop."""
+    try:
+        return await fastapi.concurrency.run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise exceptions.ResultsNotFound(detail="job results file not found")
+
+
+async def stream_raw_result(
+    request: fastapi.Request, result: models.RawResult
+) -> fastapi.Response:
+    """Stream a raw job output, honouring single byte range requests.
+
+    Ranges are supported when the size of the output is known. As outputs have
+    no validator, `If-Range` requests are always sent the whole output.
+    Synchronous iterators and files are read in FastAPI threadpool, one chunk
+    at a time, and files are checked there before the response is started.
+
+    Parameters
+    ----------
+    request : fastapi.Request
+        Request of the output.
+    result : models.RawResult
+        Output returned by the client.
+
+    Returns
+    -------
+    fastapi.Response
+        Response streaming the output, or `416 Range Not Satisfiable`.
+
+    Raises
+    ------
+    exceptions.ResultsNotFound
+        If the output is a file that does not exist.
+    """
+    content = result.content
+    size = result.size
+    if isinstance(content, pathlib.Path):
+        size = (await stat_result_file(content)).st_size
+    headers: Dict[str, str] = {}
+    status_code = fastapi.status.HTTP_200_OK
+    start, length = 0, size
+    if size is not None:
+        headers["Accept-Ranges"] = "bytes"
+        range_header = request.headers.get("range")
+        if range_header is not None and "if-range" not in request.headers:
+            try:
+                byte_range = parse_byte_range(range_header, size)
+            except RangeNotSatisfiable:
+                return fastapi.Response(
+                    status_code=416,
+                    headers={"Content-Range": f"bytes */{size}"},
+                )
+            if byte_range is not None:
+                start, end = byte_range
+                length = end - start + 1
+                status_code = fastapi.status.HTTP_206_PARTIAL_CONTENT
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(length)
+
+    body: Union[Iterable[bytes], AsyncIterable[bytes]]
+    if isinstance(content, pathlib.Path):
+        # the size of files is always known
+        body = iter_file(content, start, length or 0)
+    elif status_code != fastapi.status.HTTP_206_PARTIAL_CONTENT or length is None:
+        body = content
+    elif isinstance(content, collections.abc.AsyncIterable):
+        body = aiter_byte_range(content, start, length)
+    else:
+        body = iter_byte_range(content, start, length)
+    return fastapi.responses.StreamingResponse(
+        body, status_code=status_code, media_type=result.media_type, headers=headers
+    )
+
+
+async def file_response(
+    request: fastapi.Request, result: models.FileResult
+) -> fastapi.Response:
+    """Send a file output, or `304 Not Modified` if the client has it.
+
+    `FileResponse` hands the file path to servers supporting the ASGI path send
+    extension, which can send it with `sendfile`, and otherwise reads it in
+    chunks in FastAPI threadpool. It also answers range requests.
+    """
+    stat_result = await stat_result_file(result.path)
+    response = fastapi.responses.FileResponse(
+        result.path,
+        media_type=result.media_type,
+        filename=result.filename,
+        stat_result=stat_result,
+    )
+    if not_modified(request, response.headers["etag"], stat_result.st_mtime):
+        return fastapi.Response(
+            status_code=fastapi.status.HTTP_304_NOT_MODIFIED,
+            headers={
+                "ETag": response.headers["etag"],
+                "Last-Modified": response.headers["last-modified"],
+            },
+        )
+    return response
+
+
+async def raw_results_response(
+    request: fastapi.Request, results: Any
+) -> Optional[fastapi.Response]:
+    """Create the response sending results returned as is by the client, if so.
+
+    Returns None for results documents (`models.Results`).
+    """
+    if isinstance(results, models.FileResult):
+        return await file_response(request, results)
+    if isinstance(results, models.RawResult):
+        return await stream_raw_result(request, results)
+    return None
@@ -0,0 +1,208 @@
+"""Multi-tenant APIs, serving the clients of all tenants with one set of routes."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import contextvars
+import functools
+import inspect
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+import attrs
+import fastapi
+import starlette.datastructures
+import starlette.types
+
+from . import clients, exceptions
+
+
+@attrs.define(frozen=True)
+class Tenant:
+    tenant_id: str
+    client: clients.ClientType
+
+
+current_tenant: contextvars.ContextVar[Optional[Tenant]] = contextvars.ContextVar(
+    "current_tenant", default=None
+)
+
+
+def current_tenant_id() -> Optional[str]:
+    """Return the ID of the tenant of the current request, used to key the caches."""
+    tenant = current_tenant.get()
+    return tenant.tenant_id if tenant is not None else None
+
+
+def get_tenant_client() -> clients.ClientType:
+    tenant = current_tenant.get()
+    if tenant is None:
+        raise exceptions.NoSuchTenant()
+    return tenant.client
+
+
+async def require_tenant() -> None:
+    """Reject the requests of unknown tenants, as a dependency of all the routes."""
+    if current_tenant.get() is None:
+        raise exceptions.NoSuchTenant()
+
+
+def dispatch_client_method(
+    method_name: str, method: Callable[..., Any]
+) -> Callable[..., Any]:
+    """Wrap a client method to call the method of the current tenant client.
+
+    The wrapper keeps the signature of `method`, hence the FastAPI dependencies
+    declared by its parameters.
+    """
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def dispatch_coroutine(*args: Any, **kwargs: Any) -> Any:
+            return await getattr(get_tenant_client(), method_name)(*args, **kwargs)
+
+        return dispatch_coroutine
+
+    @functools.wraps(method)
+    def dispatch(*args: Any, **kwargs: Any) -> Any:
+        return getattr(get_tenant_client(), method_name)(*args, **kwargs)
+
+    return dispatch
+
+
+class TenantRegistry:
+    """Clients of the tenants of an API, sharing one set of routes.
+
+    Routes, along with their dependencies and response models, are created once
+    for `client_class`, and dispatch each request to the client of its tenant.
+    Tenants are selected by the first segment of the path of the requests
+    (e.g. `/{tenant_id}/jobs`), or by the value of the `header` request header.
+    Adding a tenant only registers its client, and caches of the routes
+    (e.g. `caches.ProcessDescriptionCache`) are keyed by tenant.
+
+    Parameters
+    ----------
+    client_class : Type[clients.ClientType]
+        Class of the clients of all tenants.
+    header : Optional[str]
+        Name of the request header selecting the tenant. If None, tenants are
+        selected by the prefix of the path.
+    """
+
+    def __init__(
+        self, client_class: Type[clients.ClientType], header: Optional[str] = None
+    ) -> None:
+        self.client_class = client_class
+        self.header = header
+        self._tenants: Dict[str, Tenant] = {}
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._tenants
+
+    def add(self, tenant_id: str, client: clients.ClientType) -> None:
+        """Register the client of a tenant, replacing the previous one if any.
+
+        Raises
+        ------
+        TypeError
+            If the client is not an instance of `client_class`: routes were
+            created for the methods signatures of this class.
+        ValueError
+            If the tenant ID is not a valid path segment.
+        """
+        if type(client) is not self.client_class:
+            raise TypeError(
+                f"client of tenant {tenant_id!r} is not a {self.client_class.__name__}"
+            )
+        if not tenant_id or "/" in tenant_id:
+            raise ValueError(f"{tenant_id!r} is not a valid tenant ID")
+        self._tenants[tenant_id] = Tenant(tenant_id=tenant_id, client=client)
+
+    def remove(self, tenant_id: str) -> None:
+        self._tenants.pop(tenant_id, None)
+
+    def get(self, tenant_id: str) -> Optional[Tenant]:
+        return self._tenants.get(tenant_id)
+
+    def dispatching_client(self) -> clients.ClientType:
+        """Return a client dispatching its methods calls to the current tenant.
+
+        The client is an instance of `client_class`, created without calling
+        its `__init__`, so that optional hooks detection (`clients.implements`)
+        and response models are those of the tenants clients.
+        """
+        client: clients.ClientType = self.client_class.__new__(self.client_class)
+        for method_name in dir(self.client_class):
+            if method_name.startswith("_"):
+                continue
+            method = getattr(client, method_name)
+            if inspect.ismethod(method):
+                setattr(
+                    client, method_name, dispatch_client_method(method_name, method)
+                )
+        return client
+
+    def resolve(
+        self, scope: starlette.types.Scope
+    ) -> Tuple[Optional[Tenant], starlette.types.Scope]:
+        """Return the tenant of a request, and its scope as seen by the routes.
+
+        With tenants selected by path, the tenant prefix is moved to the root
+        path of the request, so that routes match and links include it.
+        """
+        if self.header is not None:
+            tenant_id = starlette.datastructures.Headers(scope=scope).get(self.header)
+            return (self.get(tenant_id) if tenant_id else None), scope
+        root_path = scope.get("root_path", "")
+        path: str = scope["path"]
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        tenant_id = path[1:].partition("/")[0]
+        tenant = self.get(tenant_id) if tenant_id else None
+        if tenant is None:
+            return None, scope
+        tenant_scope = {**scope, "root_path": f"{root_path}/{tenant_id}"}
+        if "app_root_path" in scope:
+            tenant_scope["app_root_path"] = tenant_scope["root_path"]
+        return tenant, tenant_scope
+
+    def add_middleware(self, app: fastapi.FastAPI) -> None:
+        """Add the middleware selecting the tenant of the requests to `app`."""
+        app.add_middleware(TenantMiddleware, registry=self)
+
+
+class TenantMiddleware:
+    """ASGI middleware setting the tenant of the requests, see `TenantRegistry`."""
+
+    def __init__(self, app: starlette.types.ASGIApp, registry: TenantRegistry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(
+        self,
+        scope: starlette.types.Scope,
+        receive: starlette.types.Receive,
+        send: starlette.types.Send,
+    ) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        tenant, scope = self.registry.resolve(scope)
+        token = current_tenant.set(tenant)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_tenant.reset(token)
@@ -0,0 +1,321 @@
+"""Validation of the execution requests against the processes descriptions."""
+
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import json
+from typing import Any, Dict, List, Literal, Optional, Type, Union
+
+import pydantic
+import typing_extensions
+
+from . import exceptions, models
+
+SCALAR_TYPES: Dict[models.ObjectType, Type[Any]] = {
+    models.ObjectType.string: str,
+    models.ObjectType.integer: int,
+    models.ObjectType.number: float,
+    models.ObjectType.boolean: bool,
+}
+
+# patterns of JSON schemas are ECMA 262 regular expressions, closer to Python's
+MODEL_CONFIG = pydantic.ConfigDict(regex_engine="python-re")
+
+MAX_ERRORS = 10
+
+
+def check_unique_items(items: List[Any]) -> List[Any]:
+    keys = {json.dumps(item, sort_keys=True, default=str) for item in items}
+    if len(keys) != len(items):
+        raise ValueError("array items are not unique")
+    return items
+
+
+def object_validator(
+    min_properties: Optional[int],
+    max_properties: Optional[int],
+    required: Optional[List[str]],
+) -> pydantic.BeforeValidator:
+    """Check the number of properties, and required ones, of an object."""
+
+    def check_object(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        if min_properties is not None and len(value) < min_properties:
+            raise ValueError(f"object has fewer than {min_properties} properties")
+        if max_properties is not None and len(value) > max_properties:
+            raise ValueError(f"object has more than {max_properties} properties")
+        missing = [name for name in required or [] if name not in value]
+        if missing:
+            raise ValueError(f"missing required properties {missing}")
+        return value
+
+    return pydantic.BeforeValidator(check_object)
+
+
+def check_integral(value: Any) -> Any:
+    # JSON does not tell integers from integral numbers, e.g. 2.0
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def enum_validator(values: List[Any]) -> pydantic.AfterValidator:
+    def check_enum(value: Any) -> Any:
+        if value not in values:
+            raise ValueError(f"value is not one of {values}")
+        return value
+
+    return pydantic.AfterValidator(check_enum)
+
+
+def create_object_model(
+    name: str, properties: Dict[str, Any], required: List[str]
+) -> Type[pydantic.BaseModel]:
+    # properties are validated by alias, as their names may not be identifiers
+    fields: Dict[str, Any] = {
+        f"field_{i}": (
+            annotation,
+            pydantic.Field(
+                ... if property_name in required else None, alias=property_name
+            ),
+        )
+        for i, (property_name, annotation) in enumerate(properties.items())
+    }
+    return pydantic.create_model(
+        name,
+        __config__=pydantic.ConfigDict(extra="allow", **MODEL_CONFIG),
+        **fields,
+    )
+
+
+def schema_type(
+    schema: Union[models.Reference, models.SchemaItem],  # type: ignore[valid-type]
+    name: str,
+) -> Any:
+    """Translate the schema of an input into a type annotation.
+
+    Schemas are strictly validated (e.g. strings are not coerced into numbers).
+    References, formats and media types are not checked.
+    """
+    if isinstance(schema, models.Reference):
+        return Any
+    object_type = schema.type
+    if object_type is None and schema.properties is not None:
+        object_type = models.ObjectType.object
+    annotation: Any
+    constraints: Dict[str, Any] = {}
+    validators: List[Any] = []
+    if schema.enum is not None and all(
+        isinstance(value, (str, int, float, bool)) for value in schema.enum
+    ):
+        annotation = Literal[tuple(schema.enum)]
+    elif object_type is None:
+        annotation = Any
+    elif object_type is models.ObjectType.array:
+        item_type = schema_type(schema.items, f"{name}Item") if schema.items else Any
+        annotation = List[item_type]  # type: ignore[valid-type]
+        constraints.update(
+            min_length=schema.minItems or None, max_length=schema.maxItems
+        )
+        if schema.uniqueItems:
+            validators.append(pydantic.AfterValidator(check_unique_items))
+    elif object_type is models.ObjectType.object:
+        if schema.properties:
+            annotation = create_object_model(
+                name,
+                {
+                    property_name: schema_type(property_schema, f"{name}_{i}")
+                    for i, (property_name, property_schema) in enumerate(
+                        schema.properties.items()
+                    )
+                },
+                schema.required or [],
+            )
+        else:
+            annotation = Dict[str, Any]
+        if (
+            schema.minProperties
+            or schema.maxProperties is not None
+            or (schema.required and not schema.properties)
+        ):
+            validators.append(
+                object_validator(
+                    schema.minProperties or None,
+                    schema.maxProperties,
+                    None if schema.properties else schema.required,
+                )
+            )
+    else:
+        annotation = SCALAR_TYPES[object_type]
+        constraints["strict"] = True
+        if object_type is models.ObjectType.integer:
+            validators.append(pydantic.BeforeValidator(check_integral))
+        if object_type is models.ObjectType.string:
+            constraints.update(
+                min_length=schema.minLength or None,
+                max_length=schema.maxLength,
+                pattern=schema.pattern,
+            )
+        elif object_type is not models.ObjectType.boolean:
+            # exclusive bounds are booleans, as in OpenAPI 3.0
+            if schema.minimum is not None:
+                bound = "gt" if schema.exclusiveMinimum else "ge"
+                constraints[bound] = schema.minimum
+            if schema.maximum is not None:
+                bound = "lt" if schema.exclusiveMaximum else "le"
+                constraints[bound] = schema.maximum
+            multiple_of = schema.multipleOf
+            if multiple_of is not None and (
+                object_type is models.ObjectType.number or multiple_of.is_integer()
+            ):
+                constraints["multiple_of"] = (
+                    multiple_of
+                    if object_type is models.ObjectType.number
+                    else int(multiple_of)
+                )
+    if (
+        schema.enum is not None
+        and typing_extensions.get_origin(annotation) is not Literal
+    ):
+        validators.append(enum_validator(schema.enum))
+    constraints = {
+        key: value for key, value in constraints.items() if value is not None
+    }
+    if constraints or validators:
+        annotation = typing_extensions.Annotated[
+            annotation, pydantic.Field(**constraints), *validators
+        ]
+    if schema.nullable:
+        annotation = Optional[annotation]
+    return annotation
+
+
+def input_type(input_description: models.InputDescription, name: str) -> Any:
+    """Return the type annotation of the values of an input.
+
+    Values are inline, qualified (`{"value": ...}`) or links (`{"href": ...}`).
+    Inputs with `maxOccurs` greater than 1 are lists of values, or a single
+    value if `minOccurs` allows it.
+    """
+    value_type = schema_type(input_description.schema_, name)
+    qualified_value = pydantic.create_model(
+        f"{name}QualifiedValue",
+        __base__=models.Format,
+        value=(value_type, ...),
+    )
+    # tags label the alternatives in the errors, instead of the generated names
+    annotation: Any = Union[
+        typing_extensions.Annotated[value_type, pydantic.Tag("value")],
+        typing_extensions.Annotated[qualified_value, pydantic.Tag("qualified value")],
+        typing_extensions.Annotated[models.Link, pydantic.Tag("link")],
+    ]
+    min_occurs = (
+        input_description.minOccurs if input_description.minOccurs is not None else 1
+    )
+    max_occurs = input_description.maxOccurs
+    if max_occurs is None or max_occurs == 1:
+        return annotation
+    values = typing_extensions.Annotated[
+        List[annotation],
+        pydantic.Field(
+            min_length=min_occurs or None,
+            max_length=None if max_occurs is models.MaxOccur.unbounded else max_occurs,
+        ),
+    ]
+    if min_occurs > 1:
+        return values
+    return Union[
+        typing_extensions.Annotated[values, pydantic.Tag("values")],
+        typing_extensions.Annotated[annotation, pydantic.Tag("single value")],
+    ]
+
+
+def create_execute_model(
+    process: models.ProcessDescription,
+) -> Type[models.Execute]:
+    """Create the model of the execution requests of a process.
+
+    Unknown inputs and outputs are rejected, inputs are validated against
+    their schema and their number of occurrences (`minOccurs`, `maxOccurs`).
+    """
+    input_fields: Dict[str, Any] = {}
+    inputs_required = False
+    for i, (input_id, input_description) in enumerate((process.inputs or {}).items()):
+        required = input_description.minOccurs != 0
+        inputs_required = inputs_required or required
+        input_fields[f"input_{i}"] = (
+            input_type(input_description, f"Input{i}"),
+            pydantic.Field(... if required else None, alias=input_id),
+        )
+    inputs_model = pydantic.create_model(
+        "Inputs",
+        __config__=pydantic.ConfigDict(extra="forbid", **MODEL_CONFIG),
+        **input_fields,
+    )
+    fields: Dict[str, Any] = {
+        "inputs": (
+            (inputs_model, ...) if inputs_required else (Optional[inputs_model], None)
+        )
+    }
+    if process.outputs is not None:
+        output_ids = Literal[tuple(process.outputs)] if process.outputs else str
+        fields["outputs"] = (Optional[Dict[output_ids, models.Output]], None)  # type: ignore[valid-type]
+    return pydantic.create_model("Execute", __base__=models.Execute, **fields)
+
+
+def format_message(details: Any) -> str:
+    # the names of the generated models are internal
+    if details["type"] == "model_type":
+        return "Input should be a valid dictionary"
+    return str(details["msg"])
+
+
+def format_errors(error: pydantic.ValidationError) -> str:
+    details = [
+        f"{'.'.join(str(item) for item in details['loc']) or 'request'}: "
+        f"{format_message(details)}"
+        for details in error.errors(include_url=False)[:MAX_ERRORS]
+    ]
+    if error.error_count() > MAX_ERRORS:
+        details.append(f"and {error.error_count() - MAX_ERRORS} more errors")
+    return "; ".join(details)
+
+
+class ExecuteValidator:
+    """Validator of the execution requests of a process, compiled once.
+
+    Parameters
+    ----------
+    process : models.ProcessDescription
+        Description of the process.
+    """
+
+    def __init__(self, process: models.ProcessDescription) -> None:
+        self.process_id = process.id
+        self.version = process.version
+        self.model = create_execute_model(process)
+
+    def validate(self, execution_content: Any) -> None:
+        """Validate the content of an execution request.
+
+        Raises
+        ------
+        exceptions.InvalidInput
+            If the request does not comply with the process description.
+        """
+        try:
+            self.model.__pydantic_validator__.validate_python(execution_content)
+        except pydantic.ValidationError as error:
+            raise exceptions.InvalidInput(detail=format_errors(error))
@@ -11,13 +11,25 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License
-
-from typing import Any, Dict, Iterator, List, Optional, TypedDict
+import datetime
+import pathlib
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 import fastapi
 import pytest
 
-from ogc_api_processes_fastapi import clients, models
+from ogc_api_processes_fastapi import clients, events, exceptions, filters, models
 
 
 class Process(TypedDict):
@@ -217,6 +229,409 @@ class TestClientExtended(clients.BaseClient):
         return status_info
 
 
+class TestClientAsync(clients.AsyncBaseClient):
+    """Test implementation of the OGC API - Processes endpoints with coroutines."""
+
+    sync_client = TestClientDefault()
+
+    async def get_processes(
+        self, limit: Optional[int] = fastapi.Query(None)
+    ) -> models.ProcessList:
+        return self.sync_client.get_processes(limit=limit)
+
+    async def get_process(
+        self, process_id: str = fastapi.Path(...)
+    ) -> models.ProcessDescription:
+        return self.sync_client.get_process(process_id=process_id)
+
+    async def post_process_execution(
+        self,
+        process_id: str = fastapi.Path(...),
+        execution_content: Dict[str, Any] = fastapi.Body(...),
+    ) -> models.StatusInfo:
+        return self.sync_client.post_process_execution(
+            process_id=process_id, execution_content=execution_content
+        )
+
+    async def get_jobs(
+        self,
+        processID: Optional[List[str]] = fastapi.Query(None),
+        status: Optional[List[str]] = fastapi.Query(None),
+        limit: Optional[int] = fastapi.Query(10, ge=1, le=10000),
+    ) -> models.JobList:
+        return self.sync_client.get_jobs(
+            processID=processID, status=status, limit=limit
+        )
+
+    async def get_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        return self.sync_client.get_job(job_id=job_id)
+
+    async def get_job_results(
+        self,
+        job_id: str = fastapi.Path(...),
+    ) -> models.Results:
+        return self.sync_client.get_job_results(job_id=job_id)
+
+    async def delete_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        return self.sync_client.delete_job(job_id=job_id)
+
+
+class TestClientStreaming(TestClientDefault):
+    """Test implementation yielding the list of jobs lazily."""
+
+    def __init__(self, asynchronous: bool = False) -> None:
+        self.asynchronous = asynchronous
+
+    def get_jobs(  # type: ignore[override]
+        self,
+        processID: Optional[List[str]] = fastapi.Query(None),
+        status: Optional[List[str]] = fastapi.Query(None),
+        limit: Optional[int] = fastapi.Query(10, ge=1, le=10000),
+    ) -> models.StreamingJobList:
+        statuses = [models.StatusCode.running, models.StatusCode.successful]
+        jobs = (
+            models.StatusInfo(
+                jobID=f"job-{i}", status=statuses[i % 2], type=models.JobType.process
+            )
+            for i in range(limit or 10)
+        )
+
+        async def async_jobs() -> AsyncIterator[models.StatusInfo]:
+            for job in jobs:
+                yield job
+
+        job_list = models.StreamingJobList(
+            jobs=async_jobs() if self.asynchronous else jobs, numberMatched=10000
+        )
+        job_list._pagination_query_params = models.PaginationQueryParameters(
+            next={"offset": str(limit)}
+        )
+        return job_list
+
+
+class TestClientVersioned(TestClientDefault):
+    """Test implementation versioning the processes descriptions."""
+
+    def __init__(self) -> None:
+        self.version = "1"
+        self.get_process_calls = 0
+
+    def get_process(
+        self, process_id: str = fastapi.Path(...)
+    ) -> models.ProcessDescription:
+        self.get_process_calls += 1
+        return super().get_process(process_id=process_id)
+
+    def get_process_version(self, process_id: str) -> Optional[str]:
+        return self.version
+
+
+class TestClientRequest(TestClientDefault):
+    """Test implementation depending on the request, as the endpoints do."""
+
+    def get_process(  # type: ignore[override]
+        self, request: fastapi.Request, process_id: str = fastapi.Path(...)
+    ) -> models.ProcessDescription:
+        process = super().get_process(process_id=process_id)
+        process.title = request.headers.get("X-Title")
+        return process
+
+    def get_process_version(self, process_id: str) -> Optional[str]:
+        return "1"
+
+    def post_process_execution(  # type: ignore[override]
+        self,
+        request: fastapi.Request,
+        process_id: str = fastapi.Path(...),
+        execution_content: Dict[str, Any] = fastapi.Body(...),
+    ) -> models.StatusInfo:
+        return models.StatusInfo(
+            jobID=request.headers["X-Job-ID"],
+            status=models.StatusCode.successful,
+            type=models.JobType.process,
+        )
+
+    def get_job(  # type: ignore[override]
+        self, request: fastapi.Request, job_id: str = fastapi.Path(...)
+    ) -> models.StatusInfo:
+        return models.StatusInfo(
+            jobID=job_id,
+            status=models.StatusCode.successful,
+            type=models.JobType.process,
+            message=request.headers.get("X-Message"),
+        )
+
+    def get_job_results(  # type: ignore[override]
+        self, request: fastapi.Request, job_id: str = fastapi.Path(...)
+    ) -> models.Results:
+        return {"result": request.url_for("GetJob", job_id=job_id).path}  # type: ignore
+
+
+class TestClientJobs(TestClientDefault):
+    """Test implementation retrieving jobs by identifier."""
+
+    def get_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        if job_id == "unknown":
+            raise exceptions.NoSuchJob()
+        status_info = models.StatusInfo(
+            jobID=job_id,
+            status=models.StatusCode.successful,
+            type=models.JobType.process,
+        )
+        return status_info
+
+
+class TestClientBulk(TestClientJobs):
+    """Test implementation retrieving several jobs at once."""
+
+    def get_jobs_by_id(
+        self,
+        job_ids: List[str] = fastapi.Body(
+            ..., embed=True, alias="jobIDs", max_length=clients.MAX_JOB_IDS
+        ),
+    ) -> models.JobList:
+        jobs = [
+            models.StatusInfo(
+                jobID=job_id,
+                status=models.StatusCode.running,
+                type=models.JobType.process,
+            )
+            for job_id in job_ids
+            if job_id != "unknown"
+        ]
+        return models.JobList(jobs=jobs)
+
+
+class TestClientBulkUnsupported(TestClientJobs):
+    """Test implementation falling back to retrieving jobs one by one."""
+
+    def get_jobs_by_id(
+        self,
+        job_ids: List[str] = fastapi.Body(
+            ..., embed=True, alias="jobIDs", max_length=clients.MAX_JOB_IDS
+        ),
+    ) -> Optional[models.JobList]:
+        return None
+
+
+class TestClientPaginated(TestClientDefault):
+    """Test implementation paginating jobs with keyset cursors."""
+
+    def __init__(self, number: int = 7) -> None:
+        created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        # newest first, several jobs created at the same time
+        self.jobs = [
+            models.StatusInfo(
+                jobID=f"job-{i}",
+                status=models.StatusCode.successful,
+                type=models.JobType.process,
+                created=created - datetime.timedelta(seconds=i // 2),
+            )
+            for i in range(number)
+        ]
+        self.jobs.sort(key=self.key, reverse=True)
+
+    def get_jobs(
+        self,
+        processID: Optional[List[str]] = fastapi.Query(None),
+        status: Optional[List[str]] = fastapi.Query(None),
+        limit: Optional[int] = fastapi.Query(10, ge=1, le=10000),
+        cursor: Optional[str] = fastapi.Query(None),
+    ) -> models.JobList:
+        assert limit is not None
+        if cursor is None:
+            jobs, has_next, has_prev = self.jobs[:limit], len(self.jobs) > limit, False
+        else:
+            position = self.decode_job_cursor(cursor)
+            key = (position.created, position.job_id)
+            if position.direction == "next":
+                following = [job for job in self.jobs if self.key(job) < key]
+                jobs, has_next, has_prev = (
+                    following[:limit],
+                    len(following) > limit,
+                    True,
+                )
+            else:
+                preceding = [job for job in self.jobs if self.key(job) > key]
+                jobs, has_next, has_prev = (
+                    preceding[-limit:],
+                    True,
+                    len(preceding) > limit,
+                )
+        job_list = models.JobList(jobs=jobs)
+        job_list._pagination_query_params = self.create_job_pagination(
+            jobs, has_next, has_prev
+        )
+        return job_list
+
+    @staticmethod
+    def key(job: models.StatusInfo) -> Tuple[Optional[datetime.datetime], str]:
+        return (job.created, job.jobID)
+
+
+class TestClientFiltered(TestClientPaginated):
+    """Test implementation filtering jobs with a `JobFilter`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        for job in self.jobs:
+            assert job.created is not None
+            i = int(job.jobID.removeprefix("job-"))
+            job.processID = f"dataset-{i % 2}"
+            job.started = job.created
+            job.finished = job.created + datetime.timedelta(minutes=i)
+
+    def get_jobs(  # type: ignore[override]
+        self,
+        job_filter: filters.JobFilter = fastapi.Depends(filters.job_filter_from_query),
+        limit: Optional[int] = fastapi.Query(10, ge=1, le=10000),
+        fields: Optional[FrozenSet[str]] = fastapi.Depends(
+            filters.job_fields_from_query
+        ),
+    ) -> models.JobList:
+        self.fields = fields
+        jobs = [job for job in self.jobs if job_filter.matches(job)]
+        return models.JobList(jobs=jobs[:limit], numberMatched=len(jobs))
+
+
+class TestClientProgress(TestClientDefault):
+    """Test implementation of a job progressing at each status request."""
+
+    def __init__(self) -> None:
+        self.progress = 0
+
+    def get_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        status = models.StatusCode.running
+        if self.progress == 100:
+            status = models.StatusCode.successful
+        status_info = models.StatusInfo(
+            jobID=job_id,
+            status=status,
+            type=models.JobType.process,
+            progress=self.progress,
+        )
+        self.progress = min(self.progress + 50, 100)
+        return status_info
+
+
+class TestClientSyncExecution(TestClientProgress):
+    """Test implementation of processes with given execution modes."""
+
+    def __init__(
+        self, job_control_options: Optional[List[models.JobControlOptions]] = None
+    ) -> None:
+        super().__init__()
+        self.job_control_options = job_control_options
+
+    def get_process(
+        self, process_id: str = fastapi.Path(...)
+    ) -> models.ProcessDescription:
+        process = super().get_process(process_id=process_id)
+        process.jobControlOptions = self.job_control_options
+        return process
+
+    def get_process_execution_modes(
+        self, process_id: str
+    ) -> Optional[List[models.JobControlOptions]]:
+        return self.job_control_options
+
+
+class TestClientWaited(TestClientDefault):
+    """Test implementation waiting for jobs to be finished."""
+
+    def wait_for_job(self, job_id: str, timeout: float) -> Optional[models.StatusInfo]:
+        if job_id == "unwaited":
+            return None
+        return models.StatusInfo(
+            jobID=job_id,
+            status=models.StatusCode.successful,
+            type=models.JobType.process,
+        )
+
+
+class TestClientRawResults(TestClientDefault):
+    """Test implementation returning raw results from a file or byte streams."""
+
+    content = bytes(range(256)) * 1000
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self.path.write_bytes(self.content)
+
+    def iter_content(self, chunk_size: int = 1000) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    async def aiter_content(self) -> AsyncIterator[bytes]:
+        for chunk in self.iter_content():
+            yield chunk
+
+    def get_job_results(  # type: ignore[override]
+        self, job_id: str = fastapi.Path(...)
+    ) -> Union[models.Results, models.RawResult, models.FileResult]:
+        if job_id == "file-result":
+            return models.FileResult(
+                path=self.path, media_type="application/x-netcdf", filename="data.nc"
+            )
+        if job_id == "file":
+            return models.RawResult(content=self.path)
+        if job_id == "iter":
+            return models.RawResult(content=self.iter_content(), size=len(self.content))
+        if job_id == "aiter":
+            return models.RawResult(
+                content=self.aiter_content(),
+                media_type="application/x-netcdf",
+                size=len(self.content),
+            )
+        if job_id == "unsized":
+            return models.RawResult(content=self.iter_content())
+        if job_id == "bytes":
+            return models.RawResult.model_validate({"content": self.content})
+        if job_id == "missing":
+            return models.RawResult(content=self.path.with_name("missing.bin"))
+        if job_id == "missing-file-result":
+            return models.FileResult(path=self.path.with_name("missing.bin"))
+        return super().get_job_results(job_id=job_id)
+
+
+class TestClientWatched(TestClientDefault):
+    """Test implementation notifying the jobs status updates."""
+
+    def __init__(self) -> None:
+        self.broker = events.JobStatusBroker()
+
+    def watch_job(self, job_id: str) -> AsyncIterator[models.StatusInfo]:
+        return self.broker.subscribe(job_id)
+
+
+class TestClientSubmissions(TestClientDefault):
+    """Test implementation creating a new job for each submission."""
+
+    def __init__(self) -> None:
+        self.submissions = 0
+        self.jobs: Dict[str, models.StatusInfo] = {}
+
+    def post_process_execution(
+        self,
+        process_id: str = fastapi.Path(...),
+        execution_content: Dict[str, Any] = fastapi.Body(...),
+    ) -> models.StatusInfo:
+        self.submissions += 1
+        job = models.StatusInfo(
+            jobID=f"job-{self.submissions}",
+            processID=process_id,
+            status=models.StatusCode.accepted,
+            type=models.JobType.process,
+        )
+        self.jobs[job.jobID] = job
+        return job
+
+    def get_job(self, job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        if job_id not in self.jobs:
+            raise exceptions.NoSuchJob()
+        return self.jobs[job_id]
+
+
 @pytest.fixture
 def test_client_default() -> Iterator[clients.BaseClient]:
     yield TestClientDefault()
@@ -225,3 +640,75 @@ def test_client_default() -> Iterator[clients.BaseClient]:
 @pytest.fixture
 def test_client_extended() -> Iterator[clients.BaseClient]:
     yield TestClientExtended()
+
+
+@pytest.fixture
+def test_client_async() -> Iterator[clients.AsyncBaseClient]:
+    yield TestClientAsync()
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def test_client_streaming(
+    request: pytest.FixtureRequest,
+) -> Iterator[clients.BaseClient]:
+    yield TestClientStreaming(asynchronous=request.param)
+
+
+@pytest.fixture
+def test_client_versioned() -> Iterator[TestClientVersioned]:
+    yield TestClientVersioned()
+
+
+@pytest.fixture(
+    params=[TestClientJobs, TestClientBulk, TestClientBulkUnsupported],
+    ids=["fan-out", "bulk", "bulk-unsupported"],
+)
+def test_client_jobs(request: pytest.FixtureRequest) -> Iterator[clients.BaseClient]:
+    yield request.param()
+
+
+@pytest.fixture
+def test_client_request() -> Iterator[TestClientRequest]:
+    yield TestClientRequest()
+
+
+@pytest.fixture
+def test_client_paginated() -> Iterator[TestClientPaginated]:
+    yield TestClientPaginated()
+
+
+@pytest.fixture
+def test_client_filtered() -> Iterator[TestClientFiltered]:
+    yield TestClientFiltered()
+
+
+@pytest.fixture
+def test_client_progress() -> Iterator[TestClientProgress]:
+    yield TestClientProgress()
+
+
+@pytest.fixture
+def test_client_watched() -> Iterator[TestClientWatched]:
+    yield TestClientWatched()
+
+
+@pytest.fixture
+def test_client_submissions() -> Iterator[TestClientSubmissions]:
+    yield TestClientSubmissions()
+
+
+@pytest.fixture
+def test_client_sync_execution(
+    request: pytest.FixtureRequest,
+) -> Iterator[TestClientSyncExecution]:
+    yield TestClientSyncExecution(getattr(request, "param", None))
+
+
+@pytest.fixture
+def test_client_waited() -> Iterator[TestClientWaited]:
+    yield TestClientWaited()
+
+
+@pytest.fixture
+def test_client_raw_results(tmp_path: pathlib.Path) -> Iterator[TestClientRawResults]:
+    yield TestClientRawResults(tmp_path / "results.bin")
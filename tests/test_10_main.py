@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 
+import json
 from typing import Any, Dict, List
 
+import fastapi
+import fastapi.testclient
+import pytest
+
 import ogc_api_processes_fastapi
 import ogc_api_processes_fastapi.models
+import ogc_api_processes_fastapi.responses
 
 
 def equal_dicts(d1: Dict[str, Any], d2: Dict[str, Any], ignore_keys: List[Any]) -> bool:
@@ -190,3 +196,160 @@ def test_instantiate_app_extended(
         "metadata"
         in openapi_schema["components"]["schemas"]["StatusInfo"]["properties"].keys()
     )
+
+
+def test_instantiate_app_async(
+    test_client_async: ogc_api_processes_fastapi.AsyncBaseClient,
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_async)
+
+    openapi_schema = app.openapi()
+    assert "/jobs/{job_id}" in openapi_schema["paths"]
+    assert "StatusInfo" in openapi_schema["components"]["schemas"]
+
+
+@pytest.mark.parametrize(
+    "method,path",
+    [
+        ("GET", "/"),
+        ("GET", "/conformance"),
+        ("GET", "/processes"),
+        ("GET", "/processes/dataset-1"),
+        ("POST", "/processes/dataset-1/execution"),
+        ("GET", "/jobs"),
+        ("GET", "/jobs/job-1"),
+        ("GET", "/jobs/job-1/results"),
+        ("DELETE", "/jobs/job-1"),
+        ("POST", "/jobs/status"),
+        ("GET", "/jobs/unknown"),
+        ("GET", "/jobs?cursor=invalid"),
+    ],
+)
+def test_instantiate_app_default_response_class(
+    test_client_jobs: ogc_api_processes_fastapi.BaseClient, method: str, path: str
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_jobs, title="Sérvice de traitement"
+    )
+    fast_app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_jobs,
+        title="Sérvice de traitement",
+        default_response_class=ogc_api_processes_fastapi.responses.FastJSONResponse,
+    )
+    client = fastapi.testclient.TestClient(app)
+    fast_client = fastapi.testclient.TestClient(fast_app)
+
+    json = {"jobIDs": ["job-1", "job-2"]}
+    response = client.request(method, path, json=json)
+    fast_response = fast_client.request(method, path, json=json)
+    assert fast_response.status_code == response.status_code
+    assert fast_response.content == response.content
+    assert fast_response.headers == response.headers
+
+
+def test_instantiate_app_floats(
+    test_client_default: ogc_api_processes_fastapi.BaseClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    results = {"small": 1e-7, "large": 1e16, "value": 0.5}
+
+    def get_job_results(
+        job_id: str = fastapi.Path(...),
+    ) -> ogc_api_processes_fastapi.models.Results:
+        return results  # type: ignore
+
+    monkeypatch.setattr(test_client_default, "get_job_results", get_job_results)
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_default)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs/job-1/results")
+    assert (
+        response.content
+        == json.dumps(results, ensure_ascii=False, separators=(",", ":")).encode()
+    )
+    assert b"1e-07" in response.content and b"1e+16" in response.content
+
+
+@pytest.mark.parametrize("instrumented", [False, True])
+def test_instantiate_app_same_bytes(
+    test_client_versioned: ogc_api_processes_fastapi.BaseClient,
+    monkeypatch: pytest.MonkeyPatch,
+    instrumented: bool,
+) -> None:
+    models = ogc_api_processes_fastapi.models
+
+    def get_process(
+        process_id: str = fastapi.Path(...),
+    ) -> models.ProcessDescription:
+        return models.ProcessDescription(
+            id=process_id,
+            version="1.0",
+            inputs={"a": models.InputDescription(schema={"minimum": 1e-7})},
+        )
+
+    def get_jobs() -> models.JobList:
+        job = models.StatusInfo(
+            jobID="job-1",
+            status=models.StatusCode.successful,
+            type=models.JobType.process,
+            score=1e-7,  # type: ignore[call-arg]
+        )
+        return models.JobList(jobs=[job], numberMatched=1)
+
+    monkeypatch.setattr(test_client_versioned, "get_process", get_process)
+    monkeypatch.setattr(test_client_versioned, "get_jobs", get_jobs)
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_versioned,
+        instrumentation=(
+            ogc_api_processes_fastapi.metrics.Instrumentation()
+            if instrumented
+            else None
+        ),
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    # cached and uncached bodies are encoded as by FastAPI with `JSONResponse`
+    for path in ["/", "/conformance", "/processes/process", "/jobs", "/jobs/1"]:
+        for _ in range(2):
+            response = client.get(path)
+            assert (
+                response.content
+                == json.dumps(
+                    response.json(), ensure_ascii=False, separators=(",", ":")
+                ).encode()
+            )
+    assert b"1e-07" in client.get("/processes/process").content
+
+    response = client.get("/jobs")
+    assert b"1e-07" in response.content
+    [job] = response.json()["jobs"]
+    assert list(job) == ["type", "jobID", "status", "links", "score"]
+    assert list(response.json()) == ["jobs", "links", "numberMatched"]
+    response = client.get("/jobs", params={"fields": "jobID,links"})
+    assert list(response.json()["jobs"][0]) == ["type", "jobID", "status", "links"]
+
+
+def test_set_resp_model_cached(
+    test_client_default: ogc_api_processes_fastapi.BaseClient,
+) -> None:
+    resp_model = ogc_api_processes_fastapi.main.set_response_model(
+        test_client_default, "GetJobs"
+    )
+    other_client = type(test_client_default)()
+    assert (
+        ogc_api_processes_fastapi.main.set_response_model(other_client, "GetJobs")
+        is resp_model
+    )
+
+
+def test_instantiate_app_lazy_openapi(
+    test_client_default: ogc_api_processes_fastapi.BaseClient,
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_default)
+    assert app.openapi_schema is None
+
+    client = fastapi.testclient.TestClient(app)
+    assert client.get("/jobs").status_code == 200
+    assert app.openapi_schema is None
+    assert client.get("/openapi.json").status_code == 200
+    assert app.openapi_schema is not None
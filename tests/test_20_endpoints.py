@@ -12,18 +12,61 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 
+import json
+import threading
+import time
 import urllib.parse
+from typing import Any, Dict
 
 import fastapi
 import fastapi.testclient
 import pytest
 
 import ogc_api_processes_fastapi
-from ogc_api_processes_fastapi import endpoints, models
+from ogc_api_processes_fastapi import caches, config, endpoints, models, responses
 
 BASE_URL = "http://testserver/processes/"
 
 
+@pytest.mark.parametrize("path_params", [{}, {"job_id": "job-1"}])
+@pytest.mark.parametrize("status", ["running", "successful"])
+def test_job_links(path_params: Dict[str, str], status: str) -> None:
+    request = fastapi.Request(
+        {
+            "type": "http",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": "/jobs",
+            "root_path": "",
+            "headers": [],
+            "path_params": path_params,
+        }
+    )
+    job = models.StatusInfo(
+        jobID='job-"1"', status=models.StatusCode(status), type=models.JobType.process
+    )
+    job_links = endpoints.JobLinks(request)
+
+    links = job_links.links(job)
+    exp_links = [
+        models.Link(
+            href='http://testserver/jobs/job-"1"',
+            rel="self" if path_params else "monitor",
+            type="application/json",
+            title=None if path_params else "job status info",
+        )
+    ]
+    if status == "successful":
+        exp_links.append(
+            models.Link(href='http://testserver/jobs/job-"1"/results', rel="results")
+        )
+    assert links == exp_links
+    assert endpoints.create_links_to_job(request, job) == exp_links
+
+    assert job_links.dump(job) == responses.dump_links(exp_links)
+    assert job_links.dump(job) == job_links.dump(job)
+
+
 def test_create_self_link() -> None:
     request_url = "http://localhost/myapi"
     self_link = endpoints.create_self_link(request_url)
@@ -66,6 +109,55 @@ def test_create_pagination_links() -> None:
     assert pagination_links == exp_links
 
 
+def test_get_landing_page(
+    test_client_default: ogc_api_processes_fastapi.BaseClient,
+) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(
+        client=test_client_default, title="Processing server"
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "max-age=3600"
+    body = response.json()
+    assert body["title"] == "Processing server"
+    assert "description" not in body
+    assert [link["href"] for link in body["links"]] == [
+        "http://testserver/openapi.json",
+        "http://testserver/conformance",
+        "http://testserver/processes",
+    ]
+
+    response = client.get("/", headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+
+    client = fastapi.testclient.TestClient(app, base_url="http://example.org")
+    response = client.get("/")
+    assert response.json()["links"][0]["href"] == "http://example.org/openapi.json"
+
+
+def test_get_conformance(
+    test_client_default: ogc_api_processes_fastapi.BaseClient,
+) -> None:
+    extra_conformance_class = (
+        "http://www.opengis.net/spec/ogcapi-processes-1/1.0/conf/callback"
+    )
+    app = ogc_api_processes_fastapi.main.instantiate_app(
+        client=test_client_default, extra_conformance_classes=[extra_conformance_class]
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/conformance")
+    assert response.status_code == 200
+    assert "ETag" in response.headers
+    exp_conformance_classes = [
+        *ogc_api_processes_fastapi.config.CONFORMANCE_CLASSES,
+        extra_conformance_class,
+    ]
+    assert response.json() == {"conformsTo": exp_conformance_classes}
+
+
 def test_get_processes(
     test_client_default: ogc_api_processes_fastapi.BaseClient,
 ) -> None:
@@ -122,6 +214,69 @@ def test_get_process(
     assert all([key in response.json() for key in exp_keys])
 
 
+def test_get_process_cached(
+    test_client_default: ogc_api_processes_fastapi.BaseClient,
+    test_client_versioned: Any,
+) -> None:
+    process_cache = caches.ProcessDescriptionCache()
+    app = ogc_api_processes_fastapi.main.instantiate_app(
+        client=test_client_versioned, process_cache=process_cache
+    )
+    client = fastapi.testclient.TestClient(app)
+    exp_body = fastapi.testclient.TestClient(
+        ogc_api_processes_fastapi.main.instantiate_app(client=test_client_default)
+    ).get("/processes/dataset-1")
+
+    response = client.get("/processes/dataset-1")
+    assert response.status_code == 200
+    assert response.json() == exp_body.json()
+    etag = response.headers["ETag"]
+
+    response = client.get("/processes/dataset-1")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == etag
+    assert response.json() == exp_body.json()
+    assert test_client_versioned.get_process_calls == 1
+
+    response = client.get("/processes/dataset-1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert test_client_versioned.get_process_calls == 1
+
+    process_cache.invalidate("dataset-1")
+    response = client.get("/processes/dataset-1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert test_client_versioned.get_process_calls == 2
+
+    test_client_versioned.version = "2"
+    response = client.get("/processes/dataset-1")
+    assert response.status_code == 200
+    assert test_client_versioned.get_process_calls == 3
+
+    client.get("/processes/dataset-2")
+    assert len(process_cache) == 2
+
+
+def test_get_process_cached_request(test_client_request: Any) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_request)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/processes/dataset-1?f=json", headers={"X-Title": "one"})
+    assert response.status_code == 200
+    assert response.json()["title"] == "one"
+    assert response.json()["links"][0] == {
+        "href": "http://testserver/processes/dataset-1",
+        "rel": "self",
+    }
+
+    # the description is cached, without the query of the first request
+    response = client.get("/processes/dataset-1?other=1")
+    assert response.json()["title"] == "one"
+    assert response.json()["links"][0]["href"] == (
+        "http://testserver/processes/dataset-1"
+    )
+
+
 def test_post_process_execution(
     test_client_default: ogc_api_processes_fastapi.BaseClient,
 ) -> None:
@@ -140,6 +295,103 @@ def test_post_process_execution(
     assert response.headers[exp_headers_key] == exp_headers_value
 
 
+def test_post_process_execution_sync(test_client_sync_execution: Any) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(
+        client=test_client_sync_execution
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.post(
+        "/processes/dataset-1/execution", json={}, headers={"Prefer": "wait=10"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"result": "https://example.org/1-results.nc"}
+    assert response.headers["Preference-Applied"] == "wait=10"
+    assert response.headers["Location"] == "http://testserver/jobs/1"
+
+    # the job is not finished in time
+    test_client_sync_execution.progress = 0
+    response = client.post(
+        "/processes/dataset-1/execution", json={}, headers={"Prefer": "wait=0"}
+    )
+    assert response.status_code == 201
+    assert response.json()["status"] == "accepted"
+    assert response.headers["Location"] == "http://testserver/jobs/1"
+    assert "Preference-Applied" not in response.headers
+
+    response = client.post(
+        "/processes/dataset-1/execution",
+        json={},
+        headers={"Prefer": "respond-async"},
+    )
+    assert response.status_code == 201
+
+    responses = app.openapi()["paths"]["/processes/{process_id}/execution"]["post"][
+        "responses"
+    ]
+    assert {"200", "201"} <= set(responses)
+
+
+@pytest.mark.parametrize(
+    "test_client_sync_execution,prefer,status_code",
+    [
+        ([models.JobControlOptions.sync_execute], None, 200),
+        ([models.JobControlOptions.async_execute], "wait=10", 201),
+        ([models.JobControlOptions.async_execute], None, 201),
+        (
+            [
+                models.JobControlOptions.sync_execute,
+                models.JobControlOptions.async_execute,
+            ],
+            None,
+            201,
+        ),
+    ],
+    indirect=["test_client_sync_execution"],
+)
+def test_post_process_execution_modes(
+    test_client_sync_execution: Any, prefer: str, status_code: int
+) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(
+        client=test_client_sync_execution
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    headers = {"Prefer": prefer} if prefer else {}
+    response = client.post("/processes/dataset-1/execution", json={}, headers=headers)
+    assert response.status_code == status_code
+
+
+def test_post_process_execution_waited(test_client_waited: Any) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_waited)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.post(
+        "/processes/dataset-1/execution", json={}, headers={"Prefer": "wait=5"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"result": "https://example.org/1-results.nc"}
+
+
+def test_post_process_execution_request(test_client_request: Any) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_request)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.post(
+        "/processes/dataset-1/execution", json={}, headers={"X-Job-ID": "job-1"}
+    )
+    assert response.status_code == 201
+    assert response.json()["jobID"] == "job-1"
+
+    response = client.post(
+        "/processes/dataset-1/execution",
+        json={},
+        headers={"X-Job-ID": "job-1", "Prefer": "wait=5"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"result": "/jobs/job-1"}
+
+
 def test_get_jobs(
     test_client_default: ogc_api_processes_fastapi.BaseClient,
 ) -> None:
@@ -151,6 +403,141 @@ def test_get_jobs(
 
     exp_keys = ("jobs", "links")
     assert all([key in response.json() for key in exp_keys])
+    assert response.json()["jobs"][0] == {
+        "jobID": "1",
+        "status": "accepted",
+        "type": "process",
+        "links": [
+            {
+                "href": "http://testserver/jobs/1",
+                "rel": "monitor",
+                "type": "application/json",
+                "title": "job status info",
+            }
+        ],
+    }
+
+
+def test_get_jobs_streaming(
+    test_client_streaming: ogc_api_processes_fastapi.BaseClient,
+) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_streaming)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs?limit=5000")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+    jobs = response.json()["jobs"]
+    assert len(jobs) == 5000
+    assert jobs[1] == {
+        "jobID": "job-1",
+        "status": "successful",
+        "type": "process",
+        "links": [
+            {
+                "href": "http://testserver/jobs/job-1",
+                "rel": "monitor",
+                "type": "application/json",
+                "title": "job status info",
+            },
+            {"href": "http://testserver/jobs/job-1/results", "rel": "results"},
+        ],
+    }
+
+    exp_links = [
+        {
+            "href": "http://testserver/jobs?limit=5000",
+            "rel": "self",
+            "title": "list of submitted jobs",
+        },
+        {"href": "http://testserver/jobs?limit=5000&offset=5000", "rel": "next"},
+    ]
+    assert response.json()["links"] == exp_links
+    assert response.json()["numberMatched"] == 10000
+
+    openapi_schema = app.openapi()
+    assert openapi_schema["paths"]["/jobs"]["get"]["responses"]["200"]["content"][
+        "application/json"
+    ]["schema"] == {"$ref": "#/components/schemas/GetJobs"}
+
+
+def test_post_jobs_status(
+    test_client_jobs: ogc_api_processes_fastapi.BaseClient,
+) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_jobs)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.post(
+        "/jobs/status", json={"jobIDs": ["job-1", "unknown", "job-2"]}
+    )
+    assert response.status_code == 200
+
+    jobs = response.json()["jobs"]
+    assert [job["jobID"] for job in jobs] == ["job-1", "job-2"]
+    assert jobs[0]["links"][0] == {
+        "href": "http://testserver/jobs/job-1",
+        "rel": "monitor",
+        "type": "application/json",
+        "title": "job status info",
+    }
+
+    response = client.post("/jobs/status", json={})
+    assert response.status_code == 422
+
+    job_ids = [f"job-{i}" for i in range(ogc_api_processes_fastapi.clients.MAX_JOB_IDS)]
+    response = client.post("/jobs/status", json={"jobIDs": job_ids})
+    assert response.status_code == 200
+    response = client.post("/jobs/status", json={"jobIDs": [*job_ids, "job"]})
+    assert response.status_code == 400
+    assert response.json()["type"] == "invalid parameter value"
+
+
+def test_post_jobs_status_concurrency(
+    test_client_default: ogc_api_processes_fastapi.BaseClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    lock = threading.Lock()
+    calls = {"running": 0, "max": 0}
+
+    def get_job(
+        job_id: str = fastapi.Path(...),
+    ) -> models.StatusInfo:
+        with lock:
+            calls["running"] += 1
+            calls["max"] = max(calls["max"], calls["running"])
+        time.sleep(0.005)
+        with lock:
+            calls["running"] -= 1
+        return models.StatusInfo(
+            jobID=job_id, status=models.StatusCode.running, type=models.JobType.process
+        )
+
+    monkeypatch.setattr(test_client_default, "get_job", get_job)
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_default)
+    client = fastapi.testclient.TestClient(app)
+
+    job_ids = [f"job-{i}" for i in range(100)]
+    response = client.post("/jobs/status", json={"jobIDs": job_ids})
+    assert [job["jobID"] for job in response.json()["jobs"]] == job_ids
+    assert 1 < calls["max"] <= config.EndpointsConfig().job_status_concurrency
+
+
+def test_post_jobs_status_request(test_client_request: Any) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_request)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.post(
+        "/jobs/status",
+        json={"jobIDs": ["job-1", "job-2"]},
+        headers={"X-Message": "found"},
+    )
+    assert response.status_code == 200
+    jobs = response.json()["jobs"]
+    assert [(job["jobID"], job["message"]) for job in jobs] == [
+        ("job-1", "found"),
+        ("job-2", "found"),
+    ]
 
 
 def test_get_job(
@@ -166,6 +553,107 @@ def test_get_job(
     assert all([key in response.json() for key in exp_keys])
 
 
+def test_get_job_wait(test_client_watched: Any) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_watched)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs/1?wait=0.05")
+    assert response.status_code == 200
+    assert response.json()["status"] == "running"
+
+    update = models.StatusInfo(
+        jobID="1", status=models.StatusCode.successful, type=models.JobType.process
+    )
+    timer = threading.Timer(0.2, test_client_watched.broker.publish, args=(update,))
+    timer.start()
+    response = client.get("/jobs/1?wait=30")
+    timer.join()
+    assert response.status_code == 200
+    assert response.json()["status"] == "successful"
+    assert [link["rel"] for link in response.json()["links"]] == ["self", "results"]
+
+    response = client.get("/jobs/1?wait=3600")
+    assert response.status_code == 422
+
+
+def test_get_job_wait_race(
+    test_client_watched: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # the job is finished before it is watched, and no update is published
+    statuses = ["successful", "running"]
+
+    def get_job(job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        status = statuses.pop() if len(statuses) > 1 else statuses[0]
+        return models.StatusInfo(
+            jobID=job_id,
+            status=models.StatusCode(status),
+            type=models.JobType.process,
+        )
+
+    monkeypatch.setattr(test_client_watched, "get_job", get_job)
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_watched)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs/1?wait=5")
+    assert response.status_code == 200
+    assert response.json()["status"] == "successful"
+
+
+def test_get_job_wait_unwatched(
+    test_client_watched: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # the job cannot be watched: its status is polled
+    statuses = ["successful", "running", "running"]
+
+    def get_job(job_id: str = fastapi.Path(...)) -> models.StatusInfo:
+        status = statuses.pop() if len(statuses) > 1 else statuses[0]
+        return models.StatusInfo(
+            jobID=job_id,
+            status=models.StatusCode(status),
+            type=models.JobType.process,
+        )
+
+    monkeypatch.setattr(test_client_watched, "get_job", get_job)
+    monkeypatch.setattr(test_client_watched, "watch_job", lambda job_id: None)
+    app = ogc_api_processes_fastapi.main.instantiate_app(
+        client=test_client_watched,
+        endpoints_config=config.EndpointsConfig(job_poll_interval=0.01),
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs/1?wait=5")
+    assert response.status_code == 200
+    assert response.json()["status"] == "successful"
+
+
+def test_get_job_events(test_client_progress: Any) -> None:
+    app = fastapi.FastAPI()
+    app.include_router(
+        ogc_api_processes_fastapi.instantiate_router(
+            test_client_progress, config.EndpointsConfig(job_poll_interval=0.01)
+        )
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs/job-1/events")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    messages = response.text.split("\n\n")
+    assert messages[-1] == ""
+    assert all(message.startswith("event: status\ndata: ") for message in messages[:-1])
+    statuses = [
+        json.loads(message.removeprefix("event: status\ndata: "))
+        for message in messages[:-1]
+    ]
+    assert [(status["status"], status["progress"]) for status in statuses] == [
+        ("running", 0),
+        ("running", 50),
+        ("successful", 100),
+    ]
+    assert statuses[-1]["links"][-1]["rel"] == "results"
+
+
 def test_get_job_results(
     test_client_default: ogc_api_processes_fastapi.BaseClient,
 ) -> None:
@@ -181,6 +669,159 @@ def test_get_job_results(
     assert body == exp_body
 
 
+@pytest.mark.parametrize("job_id", ["file", "iter", "aiter", "bytes"])
+def test_get_job_results_raw(test_client_raw_results: Any, job_id: str) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_raw_results)
+    client = fastapi.testclient.TestClient(app)
+    content = test_client_raw_results.content
+    size = len(content)
+
+    response = client.get(f"/jobs/{job_id}/results")
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["Content-Length"] == str(size)
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["Content-Type"] in (
+        "application/octet-stream",
+        "application/x-netcdf",
+    )
+
+    # range across chunks
+    response = client.get(
+        f"/jobs/{job_id}/results", headers={"Range": "bytes=990-2009"}
+    )
+    assert response.status_code == 206
+    assert response.content == content[990:2010]
+    assert response.headers["Content-Range"] == f"bytes 990-2009/{size}"
+    assert response.headers["Content-Length"] == "1020"
+
+    response = client.get(f"/jobs/{job_id}/results", headers={"Range": "bytes=-10"})
+    assert response.status_code == 206
+    assert response.content == content[-10:]
+
+    response = client.get(f"/jobs/{job_id}/results", headers={"Range": "bytes=10-"})
+    assert response.status_code == 206
+    assert response.content == content[10:]
+
+    response = client.get(
+        f"/jobs/{job_id}/results", headers={"Range": f"bytes={size}-"}
+    )
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{size}"
+
+    # ranges are ignored without validator to check
+    response = client.get(
+        f"/jobs/{job_id}/results",
+        headers={"Range": "bytes=0-9", "If-Range": '"etag"'},
+    )
+    assert response.status_code == 200
+    assert response.content == content
+
+
+def test_get_job_results_raw_unsized(test_client_raw_results: Any) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_raw_results)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs/unsized/results", headers={"Range": "bytes=0-9"})
+    assert response.status_code == 200
+    assert response.content == test_client_raw_results.content
+    assert "Accept-Ranges" not in response.headers
+
+    response = client.get("/jobs/job-1/results")
+    assert response.json() == {"result": "https://example.org/job-1-results.nc"}
+
+    schema = app.openapi()["paths"]["/jobs/{job_id}/results"]["get"]["responses"]
+    assert "application/octet-stream" in schema["200"]["content"]
+
+
+@pytest.mark.parametrize("job_id", ["missing", "missing-file-result"])
+def test_get_job_results_missing_file(
+    test_client_raw_results: Any, job_id: str
+) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_raw_results)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get(f"/jobs/{job_id}/results")
+    assert response.status_code == 404
+    assert response.json()["type"] == "results not found"
+
+
+def test_get_job_results_file(test_client_raw_results: Any) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_raw_results)
+    client = fastapi.testclient.TestClient(app)
+    content = test_client_raw_results.content
+
+    response = client.get("/jobs/file-result/results")
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["Content-Type"] == "application/x-netcdf"
+    assert response.headers["Content-Length"] == str(len(content))
+    assert "data.nc" in response.headers["Content-Disposition"]
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    response = client.get("/jobs/file-result/results", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(
+        "/jobs/file-result/results", headers={"If-None-Match": '"other"'}
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        "/jobs/file-result/results", headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+    response = client.get(
+        "/jobs/file-result/results",
+        headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        "/jobs/file-result/results",
+        headers={"Range": "bytes=10-19", "If-Range": etag},
+    )
+    assert response.status_code == 206
+    assert response.content == content[10:20]
+
+    # the file changed since the client got it
+    response = client.get(
+        "/jobs/file-result/results",
+        headers={"Range": "bytes=10-19", "If-Range": '"other"'},
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "range_header,expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=5-", (5, 99)),
+        ("bytes=-5", (95, 99)),
+        ("bytes=90-200", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=9-0", None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-9", None),
+        ("bytes=a-b", None),
+        ("bytes=-", None),
+    ],
+)
+def test_parse_byte_range(range_header: str, expected: Any) -> None:
+    assert responses.parse_byte_range(range_header, 100) == expected
+
+
+def test_parse_byte_range_not_satisfiable() -> None:
+    with pytest.raises(responses.RangeNotSatisfiable):
+        responses.parse_byte_range("bytes=100-", 100)
+    with pytest.raises(responses.RangeNotSatisfiable):
+        responses.parse_byte_range("bytes=-0", 100)
+
+
 def test_delete_job(
     test_client_default: ogc_api_processes_fastapi.BaseClient,
 ) -> None:
@@ -192,3 +833,63 @@ def test_delete_job(
 
     exp_keys = ("jobID", "status", "type")
     assert all([key in response.json() for key in exp_keys])
+
+
+def test_async_client(
+    test_client_async: ogc_api_processes_fastapi.AsyncBaseClient,
+) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_async)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/processes?limit=2")
+    assert response.status_code == 200
+    assert [process["id"] for process in response.json()["processes"]] == [
+        "dataset-0",
+        "dataset-1",
+    ]
+
+    response = client.post("/processes/dataset-1/execution", json={})
+    assert response.status_code == 201
+    assert response.headers["Location"] == "http://testserver/jobs/1"
+
+    response = client.get("/jobs/job-1")
+    assert response.status_code == 200
+    assert response.json()["links"][0]["href"] == "http://testserver/jobs/1"
+
+    response = client.get("/jobs/job-1/results")
+    assert response.status_code == 200
+    assert response.json() == {"result": "https://example.org/job-1-results.nc"}
+
+
+@pytest.mark.parametrize(
+    "method,path",
+    [
+        ("GET", "/"),
+        ("GET", "/conformance"),
+        ("GET", "/processes"),
+        ("GET", "/processes/dataset-1"),
+        ("POST", "/processes/dataset-1/execution"),
+        ("GET", "/jobs"),
+        ("GET", "/jobs/job-1"),
+        ("GET", "/jobs/job-1/results"),
+        ("DELETE", "/jobs/job-1"),
+    ],
+)
+def test_trust_client_models(
+    test_client_default: ogc_api_processes_fastapi.BaseClient,
+    method: str,
+    path: str,
+) -> None:
+    app = ogc_api_processes_fastapi.main.instantiate_app(client=test_client_default)
+    trusted_app = ogc_api_processes_fastapi.main.instantiate_app(
+        client=test_client_default, trust_client_models=True
+    )
+    client = fastapi.testclient.TestClient(app)
+    trusted_client = fastapi.testclient.TestClient(trusted_app)
+
+    response = client.request(method, path, json={})
+    trusted_response = trusted_client.request(method, path, json={})
+    assert trusted_response.status_code == response.status_code
+    assert trusted_response.json() == response.json()
+    assert trusted_response.headers.get("Location") == response.headers.get("Location")
+    assert trusted_app.openapi() == app.openapi()
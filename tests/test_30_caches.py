@@ -0,0 +1,184 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import time
+from typing import Any
+
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import caches, models
+
+
+def test_lru_cache() -> None:
+    cache: caches.LRUCache[str, int] = caches.LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    cache.invalidate(lambda key: key == "a")
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        caches.LRUCache(maxsize=0)
+
+
+def test_lru_cache_ttl() -> None:
+    cache: caches.LRUCache[str, int] = caches.LRUCache(ttl=0.01)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_process_description_cache() -> None:
+    cache = caches.ProcessDescriptionCache()
+    cached = cache.set("process", "http://testserver/", "1", b"{}")
+    assert cached.etag == caches.compute_etag(b"{}")
+    assert cached.etag.startswith('"')
+
+    assert cache.get("process", "http://testserver/", "1") == cached
+    assert cache.get("process", "http://testserver/", "2") is None
+    assert cache.get("process", "http://example.org/", "1") is None
+
+    cache.set("other-process", "http://testserver/", "1", b"{}")
+    cache.invalidate("process")
+    assert cache.get("process", "http://testserver/", "1") is None
+    assert len(cache) == 1
+
+
+def test_execution_cache() -> None:
+    cache = caches.ExecutionCache(maxsize=2, max_jobs=3)
+    assert cache.get("process", "1.0", "hash") == ()
+
+    cache.add("process", "1.0", "hash", "job-1")
+    assert cache.get("process", "1.0", "hash") == ("job-1",)
+    assert cache.get("process", "2.0", "hash") == ()
+    assert cache.get("process", "1.0", "hash", tenant_id="a") == ()
+
+    cache.add("process", "1.0", "hash", "job-2")
+    cache.set_successful("process", "1.0", "hash", "job-2")
+    assert cache.get("process", "1.0", "hash") == ("job-2", "job-1")
+    # the oldest submitted jobs are removed first, not the successful one
+    cache.add("process", "1.0", "hash", "job-3")
+    cache.add("process", "1.0", "hash", "job-4")
+    assert cache.get("process", "1.0", "hash") == ("job-2", "job-3", "job-4")
+    cache.discard("process", "1.0", "hash", "job-3")
+    assert cache.get("process", "1.0", "hash") == ("job-2", "job-4")
+
+    cache.add("process", "1.0", "hash-2", "job-2")
+    cache.add("process", "1.0", "hash-3", "job-3")
+    assert len(cache) == 2
+    assert cache.get("process", "1.0", "hash") == ()
+
+    cache.record(hit=True)
+    cache.record(hit=False)
+    cache.record(hit=False)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.invalidate("process")
+    assert len(cache) == 0
+
+
+def test_post_process_execution_memoized(test_client_submissions: Any) -> None:
+    execution_cache = caches.ExecutionCache()
+    app = ogc_api_processes_fastapi.instantiate_app(
+        test_client_submissions, execution_cache=execution_cache
+    )
+    client = fastapi.testclient.TestClient(app)
+    url = "/processes/dataset-1/execution"
+
+    response = client.post(url, json={"inputs": {"a": 1}})
+    assert response.json()["jobID"] == "job-1"
+    # the job is not successful yet, its results can't be reused
+    response = client.post(url, json={"inputs": {"a": 1}})
+    assert response.json()["jobID"] == "job-2"
+    assert (execution_cache.hits, execution_cache.misses) == (0, 2)
+
+    test_client_submissions.jobs["job-2"] = test_client_submissions.jobs[
+        "job-2"
+    ].model_copy(update={"status": models.StatusCode.successful})
+    response = client.post(url, json={"inputs": {"a": 1}})
+    assert response.status_code == 201
+    assert response.headers["Location"] == "http://testserver/jobs/job-2"
+    assert response.json()["status"] == "successful"
+    assert response.json()["links"][-1] == {
+        "href": "http://testserver/jobs/job-2/results",
+        "rel": "results",
+    }
+    assert test_client_submissions.submissions == 2
+    assert (execution_cache.hits, execution_cache.misses) == (1, 2)
+
+    # other inputs or process
+    client.post(url, json={"inputs": {"a": 2}})
+    client.post("/processes/dataset-2/execution", json={"inputs": {"a": 1}})
+    assert test_client_submissions.submissions == 4
+
+    # results of dismissed jobs are not reused
+    del test_client_submissions.jobs["job-2"]
+    response = client.post(url, json={"inputs": {"a": 1}})
+    assert response.json()["jobID"] == "job-5"
+
+
+def test_post_process_execution_memoized_pending(test_client_submissions: Any) -> None:
+    execution_cache = caches.ExecutionCache()
+    app = ogc_api_processes_fastapi.instantiate_app(
+        test_client_submissions, execution_cache=execution_cache
+    )
+    client = fastapi.testclient.TestClient(app)
+    url = "/processes/dataset-1/execution"
+
+    def set_status(job_id: str, status: models.StatusCode) -> None:
+        jobs = test_client_submissions.jobs
+        jobs[job_id] = jobs[job_id].model_copy(update={"status": status})
+
+    client.post(url, json={"inputs": {"a": 1}})
+    client.post(url, json={"inputs": {"a": 1}})
+    # the first job succeeds after the second one was submitted
+    set_status("job-1", models.StatusCode.successful)
+    set_status("job-2", models.StatusCode.failed)
+    response = client.post(url, json={"inputs": {"a": 1}})
+    assert response.json()["jobID"] == "job-1"
+    assert test_client_submissions.submissions == 2
+    assert (execution_cache.hits, execution_cache.misses) == (1, 2)
+
+
+def test_post_process_execution_memoized_request(test_client_request: Any) -> None:
+    execution_cache = caches.ExecutionCache()
+    app = ogc_api_processes_fastapi.instantiate_app(
+        test_client_request, execution_cache=execution_cache
+    )
+    client = fastapi.testclient.TestClient(app)
+    url = "/processes/dataset-1/execution"
+
+    response = client.post(url, json={"inputs": {"a": 1}}, headers={"X-Job-ID": "1"})
+    assert response.json()["jobID"] == "1"
+    response = client.post(
+        url, json={"inputs": {"a": 1}}, headers={"X-Job-ID": "2", "X-Message": "reused"}
+    )
+    assert response.status_code == 201
+    assert (response.json()["jobID"], response.json()["message"]) == ("1", "reused")
+    assert (execution_cache.hits, execution_cache.misses) == (1, 1)
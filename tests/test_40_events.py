@@ -0,0 +1,84 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import asyncio
+import threading
+from typing import Any, List
+
+from ogc_api_processes_fastapi import events, models
+
+
+def status_info(status: str, progress: int) -> models.StatusInfo:
+    return models.StatusInfo(
+        jobID="job-1",
+        status=models.StatusCode(status),
+        type=models.JobType.process,
+        progress=progress,
+    )
+
+
+def test_job_status_broker() -> None:
+    broker = events.JobStatusBroker()
+
+    async def watch() -> List[models.StatusInfo]:
+        subscription = broker.subscribe("job-1")
+        broker.publish(status_info("running", 10).model_copy(update={"jobID": "job-2"}))
+        broker.publish(status_info("running", 10))
+        updates = [await anext(subscription)]
+
+        def publish() -> None:
+            broker.publish(status_info("running", 20))
+            broker.publish(status_info("successful", 100))
+
+        # updates published from other threads, coalesced while not consumed
+        thread = threading.Thread(target=publish)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.01)
+        updates += [update async for update in subscription]
+        return updates
+
+    updates = asyncio.run(watch())
+    assert [(update.status.value, update.progress) for update in updates] == [
+        ("running", 10),
+        ("successful", 100),
+    ]
+    assert broker._subscriptions == {}
+
+
+def test_status_changed() -> None:
+    job = status_info("running", 10)
+    assert not events.status_changed(
+        job, job.model_copy(update={"links": [models.Link(href="http://test")]})
+    )
+    assert events.status_changed(job, status_info("running", 20))
+
+
+def test_wait_for_job(test_client_progress: Any, test_client_waited: Any) -> None:
+    job = status_info("accepted", 0)
+
+    last_job = asyncio.run(events.wait_for_job(test_client_progress, job, 5, 0.01))
+    assert last_job.status == models.StatusCode.successful
+
+    test_client_progress.progress = 0
+    last_job = asyncio.run(events.wait_for_job(test_client_progress, job, 0.01, 1))
+    assert last_job.status == models.StatusCode.running
+
+    last_job = asyncio.run(events.wait_for_job(test_client_waited, job, 5, 1))
+    assert last_job.status == models.StatusCode.successful
+
+    # the client cannot wait for the job: its status is polled
+    job = job.model_copy(update={"jobID": "unwaited"})
+    last_job = asyncio.run(events.wait_for_job(test_client_waited, job, 0.05, 0.01))
+    assert last_job.status == models.StatusCode.running
@@ -0,0 +1,156 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+from typing import Dict, List, Tuple
+
+import fastapi
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import clients, metrics
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    timings = {}
+    for metric in header.split(", "):
+        phase, duration = metric.split(";dur=")
+        timings[phase] = float(duration)
+    return timings
+
+
+class ListSink(metrics.MetricsSink):
+    def __init__(self) -> None:
+        self.observed: List[Tuple[str, Dict[str, float]]] = []
+
+    def observe(self, route_name: str, durations: Dict[str, float]) -> None:
+        self.observed.append((route_name, durations))
+
+    def render_prometheus(self) -> str:
+        return f"# {len(self.observed)} requests observed\n"
+
+
+def test_histogram_sink() -> None:
+    sink = metrics.HistogramSink(buckets=(0.1, 1.0))
+    sink.observe("GetJobs", {"client": 0.05, "total": 0.5})
+    sink.observe("GetJobs", {"client": 2.0, "total": 3.0})
+
+    histogram = sink.get("GetJobs", "client")
+    assert histogram is not None
+    assert histogram.counts == [1, 0, 1]
+    assert histogram.count == 2
+    assert histogram.sum == pytest.approx(2.05)
+    assert sink.get("GetJobs", "links") is None
+
+    exposition = sink.render_prometheus()
+    name = "ogc_api_processes_request_phase_seconds"
+    assert f"# TYPE {name} histogram" in exposition
+    labels = 'route="GetJobs",phase="client"'
+    assert f'{name}_bucket{{{labels},le="0.1"}} 1' in exposition
+    assert f'{name}_bucket{{{labels},le="1.0"}} 1' in exposition
+    assert f'{name}_bucket{{{labels},le="+Inf"}} 2' in exposition
+    assert f"{name}_count{{{labels}}} 2" in exposition
+
+
+def test_instrumentation(test_client_default: clients.BaseClient) -> None:
+    instrumentation = metrics.Instrumentation()
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_default, instrumentation=instrumentation
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs")
+    assert response.status_code == 200
+    timings = parse_server_timing(response.headers["Server-Timing"])
+    assert set(timings) == {"client", "links", "validation", "encoding", "total"}
+    assert timings["total"] >= timings["client"]
+
+    assert isinstance(instrumentation.sink, metrics.HistogramSink)
+    histogram = instrumentation.sink.get("GetJobs", "total")
+    assert histogram is not None and histogram.count == 1
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert 'route="GetJobs",phase="client"' in response.text
+    assert "/metrics" not in app.openapi()["paths"]
+
+
+def test_instrumentation_sink(test_client_jobs: clients.BaseClient) -> None:
+    sink = ListSink()
+    instrumentation = metrics.Instrumentation(
+        sink=sink, server_timing=False, metrics_path="/sink"
+    )
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_jobs, instrumentation=instrumentation
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.post("/jobs/status", json={"jobIDs": ["job-1", "job-2"]})
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+    [(route_name, durations)] = sink.observed
+    assert route_name == "PostJobsStatus"
+    assert {"client", "links", "total"} <= set(durations)
+    # concurrent client calls are counted once
+    assert durations["client"] <= durations["total"]
+
+    response = client.get("/sink")
+    assert response.status_code == 200
+    assert response.text == "# 1 requests observed\n"
+    assert client.get("/metrics").status_code == 404
+
+
+def test_instrumentation_async(test_client_async: clients.AsyncBaseClient) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_async, instrumentation=metrics.Instrumentation()
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/processes")
+    assert response.status_code == 200
+    timings = parse_server_timing(response.headers["Server-Timing"])
+    assert "client" in timings
+
+
+@pytest.mark.parametrize(
+    "method,path",
+    [
+        ("GET", "/"),
+        ("GET", "/conformance"),
+        ("GET", "/processes"),
+        ("GET", "/processes/dataset-1"),
+        ("POST", "/processes/dataset-1/execution"),
+        ("GET", "/jobs"),
+        ("GET", "/jobs/job-1"),
+        ("GET", "/jobs/job-1/results"),
+        ("DELETE", "/jobs/job-1"),
+    ],
+)
+def test_instrumentation_responses(
+    test_client_default: clients.BaseClient, method: str, path: str
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_default)
+    instrumented_app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_default, instrumentation=metrics.Instrumentation()
+    )
+    client = fastapi.testclient.TestClient(app)
+    instrumented_client = fastapi.testclient.TestClient(instrumented_app)
+
+    response = client.request(method, path, json={})
+    instrumented_response = instrumented_client.request(method, path, json={})
+    assert instrumented_response.status_code == response.status_code
+    assert instrumented_response.json() == response.json()
+    assert "Server-Timing" in instrumented_response.headers
+    assert instrumented_app.openapi() == app.openapi()
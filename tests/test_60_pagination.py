@@ -0,0 +1,111 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import datetime
+from typing import Any, List, Optional
+
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import endpoints, exceptions, models, pagination
+
+
+def test_cursor() -> None:
+    created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    job = models.StatusInfo(
+        jobID="job-1",
+        status=models.StatusCode.running,
+        type=models.JobType.process,
+        created=created,
+    )
+    cursor = pagination.encode_job_cursor(job, "prev", secret=b"secret")
+    assert "job-1" not in cursor
+
+    res = pagination.decode_job_cursor(cursor, secret=b"secret")
+    assert res == pagination.JobCursor(
+        created=created, job_id="job-1", direction="prev"
+    )
+
+    with pytest.raises(exceptions.InvalidCursor):
+        pagination.decode_job_cursor(cursor, secret=b"other secret")
+    with pytest.raises(exceptions.InvalidCursor):
+        pagination.decode_job_cursor("A" + cursor[1:], secret=b"secret")
+    with pytest.raises(exceptions.InvalidCursor):
+        pagination.decode_job_cursor("not a cursor", secret=b"secret")
+    with pytest.raises(exceptions.InvalidCursor):
+        pagination.decode_job_cursor(pagination.encode_cursor(["job-1"]))
+    with pytest.raises(ValueError):
+        pagination.encode_job_cursor(job, "previous")
+
+
+def test_create_pagination_links_query() -> None:
+    request_url = "http://localhost/jobs?status=running&cursor=old&limit=2"
+    pagination_qs = models.PaginationQueryParameters(
+        next={"cursor": "next cursor"}, prev={"cursor": "prev"}
+    )
+    pagination_links = endpoints.create_pagination_links(request_url, pagination_qs)
+    exp_links = [
+        models.Link(
+            href="http://localhost/jobs?status=running&limit=2&cursor=next+cursor",
+            rel="next",
+        ),
+        models.Link(
+            href="http://localhost/jobs?status=running&limit=2&cursor=prev", rel="prev"
+        ),
+    ]
+    assert pagination_links == exp_links
+
+
+def get_page_link(page: models.JobList, rel: str) -> Optional[str]:
+    for link in page.links or []:
+        if link.rel == rel:
+            return link.href
+    return None
+
+
+def test_get_jobs_pagination(
+    test_client_paginated: Any,
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_paginated)
+    client = fastapi.testclient.TestClient(app)
+
+    pages: List[models.JobList] = []
+    url: Optional[str] = "/jobs?limit=3"
+    while url is not None:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append(models.JobList.model_validate(response.json()))
+        url = get_page_link(pages[-1], "next")
+    job_ids = [job.jobID for page in pages for job in page.jobs]
+    assert job_ids == [job.jobID for job in test_client_paginated.jobs]
+    assert get_page_link(pages[0], "prev") is None
+    assert [len(page.jobs) for page in pages] == [3, 3, 1]
+
+    # back to the first page
+    url = get_page_link(pages[-1], "prev")
+    assert url is not None and "limit=3" in url
+    response = client.get(url)
+    previous = models.JobList.model_validate(response.json())
+    assert previous.jobs == pages[1].jobs
+    url = get_page_link(previous, "prev")
+    assert url is not None
+    response = client.get(url)
+    first = models.JobList.model_validate(response.json())
+    assert first.jobs == pages[0].jobs
+    assert get_page_link(first, "prev") is None
+
+    response = client.get("/jobs", params={"cursor": "tampered"})
+    assert response.status_code == 400
+    assert response.json()["type"] == "invalid cursor"
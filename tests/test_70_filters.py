@@ -0,0 +1,184 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import datetime
+from typing import Any, Dict, List
+
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import exceptions, filters, models
+
+UTC = datetime.timezone.utc
+
+
+@pytest.mark.parametrize(
+    "value,start,end",
+    [
+        (
+            "2024-01-01T00:00:00Z",
+            datetime.datetime(2024, 1, 1, tzinfo=UTC),
+            datetime.datetime(2024, 1, 1, tzinfo=UTC),
+        ),
+        (
+            "2024-01-01T00:00:00Z/2024-01-02T00:00:00Z",
+            datetime.datetime(2024, 1, 1, tzinfo=UTC),
+            datetime.datetime(2024, 1, 2, tzinfo=UTC),
+        ),
+        ("../2024-01-02T00:00:00Z", None, datetime.datetime(2024, 1, 2, tzinfo=UTC)),
+        ("2024-01-01T00:00:00Z/", datetime.datetime(2024, 1, 1, tzinfo=UTC), None),
+        # naive instants are UTC
+        ("2024-01-01T00:00:00/..", datetime.datetime(2024, 1, 1, tzinfo=UTC), None),
+    ],
+)
+def test_parse_datetime_interval(
+    value: str, start: datetime.datetime, end: datetime.datetime
+) -> None:
+    res = filters.parse_datetime_interval(value)
+    assert res == filters.DatetimeInterval(start=start, end=end)
+
+
+@pytest.mark.parametrize(
+    "value", ["yesterday", "2024-01-02T00:00:00Z/2024-01-01T00:00:00Z"]
+)
+def test_parse_datetime_interval_invalid(value: str) -> None:
+    with pytest.raises(exceptions.InvalidParameterValue):
+        filters.parse_datetime_interval(value)
+
+
+def test_job_filter_matches() -> None:
+    created = datetime.datetime(2024, 1, 1, tzinfo=UTC)
+    job = models.StatusInfo(
+        jobID="job-1",
+        processID="dataset-1",
+        status=models.StatusCode.running,
+        type=models.JobType.process,
+        created=created,
+        started=created,
+    )
+    now = created + datetime.timedelta(minutes=10)
+    minute = datetime.timedelta(minutes=1)
+
+    assert filters.JobFilter().matches(job)
+    assert filters.JobFilter(process_ids=["dataset-1"]).matches(job)
+    assert not filters.JobFilter(process_ids=["dataset-2"]).matches(job)
+    assert not filters.JobFilter(status=[models.StatusCode.failed]).matches(job)
+    assert filters.JobFilter(types=[models.JobType.process]).matches(job)
+    interval = filters.DatetimeInterval(end=created - minute)
+    assert not filters.JobFilter(created=interval).matches(job)
+    # running jobs last until now
+    assert filters.JobFilter(min_duration=5 * minute).matches(job, now=now)
+    assert not filters.JobFilter(max_duration=5 * minute).matches(job, now=now)
+    # naive instants are UTC
+    interval = filters.DatetimeInterval(start=created)
+    job.created = created.replace(tzinfo=None)
+    assert filters.JobFilter(created=interval).matches(job)
+    job.started = None
+    assert not filters.JobFilter(min_duration=minute).matches(job, now=now)
+
+
+@pytest.mark.parametrize(
+    "params,exp_job_ids",
+    [
+        ({}, ["job-0", "job-1", "job-2", "job-3", "job-4", "job-5", "job-6"]),
+        ({"processID": "dataset-1"}, ["job-1", "job-3", "job-5"]),
+        ({"minDuration": 180, "maxDuration": 300}, ["job-3", "job-4", "job-5"]),
+        ({"datetime": "2023-12-31T23:59:59Z/.."}, ["job-0", "job-1", "job-2", "job-3"]),
+        ({"datetime": "2023-12-31T23:59:59/.."}, ["job-0", "job-1", "job-2", "job-3"]),
+        ({"type": "process", "status": "running"}, []),
+    ],
+)
+def test_get_jobs_filters(
+    test_client_filtered: Any, params: Dict[str, Any], exp_job_ids: List[str]
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_filtered)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs", params=params)
+    assert response.status_code == 200
+    job_list = response.json()
+    assert sorted(job["jobID"] for job in job_list["jobs"]) == exp_job_ids
+    assert job_list["numberMatched"] == len(exp_job_ids)
+
+    response = client.get("/jobs", params={**params, "limit": 1})
+    assert len(response.json()["jobs"]) == min(1, len(exp_job_ids))
+    assert response.json()["numberMatched"] == len(exp_job_ids)
+
+
+def test_get_jobs_filters_invalid(test_client_filtered: Any) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_filtered)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs", params={"datetime": "yesterday"})
+    assert response.status_code == 400
+    assert response.json()["type"] == "invalid parameter value"
+
+    response = client.get("/jobs", params={"minDuration": 2, "maxDuration": 1})
+    assert response.status_code == 400
+
+    parameters = app.openapi()["paths"]["/jobs"]["get"]["parameters"]
+    assert {"processID", "status", "type", "datetime", "minDuration"} <= {
+        parameter["name"] for parameter in parameters
+    }
+
+
+def test_get_jobs_fields(test_client_filtered: Any) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_filtered)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs", params={"fields": "jobID,status,progress"})
+    assert response.status_code == 200
+    assert test_client_filtered.fields == {"jobID", "status", "type", "progress"}
+    job_list = response.json()
+    assert job_list["jobs"][0] == {
+        "jobID": test_client_filtered.jobs[0].jobID,
+        "status": "successful",
+        "type": "process",
+    }
+    assert job_list["numberMatched"] == 7
+    assert job_list["links"][0]["rel"] == "self"
+
+    response = client.get("/jobs", params={"fields": "created,links"})
+    job = response.json()["jobs"][0]
+    assert set(job) == {"jobID", "status", "type", "created", "links"}
+    assert job["links"][0]["href"] == f"http://testserver/jobs/{job['jobID']}"
+
+    response = client.get("/jobs")
+    assert test_client_filtered.fields is None
+    assert "finished" in response.json()["jobs"][0]
+
+
+def test_get_job_fields(test_client_default: Any) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_default)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs/1", params={"fields": "status"})
+    assert response.status_code == 200
+    assert response.json() == {"jobID": "1", "status": "running", "type": "process"}
+
+    response = client.get("/jobs/1", params={"fields": "links"})
+    assert response.json()["links"][0]["rel"] == "self"
+
+
+def test_get_jobs_streaming_fields(test_client_streaming: Any) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(client=test_client_streaming)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs", params={"limit": 2, "fields": "jobID"})
+    assert response.status_code == 200
+    assert response.json()["jobs"] == [
+        {"jobID": "job-0", "status": "running", "type": "process"},
+        {"jobID": "job-1", "status": "successful", "type": "process"},
+    ]
@@ -0,0 +1,163 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import gzip
+from typing import Any, List, Optional
+
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import caches, compression
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,encodings,exp_encoding",
+    [
+        ("gzip, deflate", ["br", "gzip"], "gzip"),
+        ("gzip, br", ["br", "gzip"], "br"),
+        ("gzip;q=1.0, br;q=0.5", ["br", "gzip"], "gzip"),
+        ("br;q=0, *", ["br", "gzip"], "gzip"),
+        ("identity", ["gzip"], None),
+        ("gzip;q=0", ["gzip"], None),
+        ("GZIP;q=invalid, *;q=0.1", ["br", "gzip"], "br"),
+    ],
+)
+def test_negotiate_encoding(
+    accept_encoding: str, encodings: List[str], exp_encoding: Optional[str]
+) -> None:
+    res = compression.negotiate_encoding(accept_encoding, tuple(encodings))
+    assert res == exp_encoding
+
+
+def test_variant_etag() -> None:
+    assert compression.variant_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert compression.variant_etag('W/"abc"', "br") == 'W/"abc-br"'
+
+
+def test_compression_unavailable() -> None:
+    with pytest.raises(ValueError):
+        compression.Compression(encodings=["deflate"])
+
+
+def test_compressed_responses(
+    test_client_default: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    compression_ = compression.Compression(minimum_size=500, encodings=["gzip"])
+    compressed: List[bytes] = []
+
+    def compress(body: bytes, encoding: str) -> bytes:
+        compressed.append(body)
+        return gzip.compress(body)
+
+    monkeypatch.setattr(compression_, "compress", compress)
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_default, compression=compression_
+    )
+    client = fastapi.testclient.TestClient(app)
+    exp_body = fastapi.testclient.TestClient(
+        ogc_api_processes_fastapi.instantiate_app(client=test_client_default)
+    ).get("/processes")
+
+    response = client.get("/processes", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.json() == exp_body.json()
+
+    response = client.get("/processes", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.content == exp_body.content
+
+    # unchanged lists are compressed once
+    response = client.get("/processes", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(compressed) == 1
+    assert response.headers["ETag"].endswith('-gzip"')
+    response = client.get(
+        "/processes",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]},
+    )
+    assert response.status_code == 304
+
+    # smaller than the minimum size
+    response = client.get("/jobs", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_compressed_cached_responses(test_client_versioned: Any) -> None:
+    process_cache = caches.ProcessDescriptionCache()
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_versioned,
+        process_cache=process_cache,
+        compression=compression.Compression(minimum_size=100, encodings=["gzip"]),
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/processes/dataset-1", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    etag = response.headers["ETag"]
+    assert etag.endswith('-gzip"')
+
+    response = client.get("/processes/dataset-1", headers={"Accept-Encoding": "br"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] != etag
+
+    cached = process_cache.get("dataset-1", "http://testserver/", "1")
+    assert cached is not None
+    assert gzip.decompress(cached.compressed["gzip"]) == cached.body
+    # compressed once
+    cached.compressed["gzip"] = gzip.compress(b'{"compressed": "once"}')
+    response = client.get("/processes/dataset-1", headers={"Accept-Encoding": "gzip"})
+    assert response.json() == {"compressed": "once"}
+
+    response = client.get(
+        "/processes/dataset-1",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in response.headers
+
+    # not compressed twice by the middleware
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.json()["links"]
+
+
+def test_compressed_streaming_responses(test_client_streaming: Any) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(
+        client=test_client_streaming,
+        compression=compression.Compression(encodings=["gzip"]),
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/jobs?limit=5000", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert len(response.json()["jobs"]) == 5000
+
+
+@pytest.mark.parametrize("encoding,module", [("br", "brotli"), ("zstd", "zstandard")])
+def test_compression_optional_encodings(encoding: str, module: str) -> None:
+    pytest.importorskip(module)
+    body = b'{"jobs": []}' * 1000
+    compressor = compression.Compression(encodings=[encoding])
+    compressed = compressor.compress(body, encoding)
+    assert len(compressed) < len(body)
@@ -0,0 +1,144 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+from typing import Any
+
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import caches, clients, metrics, tenants
+
+
+def test_tenant_registry(test_client_paginated: Any, test_client_default: Any) -> None:
+    registry = tenants.TenantRegistry(type(test_client_paginated))
+    registry.add("a", test_client_paginated)
+    assert "a" in registry
+    assert len(registry) == 1
+
+    with pytest.raises(TypeError):
+        registry.add("b", test_client_default)
+    with pytest.raises(ValueError):
+        registry.add("a/b", test_client_paginated)
+
+    registry.remove("a")
+    assert registry.get("a") is None
+
+
+def test_dispatching_client(test_client_versioned: Any) -> None:
+    registry = tenants.TenantRegistry(type(test_client_versioned))
+    registry.add("a", test_client_versioned)
+    client = registry.dispatching_client()
+    assert isinstance(client, type(test_client_versioned))
+    assert clients.implements(client, "get_process_version")
+
+    with pytest.raises(ogc_api_processes_fastapi.exceptions.NoSuchTenant):
+        client.get_process_version("dataset-1")
+
+    token = tenants.current_tenant.set(registry.get("a"))
+    try:
+        client.get_process(process_id="dataset-1")
+    finally:
+        tenants.current_tenant.reset(token)
+    assert test_client_versioned.get_process_calls == 1
+
+
+def test_tenants_by_path(test_client_paginated: Any) -> None:
+    client_class = type(test_client_paginated)
+    registry = tenants.TenantRegistry(client_class)
+    app = ogc_api_processes_fastapi.instantiate_app(registry)
+    client = fastapi.testclient.TestClient(app)
+
+    # tenants added after the routes are created
+    registry.add("a", client_class(number=3))
+    registry.add("b", client_class(number=5))
+
+    response = client.get("/a/jobs")
+    assert response.status_code == 200
+    assert len(response.json()["jobs"]) == 3
+    assert response.json()["jobs"][0]["links"][0]["href"].startswith(
+        "http://testserver/a/jobs/"
+    )
+
+    response = client.get("/b/jobs", params={"limit": 2})
+    assert len(response.json()["jobs"]) == 2
+    [next_link] = [link for link in response.json()["links"] if link["rel"] == "next"]
+    assert next_link["href"].startswith("http://testserver/b/jobs?")
+    response = client.get(next_link["href"])
+    assert response.status_code == 200
+    assert len(response.json()["jobs"]) == 2
+
+    response = client.get("/a/")
+    assert response.json()["links"][0]["href"] == "http://testserver/a/openapi.json"
+
+    response = client.get("/c/jobs")
+    assert response.status_code == 404
+
+    response = client.get("/jobs")
+    assert response.status_code == 404
+    assert response.json()["type"] == "no such tenant"
+
+
+def test_tenants_by_header(test_client_versioned: Any) -> None:
+    client_class = type(test_client_versioned)
+    registry = tenants.TenantRegistry(client_class, header="X-Tenant")
+    process_cache = caches.ProcessDescriptionCache()
+    app = ogc_api_processes_fastapi.instantiate_app(
+        registry, process_cache=process_cache
+    )
+    client = fastapi.testclient.TestClient(app)
+    tenant_a, tenant_b = client_class(), client_class()
+    registry.add("a", tenant_a)
+    registry.add("b", tenant_b)
+
+    for tenant_id in ("a", "b", "a", "b"):
+        response = client.get("/processes/dataset-1", headers={"X-Tenant": tenant_id})
+        assert response.status_code == 200
+    # cached descriptions are not shared between tenants
+    assert tenant_a.get_process_calls == 1
+    assert tenant_b.get_process_calls == 1
+    assert len(process_cache) == 2
+
+    process_cache.invalidate(tenant_id="a")
+    assert len(process_cache) == 1
+
+    response = client.get("/processes/dataset-1", headers={"X-Tenant": "c"})
+    assert response.status_code == 404
+    assert response.json()["type"] == "no such tenant"
+
+    response = client.get("/conformance")
+    assert response.status_code == 404
+
+
+def test_tenants_metrics(test_client_paginated: Any) -> None:
+    client_class = type(test_client_paginated)
+    registry = tenants.TenantRegistry(client_class)
+    registry.add("a", client_class(number=3))
+    app = ogc_api_processes_fastapi.instantiate_app(
+        registry, instrumentation=metrics.Instrumentation()
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/a/jobs")
+    assert response.status_code == 200
+    assert "Server-Timing" in response.headers
+
+    # the metrics of all the tenants are exposed without a tenant
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'route="GetJobs",phase="client"' in response.text
+
+    response = client.get("/jobs")
+    assert response.status_code == 404
+    assert response.json()["type"] == "no such tenant"
@@ -0,0 +1,174 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import re
+from typing import Any, Dict
+
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import exceptions, models, validation
+
+PROCESS = models.ProcessDescription.model_validate(
+    {
+        "id": "process",
+        "version": "1.0",
+        "inputs": {
+            "name": {
+                "schema": {"type": "string", "minLength": 2, "pattern": "^[a-z]+$"}
+            },
+            "count": {
+                "schema": {"type": "integer", "minimum": 0, "exclusiveMinimum": True},
+                "minOccurs": 0,
+            },
+            "level": {"schema": {"enum": ["low", "high"]}, "minOccurs": 0},
+            "bbox-list": {
+                "schema": {
+                    "type": "array",
+                    "items": {"type": "number"},
+                    "minItems": 4,
+                    "maxItems": 4,
+                },
+                "minOccurs": 0,
+                "maxOccurs": 2,
+            },
+            "options": {
+                "schema": {
+                    "type": "object",
+                    "required": ["mode"],
+                    "properties": {
+                        "mode": {"type": "string"},
+                        "weights": {"type": "array", "uniqueItems": True},
+                    },
+                },
+                "minOccurs": 0,
+            },
+            "files": {
+                "schema": {"type": "string"},
+                "minOccurs": 2,
+                "maxOccurs": "unbounded",
+            },
+        },
+        "outputs": {"result": {"schema": {"type": "object"}}},
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "inputs",
+    [
+        {"name": "ab", "files": ["a", "b"]},
+        {
+            "name": "ab",
+            "count": 1,
+            "level": "low",
+            "bbox-list": [[0, 0, 1, 1.5], [1, 1, 2, 2]],
+            "options": {"mode": "fast", "weights": [1, 2], "other": None},
+            "files": [{"href": "https://example.org/a"}, {"value": "b"}],
+        },
+        {"name": "ab", "bbox-list": [0, 0, 1, 1], "files": ["a", "b", "c"]},
+        {"name": "ab", "count": 2.0, "files": ["a", "b"]},
+    ],
+)
+def test_execute_validator_valid(inputs: Dict[str, Any]) -> None:
+    validator = validation.ExecuteValidator(PROCESS)
+    validator.validate({"inputs": inputs, "outputs": {"result": {}}})
+
+
+@pytest.mark.parametrize(
+    "inputs,location",
+    [
+        ({"files": ["a", "b"]}, "inputs.name"),
+        ({"name": "a", "files": ["a", "b"]}, "inputs.name"),
+        ({"name": "AB", "files": ["a", "b"]}, "inputs.name"),
+        ({"name": 12, "files": ["a", "b"]}, "inputs.name"),
+        ({"name": "ab", "count": 0, "files": ["a", "b"]}, "inputs.count"),
+        ({"name": "ab", "count": "1", "files": ["a", "b"]}, "inputs.count"),
+        ({"name": "ab", "count": 1.5, "files": ["a", "b"]}, "inputs.count"),
+        ({"name": "ab", "level": "medium", "files": ["a", "b"]}, "inputs.level"),
+        ({"name": "ab", "bbox-list": [0, 0, 1], "files": ["a", "b"]}, "bbox-list"),
+        ({"name": "ab", "options": {"weights": []}, "files": ["a", "b"]}, "options"),
+        (
+            {
+                "name": "ab",
+                "options": {"mode": "a", "weights": [1, 1]},
+                "files": ["a", "b"],
+            },
+            "options",
+        ),
+        ({"name": "ab", "files": "a"}, "inputs.files"),
+        ({"name": "ab", "files": ["a"]}, "inputs.files"),
+        ({"name": "ab", "files": ["a", "b"], "unknown": 1}, "inputs.unknown"),
+    ],
+)
+def test_execute_validator_invalid(inputs: Dict[str, Any], location: str) -> None:
+    validator = validation.ExecuteValidator(PROCESS)
+    with pytest.raises(exceptions.InvalidInput) as excinfo:
+        validator.validate({"inputs": inputs})
+    assert excinfo.value.detail is not None
+    assert location in excinfo.value.detail
+
+
+def test_execute_validator_messages() -> None:
+    validator = validation.ExecuteValidator(PROCESS)
+    with pytest.raises(exceptions.InvalidInput) as excinfo:
+        validator.validate(
+            {
+                "inputs": {
+                    "name": "ab",
+                    "count": "x",
+                    "options": 1,
+                    "files": ["a", "b"],
+                }
+            }
+        )
+    detail = excinfo.value.detail
+    assert detail is not None
+    assert "inputs.count.value: Input should be a valid integer" in detail
+    assert "inputs.count.qualified value: Input should be a valid dictionary" in detail
+    assert "inputs.options.value: Input should be a valid dictionary;" in detail
+    assert re.search(r"Input\d|QualifiedValue|Link|int\b|union\[", detail) is None
+
+
+def test_execute_validator_request() -> None:
+    validator = validation.ExecuteValidator(PROCESS)
+    with pytest.raises(exceptions.InvalidInput, match="inputs"):
+        validator.validate({})
+    with pytest.raises(exceptions.InvalidInput, match="outputs.other"):
+        validator.validate(
+            {"inputs": {"name": "ab", "files": ["a", "b"]}, "outputs": {"other": {}}}
+        )
+
+    process = models.ProcessDescription(id="process", version="1.0")
+    validation.ExecuteValidator(process).validate({})
+
+
+def test_post_process_execution_validated(test_client_default: Any) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(
+        test_client_default, validate_execution=True
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.post(
+        "/processes/dataset-1/execution", json={"inputs": {"input-1": "value"}}
+    )
+    assert response.status_code == 201
+
+    response = client.post(
+        "/processes/dataset-1/execution", json={"inputs": {"input-1": 1}}
+    )
+    assert response.status_code == 400
+    assert response.json()["type"] == "invalid input"
+    assert "inputs.input-1" in response.json()["detail"]
@@ -0,0 +1,182 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import asyncio
+import pathlib
+import time
+from typing import Any, Optional
+
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import exceptions, idempotency
+
+
+def test_content_hash() -> None:
+    assert idempotency.content_hash({"a": 1, "b": [1, 2]}) == idempotency.content_hash(
+        {"b": [1, 2], "a": 1}
+    )
+    assert idempotency.content_hash({"a": 1}) != idempotency.content_hash({"a": 2})
+
+
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_idempotency_store(store_type: str, tmp_path: pathlib.Path) -> None:
+    store: idempotency.IdempotencyStore
+    if store_type == "memory":
+        store = idempotency.MemoryIdempotencyStore(ttl=0.05)
+    else:
+        store = idempotency.SQLiteIdempotencyStore(tmp_path / "store.db", ttl=0.05)
+    execution = idempotency.StoredExecution(
+        fingerprint="fingerprint", body=b"{}", location="http://localhost/jobs/1"
+    )
+    assert store.get("key") is None
+
+    store.set("key", execution)
+    assert store.get("key") == execution
+
+    time.sleep(0.1)
+    assert store.get("key") is None
+
+
+def test_sqlite_idempotency_store_persistent(tmp_path: pathlib.Path) -> None:
+    execution = idempotency.StoredExecution(
+        fingerprint="fingerprint", body=b"{}", location="http://localhost/jobs/1"
+    )
+    store = idempotency.SQLiteIdempotencyStore(tmp_path / "store.db")
+    store.set("key", execution)
+    store.close()
+
+    store = idempotency.SQLiteIdempotencyStore(tmp_path / "store.db")
+    assert store.get("key") == execution
+    assert len(store) == 1
+
+
+def test_idempotency_lookup_concurrent() -> None:
+    deduplication = idempotency.Idempotency()
+    execution = idempotency.StoredExecution(
+        fingerprint="fingerprint", body=b"{}", location="http://localhost/jobs/1"
+    )
+
+    async def submit() -> Any:
+        first = await deduplication.lookup("key", "fingerprint")
+        assert first is None
+        repeated = asyncio.create_task(deduplication.lookup("key", "fingerprint"))
+        await asyncio.sleep(0)
+        assert not repeated.done()
+        await deduplication.complete("key", execution)
+        return await repeated
+
+    assert asyncio.run(submit()) == execution
+
+    with pytest.raises(exceptions.IdempotencyKeyReused):
+        asyncio.run(deduplication.lookup("key", "other fingerprint"))
+
+
+def test_post_process_execution_idempotency_key(test_client_submissions: Any) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(
+        test_client_submissions, idempotency=idempotency.Idempotency()
+    )
+    client = fastapi.testclient.TestClient(app)
+    url = "/processes/dataset-1/execution"
+    execute = {"inputs": {"input-1": "value"}}
+
+    response = client.post(url, json=execute, headers={"Idempotency-Key": "a"})
+    assert response.status_code == 201
+    repeated = client.post(url, json=execute, headers={"Idempotency-Key": "a"})
+    assert repeated.status_code == 201
+    assert repeated.json() == response.json()
+    assert repeated.headers["Location"] == response.headers["Location"]
+    assert test_client_submissions.submissions == 1
+
+    # keys are scoped by process
+    response = client.post(
+        "/processes/dataset-2/execution", json=execute, headers={"Idempotency-Key": "a"}
+    )
+    assert response.json()["jobID"] == "job-2"
+
+    response = client.post(url, json={}, headers={"Idempotency-Key": "a"})
+    assert response.status_code == 422
+    assert response.json()["type"] == "idempotency key reused"
+
+    # without key nor content deduplication, jobs are always created
+    client.post(url, json=execute)
+    client.post(url, json=execute)
+    assert test_client_submissions.submissions == 4
+
+
+def test_post_process_execution_deduplicate_content(
+    test_client_submissions: Any,
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(
+        test_client_submissions,
+        idempotency=idempotency.Idempotency(deduplicate_content=True),
+    )
+    client = fastapi.testclient.TestClient(app)
+    url = "/processes/dataset-1/execution"
+
+    first = client.post(url, json={"inputs": {"a": 1, "b": 2}})
+    repeated = client.post(url, json={"inputs": {"b": 2, "a": 1}})
+    assert repeated.json()["jobID"] == first.json()["jobID"] == "job-1"
+
+    other = client.post(url, json={"inputs": {"a": 2}})
+    assert other.json()["jobID"] == "job-2"
+    assert test_client_submissions.submissions == 2
+
+
+def test_post_process_execution_idempotency_sqlite(
+    test_client_submissions: Any, tmp_path: pathlib.Path
+) -> None:
+    class Store(idempotency.SQLiteIdempotencyStore):
+        def get(self, key: str) -> Optional[idempotency.StoredExecution]:
+            # blocking stores are called in the threadpool
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            return super().get(key)
+
+        def set(self, key: str, execution: idempotency.StoredExecution) -> None:
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            super().set(key, execution)
+
+    app = ogc_api_processes_fastapi.instantiate_app(
+        test_client_submissions,
+        idempotency=idempotency.Idempotency(store=Store(tmp_path / "store.db")),
+    )
+    client = fastapi.testclient.TestClient(app)
+    url = "/processes/dataset-1/execution"
+
+    response = client.post(url, json={}, headers={"Idempotency-Key": "a"})
+    repeated = client.post(url, json={}, headers={"Idempotency-Key": "a"})
+    assert repeated.status_code == 201
+    assert repeated.content == response.content
+    assert test_client_submissions.submissions == 1
+
+
+def test_post_process_execution_idempotency_sync(
+    test_client_sync_execution: Any,
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(
+        test_client_sync_execution, idempotency=idempotency.Idempotency()
+    )
+    client = fastapi.testclient.TestClient(app)
+    headers = {"Idempotency-Key": "a", "Prefer": "wait=10"}
+
+    response = client.post("/processes/dataset-1/execution", json={}, headers=headers)
+    assert response.status_code == 200
+    # repeated submissions are answered with the status of the job
+    repeated = client.post("/processes/dataset-1/execution", json={}, headers=headers)
+    assert repeated.status_code == 201
+    assert repeated.json()["jobID"] == "1"
+    assert repeated.headers["Location"] == response.headers["Location"]
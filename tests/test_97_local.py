@@ -0,0 +1,300 @@
+# Copyright 2022, European Union.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+import datetime
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator
+
+import fastapi.testclient
+import pytest
+
+import ogc_api_processes_fastapi
+from ogc_api_processes_fastapi import filters, jobs, local, models, pagination
+
+ADD = models.ProcessDescription.model_validate(
+    {
+        "id": "add",
+        "version": "1.0",
+        "inputs": {"a": {"schema": {"type": "number"}}, "b": {"schema": {}}},
+        "outputs": {"sum": {"schema": {"type": "number"}}},
+    }
+)
+WAIT = models.ProcessDescription.model_validate(
+    {
+        "id": "wait",
+        "version": "1.0",
+        "outputs": {"a": {"schema": {}}, "b": {"schema": {}}},
+    }
+)
+
+
+def add(a: float, b: float) -> float:
+    if b < 0:
+        raise ValueError("b must be positive")
+    return a + b
+
+
+@pytest.fixture
+def release() -> Iterator[threading.Event]:
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def local_client(
+    request: pytest.FixtureRequest, release: threading.Event, tmp_path: pathlib.Path
+) -> Iterator[local.LocalJobClient]:
+    def wait(context: local.JobContext) -> Dict[str, Any]:
+        context.set_progress(10, "waiting")
+        while not release.wait(0.01):
+            context.set_progress(20)
+        return {"a": 1, "b": 2}
+
+    store: jobs.JobStore = jobs.MemoryJobStore()
+    if request.param == "sqlite":
+        store = jobs.SQLiteJobStore(tmp_path / "jobs.db", count_matched=True)
+    client = local.LocalJobClient(store=store, max_workers=1, max_queued=2)
+    client.register(ADD, add)
+    client.register(WAIT, wait)
+    yield client
+    client.shutdown()
+
+
+def wait_for_status(
+    client: fastapi.testclient.TestClient, job_id: str, status: str
+) -> Dict[str, Any]:
+    deadline = time.monotonic() + 5
+    while True:
+        job: Dict[str, Any] = client.get(f"/jobs/{job_id}").json()
+        if job["status"] == status or time.monotonic() > deadline:
+            return job
+        time.sleep(0.01)
+
+
+def make_job(job_id: str, process_id: str, status: str, minute: int) -> Any:
+    return models.StatusInfo(
+        jobID=job_id,
+        processID=process_id,
+        status=models.StatusCode(status),
+        type=models.JobType.process,
+        created=datetime.datetime(2024, 1, 1, 0, minute, tzinfo=datetime.timezone.utc),
+    )
+
+
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_job_store(store_type: str, tmp_path: pathlib.Path) -> None:
+    store: jobs.JobStore
+    if store_type == "memory":
+        store = jobs.MemoryJobStore()
+    else:
+        store = jobs.SQLiteJobStore(tmp_path / "jobs.db", count_matched=True)
+    store.add_many(
+        make_job(f"job-{i}", f"process-{i % 2}", "successful" if i % 3 else "failed", i)
+        for i in range(10)
+    )
+
+    page = store.query(filters.JobFilter(), limit=3)
+    assert [job.jobID for job in page.jobs] == ["job-9", "job-8", "job-7"]
+    assert (page.has_next, page.has_prev, page.number_matched) == (True, False, 10)
+
+    cursor = pagination.JobCursor(created=page.jobs[-1].created, job_id="job-7")
+    page = store.query(filters.JobFilter(), limit=3, cursor=cursor)
+    assert [job.jobID for job in page.jobs] == ["job-6", "job-5", "job-4"]
+    assert (page.has_next, page.has_prev) == (True, True)
+
+    cursor.direction = "prev"
+    page = store.query(filters.JobFilter(), limit=3, cursor=cursor)
+    assert [job.jobID for job in page.jobs] == ["job-9", "job-8"]
+    assert (page.has_next, page.has_prev) == (True, False)
+
+    job_filter = filters.JobFilter(
+        process_ids=["process-0"], status=[models.StatusCode.failed]
+    )
+    page = store.query(job_filter, limit=10)
+    assert [job.jobID for job in page.jobs] == ["job-6", "job-0"]
+
+    store.update("job-6", status=models.StatusCode.dismissed)
+    assert store.count(models.StatusCode.failed) == 3
+    page = store.query(job_filter, limit=10)
+    assert [job.jobID for job in page.jobs] == ["job-0"]
+
+    job_filter = filters.JobFilter(
+        created=filters.DatetimeInterval(
+            start=datetime.datetime(2024, 1, 1, 0, 2, tzinfo=datetime.timezone.utc),
+            end=datetime.datetime(2024, 1, 1, 0, 4, tzinfo=datetime.timezone.utc),
+        ),
+        status=[models.StatusCode.successful],
+    )
+    page = store.query(job_filter, limit=10)
+    assert [job.jobID for job in page.jobs] == ["job-4", "job-2"]
+
+    with pytest.raises(ogc_api_processes_fastapi.exceptions.NoSuchJob):
+        store.update("job-10", status=models.StatusCode.dismissed)
+
+    assert store.get_results("job-1") is None
+    store.set_results("job-1", {"result": [1, 2]})
+    assert store.get_results("job-1") == {"result": [1, 2]}
+    store.delete_results("job-1")
+    assert store.get_results("job-1") is None
+    store.close()
+
+
+def test_sqlite_job_store_progress(tmp_path: pathlib.Path) -> None:
+    store = jobs.SQLiteJobStore(tmp_path / "jobs.db", flush_interval=3600)
+    store.add(make_job("job-1", "process", "running", 0))
+
+    store.update("job-1", progress=50, message="halfway")
+    assert store.get("job-1") == store.query(filters.JobFilter(), 1).jobs[0]
+    job = store.get("job-1")
+    assert job is not None and job.progress == 50
+    # progress updates are batched
+    with sqlite3.connect(tmp_path / "jobs.db") as connection:
+        [(status_info,)] = connection.execute("SELECT status_info FROM jobs")
+    assert models.StatusInfo.model_validate_json(status_info).progress is None
+
+    store.update("job-1", status=models.StatusCode.successful)
+    store.close()
+
+    store = jobs.SQLiteJobStore(tmp_path / "jobs.db")
+    job = store.get("job-1")
+    assert job is not None
+    assert (job.status, job.progress, job.message) == ("successful", 50, "halfway")
+    store.close()
+
+
+def test_sqlite_job_store_indexes(tmp_path: pathlib.Path) -> None:
+    store = jobs.SQLiteJobStore(tmp_path / "jobs.db")
+    store.close()
+    with sqlite3.connect(tmp_path / "jobs.db") as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT job_id FROM jobs "
+            "WHERE process_id = ? AND status = ? ORDER BY created DESC, job_id DESC",
+            ("process", "failed"),
+        ).fetchall()
+    # filtered and sorted by the same index
+    assert "jobs_process_status_created" in str(plan)
+    assert "TEMP B-TREE" not in str(plan)
+
+
+def test_local_job_client_restart(tmp_path: pathlib.Path) -> None:
+    store = jobs.SQLiteJobStore(tmp_path / "jobs.db")
+    store.add(make_job("job-1", "add", "running", 0))
+    store.add(make_job("job-2", "add", "successful", 1))
+    store.close()
+
+    client = local.LocalJobClient(store=jobs.SQLiteJobStore(tmp_path / "jobs.db"))
+    job = client.get_job(job_id="job-1")
+    assert (job.status, job.message) == ("failed", "job interrupted by a restart")
+    assert client.get_job(job_id="job-2").status == "successful"
+    client.shutdown()
+
+
+def test_local_job_client_execution(local_client: local.LocalJobClient) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(local_client)
+    client = fastapi.testclient.TestClient(app)
+
+    response = client.get("/processes")
+    assert [process["id"] for process in response.json()["processes"]] == [
+        "add",
+        "wait",
+    ]
+    assert list(client.get("/processes/add").json()["outputs"]) == ["sum"]
+
+    response = client.post(
+        "/processes/add/execution", json={"inputs": {"a": 1, "b": {"value": 2}}}
+    )
+    assert response.status_code == 201
+    job_id = response.json()["jobID"]
+    job = wait_for_status(client, job_id, "successful")
+    assert job["progress"] == 100
+    assert client.get(f"/jobs/{job_id}/results").json() == {"sum": 3}
+
+    response = client.post(
+        "/processes/add/execution", json={"inputs": {"a": 1, "b": -1}}
+    )
+    job_id = response.json()["jobID"]
+    job = wait_for_status(client, job_id, "failed")
+    assert job["message"] == "b must be positive"
+    response = client.get(f"/jobs/{job_id}/results")
+    assert response.status_code == 500
+    assert response.json()["detail"] == "b must be positive"
+
+    response = client.post("/processes/other/execution", json={})
+    assert response.status_code == 404
+
+    response = client.post(
+        "/processes/add/execution",
+        json={"inputs": {"a": 1, "b": 2}},
+        headers={"Prefer": "wait=5"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"sum": 3}
+
+
+def test_local_job_client_jobs(
+    local_client: local.LocalJobClient, release: threading.Event
+) -> None:
+    app = ogc_api_processes_fastapi.instantiate_app(local_client)
+    client = fastapi.testclient.TestClient(app)
+
+    running = client.post("/processes/wait/execution", json={}).json()["jobID"]
+    job = wait_for_status(client, running, "running")
+    assert job["progress"] >= 10
+    assert job["message"] == "waiting"
+    assert client.get(f"/jobs/{running}/results").status_code == 404
+
+    # the single worker is busy, jobs are queued
+    queued = [
+        client.post("/processes/add/execution", json={"inputs": {"a": i, "b": 1}})
+        for i in range(3)
+    ]
+    assert [response.status_code for response in queued] == [201, 201, 503]
+    assert queued[2].json()["type"] == "job queue full"
+
+    response = client.get("/jobs", params={"status": "accepted", "limit": 1})
+    assert response.json()["numberMatched"] == 2
+    assert [job["jobID"] for job in response.json()["jobs"]] == [
+        queued[1].json()["jobID"]
+    ]
+    [next_link] = [link for link in response.json()["links"] if link["rel"] == "next"]
+    response = client.get(next_link["href"])
+    assert [job["jobID"] for job in response.json()["jobs"]] == [
+        queued[0].json()["jobID"]
+    ]
+    response = client.get("/jobs", params={"processID": "wait"})
+    assert [job["jobID"] for job in response.json()["jobs"]] == [running]
+
+    # queued jobs are dismissed before they run
+    dismissed = queued[1].json()["jobID"]
+    response = client.delete(f"/jobs/{dismissed}")
+    assert response.json()["status"] == "dismissed"
+    assert client.get(f"/jobs/{dismissed}/results").status_code == 404
+
+    # running jobs are stopped the next time they report progress
+    response = client.delete(f"/jobs/{running}")
+    assert response.json()["status"] == "dismissed"
+    job = wait_for_status(client, queued[0].json()["jobID"], "successful")
+    assert job["status"] == "successful"
+    assert wait_for_status(client, dismissed, "dismissed")["status"] == "dismissed"
+    assert wait_for_status(client, running, "dismissed")["status"] == "dismissed"
+
+    response = client.post(
+        "/jobs/status", json={"jobIDs": [running, dismissed, "unknown"]}
+    )
+    assert [job["jobID"] for job in response.json()["jobs"]] == [running, dismissed]
+    assert client.delete("/jobs/unknown").status_code == 404